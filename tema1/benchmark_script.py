@@ -0,0 +1,258 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+# In-process microbenchmarks for the expression engines and the math operations.
+# Every case is timed with an auto-ranged loop (best of several repeats, in ns/op)
+# and run once more under tracemalloc to record its allocations.
+#
+#   python benchmark_script.py                          # print results as JSON
+#   python benchmark_script.py --save baseline.json     # store a baseline
+#   python benchmark_script.py --baseline baseline.json # compare against it
+#   python benchmark_script.py --replay-history data/calculator_api.db
+#                                     # cache hit rate of every admission policy
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'python_calculator'))
+
+from python_calculator.ClassEva import Eva
+from python_calculator.calculator import process_expression, rezolva_parantezele, ENGINES
+from python_calculator.expression_parser import parse_expression
+from python_calculator.cache_policy import ADMISSION_POLICIES
+from main import Controller, ExpressionCache
+
+# (name, terms per group, nesting depth, function density)
+EXPRESSION_WORKLOADS = [
+    ('short', 4, 1, 0.0),
+    ('long', 64, 1, 0.0),
+    ('nested', 2, 5, 0.0),
+    ('functions', 8, 2, 0.5),
+    ('nested_functions', 3, 4, 0.3)
+]
+
+FIBONACCI_SIZES = [10, 15, 20]
+FACTORIAL_SIZES = [10, 100, 1000]
+
+BINARY_OPERATORS = ['+', '-', '*']
+FUNCTIONS = ['rad', 'log', 'sin', 'cos']
+
+
+def make_expression(terms: int, depth: int, function_density: float, seed: int = 0) -> str:
+    """Deterministic expression with the given shape, e.g. '(1+rad(4))*(2-3)'"""
+    rng = random.Random(seed)
+
+    def group(level):
+        if level == 0:
+            operand = str(rng.randint(1, 9))
+        else:
+            parts = [group(level - 1) for _ in range(terms)]
+            operand = parts[0]
+            for part in parts[1:]:
+                operand += rng.choice(BINARY_OPERATORS) + part
+            operand = f"({operand})"
+        if rng.random() < function_density:
+            # rad/log of a possibly negative group just yields Eva's sentinel
+            operand = f"{rng.choice(FUNCTIONS)}({operand})"
+        return operand
+
+    expression = group(depth)
+    return expression[1:-1] if expression.startswith('(') and expression.endswith(')') else expression
+
+
+def time_case(function, min_time: float = 0.2, repeat: int = 5):
+    """(best-of-repeat nanoseconds per call, loop count) with the loop count auto-ranged to min_time"""
+    number = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed >= min_time * 1e9 / repeat or number >= 1 << 20:
+            break
+        number *= 2
+
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter_ns()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter_ns() - start)
+    return best / number, number
+
+
+def count_allocations(function) -> dict:
+    """Allocations of a single call as seen by tracemalloc"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    # CPython has no cumulative allocation counter, so report the peak traced size
+    # and the blocks that were still alive when the call returned
+    retained = after.compare_to(before, 'filename')
+    return {
+        'peak_bytes': peak,
+        'retained_blocks': sum(stat.count_diff for stat in retained if stat.count_diff > 0)
+    }
+
+
+def build_cases():
+    """List of (case name, zero-argument callable)"""
+    eva = Eva()
+    controller = Controller()
+    cases = []
+
+    for name, terms, depth, density in EXPRESSION_WORKLOADS:
+        expression = make_expression(terms, depth, density)
+        tree = parse_expression(expression)
+
+        for engine in ENGINES:
+            cases.append((f"process_expression[{engine}]/{name}",
+                          lambda expression=expression, engine=engine: process_expression(expression, engine)))
+        cases.append((f"rezolva_parantezele/{name}",
+                      lambda expression=expression: rezolva_parantezele(expression)))
+        cases.append((f"Eva.eval/{name}", lambda tree=tree: eva.eval(tree)))
+
+    for n in FIBONACCI_SIZES:
+        cases.append((f"Controller.fibonnaci/n={n}", lambda n=n: controller.fibonnaci(n)))
+    for n in FACTORIAL_SIZES:
+        cases.append((f"Controller.factorial/n={n}", lambda n=n: controller.factorial(n)))
+
+    return cases
+
+
+def replay_value(result_text: str):
+    """A stand-in for a logged result with the same size as the real one"""
+    text = result_text.removesuffix(' (cached)')
+    match = re.fullmatch(r'<integer: (\d+) bits>', text)
+    if match:
+        return (1 << int(match.group(1))) - 1
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def replay_history(db_path: str, max_bytes: int = None, max_entries: int = None) -> dict:
+    """Hit rate and memory of ExpressionCache under every admission policy for the logged requests"""
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT operation_type, input_value, result FROM api_requests "
+                            "WHERE status LIKE 'success%' ORDER BY timestamp").fetchall()
+
+    results = {}
+    # the per-lookup cache log lines would dominate the replay time
+    logging.disable(logging.CRITICAL)
+    try:
+        for admission in ADMISSION_POLICIES:
+            cache = ExpressionCache(max_bytes, max_entries, admission)
+            for operation_type, input_value, result in rows:
+                if cache.namespace(operation_type, input_value) not in cache.cache:
+                    continue
+                if cache.get(operation_type, input_value) is None:
+                    cache.set(operation_type, input_value, replay_value(result or ''))
+            stats = cache.get_stats()
+            results[admission] = {key: stats[key] for key in
+                                  ('hit_count', 'miss_count', 'hit_rate', 'bytes_used', 'evictions', 'rejections')}
+            print(f"{admission:<10} hit rate {stats['hit_rate']:>6.2f}%  {stats['bytes_used']:>12,} bytes",
+                  file=sys.stderr)
+    finally:
+        logging.disable(logging.NOTSET)
+    return results
+
+
+def run_benchmarks(name_filter: str = None, min_time: float = 0.2, repeat: int = 5) -> dict:
+    results = {}
+    for name, function in build_cases():
+        if name_filter and name_filter not in name:
+            continue
+        function()  # warm up caches (compile cache, Eva instances)
+        ns_per_op, loops = time_case(function, min_time, repeat)
+        results[name] = {
+            'ns_per_op': round(ns_per_op, 1),
+            'loops': loops,
+            **count_allocations(function)
+        }
+        print(f"{name:<45} {ns_per_op:>14,.0f} ns/op", file=sys.stderr)
+    return results
+
+
+def compare_to_baseline(results: dict, baseline: dict, threshold: float) -> dict:
+    """Per-case ratio current/baseline; ratios above 1 + threshold are regressions"""
+    comparison = {}
+    for name, current in results.items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous:
+            continue
+        ratio = current['ns_per_op'] / previous['ns_per_op'] if previous['ns_per_op'] else None
+        comparison[name] = {
+            'baseline_ns_per_op': previous['ns_per_op'],
+            'ns_per_op': current['ns_per_op'],
+            'ratio': round(ratio, 3) if ratio is not None else None,
+            'regression': ratio is not None and ratio > 1 + threshold
+        }
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calculator engine microbenchmarks")
+    parser.add_argument('--filter', help="only run cases whose name contains this text")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds spent timing each case")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', help="write the results to this file as a baseline")
+    parser.add_argument('--baseline', help="compare the results against this baseline file")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    parser.add_argument('--replay-history', metavar='DB',
+                        help="replay the request history of this database against the result cache instead")
+    parser.add_argument('--cache-max-bytes', type=int, help="byte budget per namespace for --replay-history")
+    parser.add_argument('--cache-max-entries', type=int, help="entry cap per namespace for --replay-history")
+    args = parser.parse_args()
+    
+    if args.replay_history:
+        report = {
+            'python': sys.version.split()[0],
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'cache_replay': replay_history(args.replay_history, args.cache_max_bytes, args.cache_max_entries)
+        }
+        print(json.dumps(report, indent=2))
+        return
+
+    report = {
+        'python': sys.version.split()[0],
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': run_benchmarks(args.filter, args.min_time, args.repeat)
+    }
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report['comparison'] = compare_to_baseline(report['results'], json.load(f), args.threshold)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
+
+    regressions = [name for name, case in report.get('comparison', {}).items() if case['regression']]
+    if regressions:
+        print(f"\nRegressions: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
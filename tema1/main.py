@@ -6,20 +6,40 @@ import json
 import logging
 from datetime import datetime
 from typing import Optional, Dict, Any
-from contextlib import contextmanager
+from contextlib import contextmanager, ExitStack
 import time
 import signal
 import hashlib
 import getpass
 import atexit
+import bisect
+import threading
+import queue
+from collections import OrderedDict
 from typing import Optional, Tuple
 
 # add path to folder python_calculator
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "python_calculator")))
 
-from python_calculator.calculator import process_expression
-
-from flask import Flask, request, jsonify, render_template_string
+from python_calculator.calculator import process_expression, compile_cache, canonical_expression_key
+# imported by their top-level names, like calculator.py does: a second copy loaded as
+# python_calculator.* would have its own ExpressionLimitError class and tracer context
+from expression_limits import ExpressionLimits, ExpressionLimitError, check_expression
+from tracing import tracing
+from python_calculator.vectorized import evaluate_vectorized
+from python_calculator.pow_engine import fast_pow, parse_pow_input, normalize_pow_input, pow_result_bits
+from python_calculator.fibonacci_engine import (fibonacci, fibonacci_result_bits, fibonacci_range, fibonacci_mod,
+                                               parse_fibonacci_input, normalize_fibonacci_input)
+from python_calculator.factorial_engine import factorial as prime_swing_factorial, parallel_factorial, product_range
+from python_calculator.number_summary import factorial_summary, fibonacci_summary
+from python_calculator.combinatorics_engine import (binomial, permutations, multinomial, combinatorics_result_bits,
+                                                    parse_combinatorics_input, normalize_combinatorics_input)
+from python_calculator.decimal_engine import parse_decimal_expression, decimal_cache_key, evaluate_decimal
+from python_calculator.cache_policy import ADMISSION_POLICIES, FrequencySketch, entry_size
+from python_calculator.int_encoding import (RESULT_ENCODINGS, SAFE_STR_BITS, encode_int, iter_encoded,
+                                            int_to_decimal, result_preview, result_text, pack_result, unpack_result)
+
+from flask import Flask, request, jsonify, render_template_string, Response, stream_with_context
 
 from flask_cors import CORS
 
@@ -387,10 +407,17 @@ class DatabaseManager:
                     error_message TEXT,
                     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
                     ip_address TEXT,
-                    user_agent TEXT
+                    user_agent TEXT,
+                    cache_key TEXT
                 )
             ''')
             
+            # Databases created before cache_key existed get the column added
+            cursor.execute('PRAGMA table_info(api_requests)')
+            columns = [row['name'] for row in cursor.fetchall()]
+            if 'cache_key' not in columns:
+                cursor.execute('ALTER TABLE api_requests ADD COLUMN cache_key TEXT')
+            
             # Sessions table to maintain user sessions
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS user_sessions (
@@ -421,7 +448,7 @@ class DatabaseManager:
 
     def log_request(self, operation_type: str, input_value: str, result: str = None, 
                 status: str = "success", error_message: str = None, 
-                ip_address: str = None, user_agent: str = None) -> str:
+                ip_address: str = None, user_agent: str = None, cache_key: str = None) -> str:
         """Log an API request to the database"""
         request_id = str(uuid.uuid4())
         
@@ -429,9 +456,9 @@ class DatabaseManager:
             cursor = conn.cursor()
             cursor.execute('''
                 INSERT INTO api_requests 
-                (id, operation_type, input_value, result, status, error_message, ip_address, user_agent)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (request_id, operation_type, input_value, result, status, error_message, ip_address, user_agent))
+                (id, operation_type, input_value, result, status, error_message, ip_address, user_agent, cache_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (request_id, operation_type, input_value, result, status, error_message, ip_address, user_agent, cache_key))
             conn.commit()
         
         return request_id
@@ -524,40 +551,370 @@ class DatabaseManager:
                 'status_stats': status_stats
             }
 
+# Version of the code producing each cache namespace; bump one when its results change
+# so the persistent result store stops serving the old values
+ENGINE_VERSIONS = {
+    'calculator': '1',
+    'fibonacci': '1',
+    'fibonacci_mod': '1',
+    'factorial': '1',
+    'pow': '1',
+    'binomial': '1',
+    'permutations': '1',
+    'multinomial': '1',
+    'calculator_decimal': '1'
+}
+
+class ResultStore:
+    """Persistent second cache tier (SQLite file under data/) behind ExpressionCache
+    
+    Rows are keyed by namespace, cache key and engine version. Values are packed by
+    pack_result: integers as two's complement bytes, floats as 8 bytes, strings as UTF-8. Writes (stores, access
+    times, clears) go through a queue to one writer thread, so requests never wait for
+    them; once the stored bytes exceed max_bytes the least recently used rows are pruned.
+    """
+    
+    def __init__(self, db_path: str = None, max_bytes: int = None, namespaces: list = None):
+        env_db_path = os.environ.get("RESULT_STORE_PATH")
+        
+        if db_path:
+            self.db_path = db_path
+        elif env_db_path:
+            self.db_path = env_db_path
+        else:
+            base_dir = os.path.dirname(os.path.abspath(__file__))
+            data_dir = os.path.join(base_dir, "data")
+            os.makedirs(data_dir, exist_ok=True)
+            self.db_path = os.path.join(data_dir, "result_store.db")
+        
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('RESULT_STORE_MAX_BYTES', 512 * 1024 * 1024))
+        self.max_bytes = max_bytes
+        if namespaces is None:
+            namespaces = os.environ.get('RESULT_STORE_NAMESPACES',
+                                        'fibonacci,factorial,pow,binomial,permutations,multinomial').split(',')
+        self.namespaces = {namespace.strip() for namespace in namespaces if namespace.strip()}
+        
+        self.init_database()
+        
+        self.writes = queue.Queue(maxsize=int(os.environ.get('RESULT_STORE_QUEUE_SIZE', 1000)))
+        self.dropped_writes = 0
+        self.writer = threading.Thread(target=self.write_loop, name='result-store-writer', daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+    
+    def init_database(self):
+        """Create the results table"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # WAL lets request threads read while the writer thread writes
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS results (
+                    namespace TEXT NOT NULL,
+                    cache_key TEXT NOT NULL,
+                    engine_version TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, cache_key, engine_version)
+                )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)')
+            conn.commit()
+            logger.info(f"Result store initialized at {self.db_path}")
+    
+    @contextmanager
+    def get_connection(self):
+        """Context manager for result store connections"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Result store error: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def handles(self, namespace: str) -> bool:
+        return namespace in self.namespaces
+    
+    def get(self, namespace: str, cache_key: str):
+        """(True, result) if the store has the result, else (False, None)"""
+        try:
+            with self.get_connection() as conn:
+                row = conn.execute(
+                    'SELECT kind, value FROM results WHERE namespace = ? AND cache_key = ? AND engine_version = ?',
+                    (namespace, cache_key, ENGINE_VERSIONS.get(namespace, '1'))
+                ).fetchone()
+        except sqlite3.Error:
+            return False, None
+        if row is None:
+            return False, None
+        self.enqueue(('touch', namespace, cache_key))
+        return True, unpack_result(row['kind'], row['value'])
+    
+    def put(self, namespace: str, cache_key: str, result):
+        """Store a result in the background"""
+        self.enqueue(('put', namespace, cache_key, result))
+    
+    def clear(self, namespace: str = None):
+        """Remove the results of one namespace, or all of them, in the background"""
+        self.enqueue(('clear', namespace))
+    
+    def enqueue(self, item):
+        # A full queue means the disk is behind; the result is simply not persisted
+        try:
+            self.writes.put_nowait(item)
+        except queue.Full:
+            self.dropped_writes += 1
+    
+    def write_loop(self):
+        """Writer thread: apply queued writes in batches, one transaction per batch"""
+        while True:
+            batch = [self.writes.get()]
+            while len(batch) < 100:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = None in batch
+            try:
+                self.apply(item for item in batch if item is not None)
+            except Exception as e:
+                logger.error(f"Result store write failed: {e}")
+            finally:
+                for _ in batch:
+                    self.writes.task_done()
+            if stop:
+                return
+    
+    def apply(self, batch):
+        now = time.time()
+        stored = 0
+        with self.get_connection() as conn:
+            for item in batch:
+                if item[0] == 'put':
+                    _, namespace, cache_key, result = item
+                    packed = pack_result(result)
+                    if packed is None:
+                        continue
+                    kind, data = packed
+                    conn.execute('''
+                        INSERT OR REPLACE INTO results (namespace, cache_key, engine_version, kind, value, size, last_access)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ''', (namespace, cache_key, ENGINE_VERSIONS.get(namespace, '1'), kind, data,
+                          len(data) + len(cache_key), now))
+                    stored += 1
+                elif item[0] == 'touch':
+                    _, namespace, cache_key = item
+                    conn.execute('UPDATE results SET last_access = ? '
+                                 'WHERE namespace = ? AND cache_key = ? AND engine_version = ?',
+                                 (now, namespace, cache_key, ENGINE_VERSIONS.get(namespace, '1')))
+                elif item[0] == 'clear':
+                    if item[1]:
+                        conn.execute('DELETE FROM results WHERE namespace = ?', (item[1],))
+                    else:
+                        conn.execute('DELETE FROM results')
+            conn.commit()
+            if stored:
+                self.prune(conn)
+    
+    def prune(self, conn):
+        """Delete least recently used rows until the store is back under max_bytes"""
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        
+        # Prune to 90% of the budget so every store does not trigger another pass
+        excess = total - self.max_bytes * 9 // 10
+        doomed = []
+        for row in conn.execute('SELECT rowid, size FROM results ORDER BY last_access'):
+            doomed.append((row['rowid'],))
+            excess -= row['size']
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM results WHERE rowid = ?', doomed)
+        conn.commit()
+        
+        calc_logger.info(f"RESULT_STORE_PRUNE | Deleted_Rows: {len(doomed)} | Bytes_Before: {total}B | "
+                    f"Max_Bytes: {self.max_bytes}B")
+    
+    def flush(self):
+        """Wait until every queued write has been applied"""
+        self.writes.join()
+    
+    def close(self):
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join(timeout=10)
+    
+    def get_stats(self):
+        with self.get_connection() as conn:
+            row = conn.execute('SELECT COUNT(*) AS entries, COALESCE(SUM(size), 0) AS bytes_used FROM results').fetchone()
+        return {
+            'path': self.db_path,
+            'entries': row['entries'],
+            'bytes_used': row['bytes_used'],
+            'max_bytes': self.max_bytes,
+            'namespaces': sorted(self.namespaces),
+            'pending_writes': self.writes.qsize(),
+            'dropped_writes': self.dropped_writes
+        }
+
 # ----------------------------- CACHE SYSTEM ------------------------------------
 
 class ExpressionCache:
-    """Enhanced cache system with detailed logging"""
-    
-    def __init__(self):
+    """Enhanced cache system with detailed logging
+    
+    Every namespace is an LRU (OrderedDict, least recently used first) bounded by a
+    byte budget and an entry count. Entry sizes come from the stored result objects
+    (cache_policy.entry_size). Defaults come from CACHE_MAX_BYTES / CACHE_MAX_ENTRIES
+    and can be set per namespace, e.g. CACHE_MAX_BYTES_FACTORIAL.
+    With the 'tinylfu' admission policy (CACHE_ADMISSION, the default) a new entry that
+    needs evictions is only stored if it was accessed more often than its victims.
+    
+    The cache is shared by all request threads. Each namespace has its own lock, which
+    guards its entries, sizes, sketch and counters (the factorial lock also guards
+    factorial_index), so lookups of different operations never wait for each other.
+    Keys are normalized and log lines written outside the locks.
+    
+    With a ResultStore, misses of the namespaces it handles are looked up in it (and the
+    found result is brought back into memory), and every stored result is also persisted.
+    """
+    
+    def __init__(self, max_bytes: int = None, max_entries: int = None, admission: str = None,
+                 store: ResultStore = None):
         self.cache = {
-            'calculator': {},  # Cache for calculator expressions
-            'fibonacci': {},   # Cache for fibonacci numbers
-            'factorial': {}    # Cache for factorial
+            'calculator': OrderedDict(),  # Cache for calculator expressions
+            'fibonacci': OrderedDict(),   # Cache for fibonacci numbers
+            'fibonacci_mod': OrderedDict(),  # Cache for fibonacci numbers modulo m (small residues)
+            'factorial': OrderedDict(),   # Cache for factorial
+            'pow': OrderedDict(),         # Cache for pow (base, exponent, modulus)
+            'binomial': OrderedDict(),    # Cache for binomial coefficients C(n, k)
+            'permutations': OrderedDict(),  # Cache for k-permutations P(n, k)
+            'multinomial': OrderedDict(),  # Cache for multinomial coefficients
+            'calculator_decimal': OrderedDict()  # Cache for arbitrary-precision calculator results, keyed by precision
+        }
+        if max_bytes is None:
+            max_bytes = int(os.environ.get('CACHE_MAX_BYTES', 64 * 1024 * 1024))
+        if max_entries is None:
+            max_entries = int(os.environ.get('CACHE_MAX_ENTRIES', 10000))
+        self.max_bytes = {
+            namespace: int(os.environ.get(f'CACHE_MAX_BYTES_{namespace.upper()}', max_bytes))
+            for namespace in self.cache
         }
-        self.hit_count = 0
-        self.miss_count = 0
+        self.max_entries = {
+            namespace: int(os.environ.get(f'CACHE_MAX_ENTRIES_{namespace.upper()}', max_entries))
+            for namespace in self.cache
+        }
+        # Bytes charged for every stored key, and their sum per namespace
+        self.entry_sizes = {namespace: {} for namespace in self.cache}
+        self.bytes_used = {namespace: 0 for namespace in self.cache}
+        self.evictions = {namespace: 0 for namespace in self.cache}
+        self.admission = admission or os.environ.get('CACHE_ADMISSION', 'tinylfu')
+        if self.admission not in ADMISSION_POLICIES:
+            raise ValueError(f"CACHE_ADMISSION must be one of {', '.join(ADMISSION_POLICIES)}")
+        # Access frequencies per namespace, for admission
+        self.sketches = {namespace: FrequencySketch(self.max_entries[namespace]) for namespace in self.cache}
+        self.rejections = {namespace: 0 for namespace in self.cache}
+        # Sorted n of every cached factorial, to find the nearest k <= n in O(log n)
+        self.factorial_index = []
+        self.hits = {namespace: 0 for namespace in self.cache}
+        self.misses = {namespace: 0 for namespace in self.cache}
+        # Persistent second tier, and the hits it answered
+        self.store = store
+        self.store_hits = {namespace: 0 for namespace in self.cache}
+        self.locks = {namespace: threading.Lock() for namespace in self.cache}
+    
+    @property
+    def hit_count(self) -> int:
+        return sum(self.hits.values())
+    
+    @property
+    def miss_count(self) -> int:
+        return sum(self.misses.values())
+    
+    def make_key(self, operation_type: str, input_value: str) -> str:
+        """Build the cache key; calculator expressions use their canonical form"""
+        if operation_type == 'calculator':
+            return canonical_expression_key(str(input_value))
+        if operation_type == 'pow':
+            try:
+                return normalize_pow_input(input_value)
+            except ValueError:
+                pass
+        if operation_type == 'fibonacci':
+            try:
+                return normalize_fibonacci_input(input_value)
+            except ValueError:
+                pass
+        if operation_type in ('binomial', 'permutations', 'multinomial'):
+            try:
+                return normalize_combinatorics_input(operation_type, input_value)
+            except ValueError:
+                pass
+        return str(input_value).strip()
+    
+    def namespace(self, operation_type: str, input_value: str) -> str:
+        """Cache dictionary for an input; F(n) mod m is kept apart from the full F(n) values"""
+        if operation_type == 'fibonacci':
+            try:
+                if parse_fibonacci_input(input_value)[1] is not None:
+                    return 'fibonacci_mod'
+            except ValueError:
+                pass
+        return operation_type
     
     def get(self, operation_type: str, input_value: str):
         """Get cached result if exists with detailed logging"""
-        cache_key = str(input_value).strip()
+        cache_key = self.make_key(operation_type, input_value)
+        namespace = self.namespace(operation_type, input_value)
         start_time = time.time()
         
-        if cache_key in self.cache[operation_type]:
-            self.hit_count += 1
+        use_store = self.store is not None and self.store.handles(namespace)
+        
+        with self.locks[namespace]:
+            self.sketches[namespace].increment(cache_key)
+            hit = cache_key in self.cache[namespace]
+            if hit:
+                self.hits[namespace] += 1
+                self.cache[namespace].move_to_end(cache_key)
+                result = self.cache[namespace][cache_key]
+            elif not use_store:
+                self.misses[namespace] += 1
+        
+        if not hit and use_store:
+            hit, result = self.store.get(namespace, cache_key)
+            with self.locks[namespace]:
+                if hit:
+                    self.hits[namespace] += 1
+                    self.store_hits[namespace] += 1
+                    size = entry_size(cache_key, result)
+                    if size <= self.max_bytes[namespace] and self.admit(namespace, cache_key, size):
+                        self.insert(namespace, cache_key, result, size)
+                else:
+                    self.misses[namespace] += 1
+            if hit:
+                calc_logger.info(f"CACHE_STORE_HIT | Operation: {operation_type} | Input: '{input_value}' | "
+                            f"Result: {result_preview(result)}")
+        
+        if hit:
             access_time = (time.time() - start_time) * 1000  # Convert to milliseconds
             
-            result = self.cache[operation_type][cache_key]
-            
             # Log cache hit
             calc_logger.info(f"CACHE_HIT | Operation: {operation_type} | Input: '{input_value}' | "
-                        f"Result: {result} | Access_Time: {access_time:.2f}ms")
+                        f"Result: {result_preview(result)} | Access_Time: {access_time:.2f}ms")
             
-            logger.debug(f"Cache HIT for {operation_type}: {input_value} -> {result}")
+            logger.debug(f"Cache HIT for {operation_type}: {input_value} -> {result_preview(result)}")
             
             return result
         
-        self.miss_count += 1
         access_time = (time.time() - start_time) * 1000
         
         # Log cache miss
@@ -568,35 +925,165 @@ class ExpressionCache:
         
         return None
     
-    def set(self, operation_type: str, input_value: str, result):
-        """Store result in cache with logging"""
-        cache_key = str(input_value).strip()
+    def set(self, operation_type: str, input_value: str, result, bypass_admission: bool = False):
+        """Store result in cache with logging; bypass_admission stores it even when TinyLFU
+        would reject it (for entries stored ahead of their first lookup, like checkpoints)"""
+        cache_key = self.make_key(operation_type, input_value)
+        namespace = self.namespace(operation_type, input_value)
         start_time = time.time()
         
-        self.cache[operation_type][cache_key] = result
+        if self.store is not None and self.store.handles(namespace):
+            self.store.put(namespace, cache_key, result)
+        
+        size = entry_size(cache_key, result)
+        if size > self.max_bytes[namespace] or self.max_entries[namespace] < 1:
+            calc_logger.info(f"CACHE_SKIP | Operation: {operation_type} | Input: '{input_value}' | "
+                        f"Size: {size}B | Budget: {self.max_bytes[namespace]}B")
+            return
+        
+        with self.locks[namespace]:
+            admitted = bypass_admission or self.admit(namespace, cache_key, size)
+            if admitted:
+                evicted = self.insert(namespace, cache_key, result, size)
+                bytes_used = self.bytes_used[namespace]
+            else:
+                self.rejections[namespace] += 1
+                frequency = self.sketches[namespace].estimate(cache_key)
+        
+        if not admitted:
+            calc_logger.info(f"CACHE_REJECT | Operation: {operation_type} | Input: '{input_value}' | "
+                        f"Size: {size}B | Frequency: {frequency}")
+            return
+        
+        for evicted_key, evicted_size in evicted:
+            calc_logger.info(f"CACHE_EVICT | Namespace: {namespace} | Key: '{evicted_key[:100]}' | "
+                        f"Size: {evicted_size}B | Bytes_Used: {bytes_used}B")
         
         store_time = (time.time() - start_time) * 1000
         
         # Log cache store
         calc_logger.info(f"CACHE_STORE | Operation: {operation_type} | Input: '{input_value}' | "
-                    f"Result: {result} | Store_Time: {store_time:.2f}ms")
-        
-        logger.debug(f"Cache STORED for {operation_type}: {input_value} = {result}")
+                    f"Result: {result_preview(result)} | Store_Time: {store_time:.2f}ms")
+        
+        logger.debug(f"Cache STORED for {operation_type}: {input_value} = {result_preview(result)}")
+    
+    def admit(self, namespace: str, cache_key: str, size: int) -> bool:
+        """TinyLFU admission: a new entry may only evict entries that are used less often
+        (called with the namespace lock held)"""
+        entries = self.cache[namespace]
+        if self.admission != 'tinylfu' or cache_key in entries:
+            return True
+        
+        # Walk the LRU end to find the entries the new one would push out
+        freed = 0
+        victims = 0
+        over_bytes = self.bytes_used[namespace] + size - self.max_bytes[namespace]
+        over_entries = len(entries) + 1 - self.max_entries[namespace]
+        sketch = self.sketches[namespace]
+        frequency = sketch.estimate(cache_key)
+        for victim_key in entries:
+            if freed >= over_bytes and victims >= over_entries:
+                break
+            if sketch.estimate(victim_key) >= frequency:
+                return False
+            freed += self.entry_sizes[namespace][victim_key]
+            victims += 1
+        return True
+    
+    def insert(self, namespace: str, cache_key: str, result, size: int) -> list:
+        """Store an admitted entry and evict down to the budgets; returns the evicted
+        (key, size) pairs (called with the namespace lock held)"""
+        self.discard(namespace, cache_key)
+        self.cache[namespace][cache_key] = result
+        self.entry_sizes[namespace][cache_key] = size
+        self.bytes_used[namespace] += size
+        
+        if namespace == 'factorial' and isinstance(result, int):
+            n = int(cache_key)
+            position = bisect.bisect_left(self.factorial_index, n)
+            if position == len(self.factorial_index) or self.factorial_index[position] != n:
+                self.factorial_index.insert(position, n)
+        
+        return self.evict(namespace)
+    
+    def discard(self, namespace: str, cache_key: str):
+        """Remove one entry and its bookkeeping; returns the removed result or None
+        (called with the namespace lock held)"""
+        if cache_key not in self.cache[namespace]:
+            return None
+        result = self.cache[namespace].pop(cache_key)
+        self.bytes_used[namespace] -= self.entry_sizes[namespace].pop(cache_key)
+        if namespace == 'factorial' and isinstance(result, int):
+            n = int(cache_key)
+            position = bisect.bisect_left(self.factorial_index, n)
+            if position < len(self.factorial_index) and self.factorial_index[position] == n:
+                del self.factorial_index[position]
+        return result
+    
+    def evict(self, namespace: str) -> list:
+        """Drop least recently used entries until the namespace fits its budgets;
+        returns the (key, size) of every evicted entry (called with the namespace lock held)"""
+        entries = self.cache[namespace]
+        evicted = []
+        while entries and (self.bytes_used[namespace] > self.max_bytes[namespace]
+                           or len(entries) > self.max_entries[namespace]):
+            cache_key = next(iter(entries))
+            evicted.append((cache_key, self.entry_sizes[namespace][cache_key]))
+            self.discard(namespace, cache_key)
+            self.evictions[namespace] += 1
+        return evicted
+    
+    def cached_factorial(self, n: int):
+        """n! if it is cached (without counting a hit or miss), else None"""
+        with self.locks['factorial']:
+            result = self.cache['factorial'].get(str(n))
+        return result if isinstance(result, int) else None
+    
+    def nearest_factorial(self, n: int):
+        """(k, k!) for the largest cached k <= n, or None"""
+        with self.locks['factorial']:
+            position = bisect.bisect_right(self.factorial_index, n)
+            if position == 0:
+                return None
+            k = self.factorial_index[position - 1]
+            self.cache['factorial'].move_to_end(str(k))
+            self.sketches['factorial'].increment(str(k))
+            return k, self.cache['factorial'][str(k)]
     
     def get_stats(self):
         """Get cache statistics"""
-        total_requests = self.hit_count + self.miss_count
-        hit_rate = (self.hit_count / total_requests * 100) if total_requests > 0 else 0
+        # Every namespace is read under its own lock, so its numbers are consistent
+        namespaces = {}
+        for namespace in self.cache:
+            with self.locks[namespace]:
+                namespaces[namespace] = {
+                    'entries': len(self.cache[namespace]),
+                    'max_entries': self.max_entries[namespace],
+                    'bytes_used': self.bytes_used[namespace],
+                    'max_bytes': self.max_bytes[namespace],
+                    'hits': self.hits[namespace],
+                    'store_hits': self.store_hits[namespace],
+                    'misses': self.misses[namespace],
+                    'evictions': self.evictions[namespace],
+                    'rejections': self.rejections[namespace]
+                }
+        
+        hit_count = sum(counts['hits'] for counts in namespaces.values())
+        miss_count = sum(counts['misses'] for counts in namespaces.values())
+        total_requests = hit_count + miss_count
+        hit_rate = (hit_count / total_requests * 100) if total_requests > 0 else 0
         
         stats = {
-            'hit_count': self.hit_count,
-            'miss_count': self.miss_count,
+            'hit_count': hit_count,
+            'miss_count': miss_count,
             'hit_rate': round(hit_rate, 2),
-            'cache_sizes': {
-                'calculator': len(self.cache['calculator']),
-                'fibonacci': len(self.cache['fibonacci']),
-                'factorial': len(self.cache['factorial'])
-            }
+            'cache_sizes': {namespace: counts['entries'] for namespace, counts in namespaces.items()},
+            'admission': self.admission,
+            'bytes_used': sum(counts['bytes_used'] for counts in namespaces.values()),
+            'evictions': sum(counts['evictions'] for counts in namespaces.values()),
+            'rejections': sum(counts['rejections'] for counts in namespaces.values()),
+            'namespaces': namespaces,
+            'result_store': self.store.get_stats() if self.store is not None else None
         }
         
         logger.info(f"Cache statistics requested: {stats}")
@@ -605,22 +1092,179 @@ class ExpressionCache:
     def clear_cache(self, operation_type: str = None):
         """Clear cache for specific operation or all with logging"""
         if operation_type and operation_type in self.cache:
-            cleared_count = len(self.cache[operation_type])
-            self.cache[operation_type].clear()
+            with self.locks[operation_type]:
+                cleared_count = len(self.cache[operation_type])
+                self.cache[operation_type].clear()
+                self.entry_sizes[operation_type].clear()
+                self.bytes_used[operation_type] = 0
+                if operation_type == 'factorial':
+                    self.factorial_index.clear()
+            if self.store is not None:
+                self.store.clear(operation_type)
             
             calc_logger.info(f"CACHE_CLEAR | Operation: {operation_type} | Cleared_Items: {cleared_count}")
             logger.info(f"Cache cleared for {operation_type}, {cleared_count} items removed")
         else:
-            total_cleared = sum(len(cache) for cache in self.cache.values())
-            for cache_type in self.cache:
-                self.cache[cache_type].clear()
-            self.hit_count = 0
-            self.miss_count = 0
+            # All locks, always taken in the same order, so no lookup sees a half-cleared cache
+            with ExitStack() as stack:
+                for cache_type in self.cache:
+                    stack.enter_context(self.locks[cache_type])
+                total_cleared = sum(len(cache) for cache in self.cache.values())
+                for cache_type in self.cache:
+                    self.cache[cache_type].clear()
+                    self.entry_sizes[cache_type].clear()
+                    self.bytes_used[cache_type] = 0
+                    self.hits[cache_type] = 0
+                    self.store_hits[cache_type] = 0
+                    self.misses[cache_type] = 0
+                    self.evictions[cache_type] = 0
+                    self.rejections[cache_type] = 0
+                    self.sketches[cache_type].clear()
+                self.factorial_index.clear()
+            if self.store is not None:
+                self.store.clear()
             
             calc_logger.info(f"CACHE_CLEAR_ALL | Cleared_Items: {total_cleared}")
             logger.info(f"All caches cleared, {total_cleared} items removed")
 
 
+class SharedExpressionCache(ExpressionCache):
+    """ExpressionCache whose entries live in a SharedResultTable (shared memory), so every
+    worker process on the host sees the results computed by the others
+    
+    The table has a fixed size (slots and arena bytes): entries are lost on slot collisions
+    and when the arena fills up, instead of through the LRU budgets and admission of the
+    in-process cache, whose dictionaries stay empty here. Hit/miss counters are per process.
+    """
+    
+    # checkpoints probed by nearest_factorial
+    MAX_CHECKPOINT_PROBES = 32
+    
+    def __init__(self, table, store: ResultStore = None, checkpoint_interval: int = None):
+        super().__init__(store=store)
+        self.table = table
+        # the factorial checkpoints the Controller leaves behind (same setting)
+        if checkpoint_interval is None:
+            checkpoint_interval = int(os.environ.get('FACTORIAL_CHECKPOINT_INTERVAL', 1000))
+        self.checkpoint_interval = checkpoint_interval
+        # every process numbers the namespaces the same way
+        self.tags = {namespace: tag for tag, namespace in enumerate(self.cache, start=1)}
+    
+    def get(self, operation_type: str, input_value: str):
+        """Get cached result if exists with detailed logging"""
+        cache_key = self.make_key(operation_type, input_value)
+        namespace = self.namespace(operation_type, input_value)
+        start_time = time.time()
+        
+        hit, result = self.table.get(self.tags[namespace], cache_key)
+        from_store = False
+        if not hit and self.store is not None and self.store.handles(namespace):
+            hit, result = self.store.get(namespace, cache_key)
+            if hit:
+                from_store = True
+                self.table.put(self.tags[namespace], cache_key, result)
+        
+        with self.locks[namespace]:
+            if hit:
+                self.hits[namespace] += 1
+                if from_store:
+                    self.store_hits[namespace] += 1
+            else:
+                self.misses[namespace] += 1
+        
+        access_time = (time.time() - start_time) * 1000
+        if hit:
+            calc_logger.info(f"CACHE_HIT | Operation: {operation_type} | Input: '{input_value}' | "
+                        f"Result: {result_preview(result)} | Access_Time: {access_time:.2f}ms | "
+                        f"Backend: {'store' if from_store else 'shared'}")
+            logger.debug(f"Cache HIT for {operation_type}: {input_value} -> {result_preview(result)}")
+            return result
+        
+        calc_logger.info(f"CACHE_MISS | Operation: {operation_type} | Input: '{input_value}' | "
+                    f"Access_Time: {access_time:.2f}ms | Backend: shared")
+        logger.debug(f"Cache MISS for {operation_type}: {input_value}")
+        return None
+    
+    def set(self, operation_type: str, input_value: str, result, bypass_admission: bool = False):
+        """Store result in the shared table with logging (the table has no admission policy,
+        so bypass_admission changes nothing)"""
+        cache_key = self.make_key(operation_type, input_value)
+        namespace = self.namespace(operation_type, input_value)
+        start_time = time.time()
+        
+        if self.store is not None and self.store.handles(namespace):
+            self.store.put(namespace, cache_key, result)
+        
+        if not self.table.put(self.tags[namespace], cache_key, result):
+            calc_logger.info(f"CACHE_SKIP | Operation: {operation_type} | Input: '{input_value}' | "
+                        f"Backend: shared")
+            return
+        
+        store_time = (time.time() - start_time) * 1000
+        calc_logger.info(f"CACHE_STORE | Operation: {operation_type} | Input: '{input_value}' | "
+                    f"Result: {result_preview(result)} | Store_Time: {store_time:.2f}ms | Backend: shared")
+        logger.debug(f"Cache STORED for {operation_type}: {input_value} = {result_preview(result)}")
+    
+    def cached_factorial(self, n: int):
+        """n! if it is cached (without counting a hit or miss), else None"""
+        hit, result = self.table.get(self.tags['factorial'], str(n))
+        return result if hit and isinstance(result, int) else None
+    
+    def nearest_factorial(self, n: int):
+        """(k, k!) for the largest cached k <= n among n and the checkpoints (multiples of
+        checkpoint_interval) down to n // 2, or None; the shared table has no ordered index to search"""
+        step = self.checkpoint_interval
+        candidates = [n]
+        if step > 0:
+            k = n - n % step
+            while k > 0 and k >= n // 2 and len(candidates) < self.MAX_CHECKPOINT_PROBES:
+                if k != n:
+                    candidates.append(k)
+                k -= step
+        for k in candidates:
+            result = self.cached_factorial(k)
+            if result is not None:
+                return k, result
+        return None
+    
+    def get_stats(self):
+        """Get cache statistics"""
+        stats = super().get_stats()
+        counts = self.table.tag_counts()
+        stats['cache_sizes'] = {namespace: counts.get(tag, 0) for namespace, tag in self.tags.items()}
+        for namespace, tag in self.tags.items():
+            stats['namespaces'][namespace]['entries'] = counts.get(tag, 0)
+        stats['backend'] = 'shared'
+        stats['shared_table'] = self.table.get_stats()
+        return stats
+    
+    def clear_cache(self, operation_type: str = None):
+        """Clear the shared table for specific operation or all with logging"""
+        counts = self.table.tag_counts()
+        if operation_type and operation_type in self.cache:
+            self.table.clear(self.tags[operation_type])
+            if self.store is not None:
+                self.store.clear(operation_type)
+            cleared_count = counts.get(self.tags[operation_type], 0)
+            
+            calc_logger.info(f"CACHE_CLEAR | Operation: {operation_type} | Cleared_Items: {cleared_count} | "
+                        f"Backend: shared")
+            logger.info(f"Cache cleared for {operation_type}, {cleared_count} items removed")
+        else:
+            self.table.clear()
+            if self.store is not None:
+                self.store.clear()
+            for cache_type in self.cache:
+                with self.locks[cache_type]:
+                    self.hits[cache_type] = 0
+                    self.store_hits[cache_type] = 0
+                    self.misses[cache_type] = 0
+            total_cleared = sum(counts.values())
+            
+            calc_logger.info(f"CACHE_CLEAR_ALL | Cleared_Items: {total_cleared} | Backend: shared")
+            logger.info(f"All caches cleared, {total_cleared} items removed")
+
+
 # ----------------------------- CLASSES ---------------------------------------
 
 class Point:
@@ -658,11 +1302,26 @@ class Fl_Output:
 class MyDisplayBox(Fl_Output):
     def __init__(self, pos: Point, w: int, h: int, label: str = None):
         super().__init__(pos.getX(), pos.getY(), w, h, label)
+        self._result = None
 
     def setText(self, txt: str):
+        self._result = None
         self.value(txt)
         self.redraw()
 
+    def setResult(self, result, suffix: str = ""):
+        """Show a result; a huge integer is only converted to text when the box is read,
+        so API requests (whose boxes nobody reads) never pay for the conversion"""
+        self._result = (result, suffix)
+        self.redraw()
+
+    def getText(self):
+        if self._result is not None:
+            result, suffix = self._result
+            self._result = None
+            self.value(result_text(result) + suffix)
+        return super().getText()
+
 class MyReturnButton:
     def __init__(self, pos: Point, w: int, h: int, label: str = "&Return"):
         self.x = pos.getX()
@@ -738,6 +1397,8 @@ class Model:
         self.calculatorOutputView = None
         self.fibonacciOutputView = None
         self.factorialOutputView = None
+        self.powOutputView = None
+        self.combinatoricsOutputView = None
 
     def setLastChoice(self, ch):
         self.lastChoice = ch
@@ -760,6 +1421,12 @@ class Model:
     def setFactorialView(self, db: MyDisplayBox):
         self.factorialOutputView = db
 
+    def setPowView(self, db: MyDisplayBox):
+        self.powOutputView = db
+
+    def setCombinatoricsView(self, db: MyDisplayBox):
+        self.combinatoricsOutputView = db
+
     def notify(self):
         if self.calculatorOutputView:
             self.calculatorOutputView.setText("Last choice is " + str(self.lastChoice))
@@ -785,11 +1452,51 @@ class Controller:
         self.db_manager = db_manager
         self.auth_manager = auth_manager or AuthenticationManager()
         
+        # Expression engine used by the calculator operation ('pratt', 'stack' or 'legacy')
+        self.calculator_engine = os.environ.get('CALCULATOR_ENGINE', 'stack')
+        self.nodes_eliminated = None  # optimizer result of the last calculator evaluation
+        
+        # Complexity limits and evaluation budget for calculator expressions
+        self.expression_limits = ExpressionLimits.from_environ()
+        
+        # Upper bound on rows accepted by the vectorized calculator endpoint
+        self.max_vectorized_rows = int(os.environ.get('MAX_VECTORIZED_ROWS', 1000000))
+        
+        # Upper bound on values streamed by one fibonacci range request
+        self.max_fibonacci_range = int(os.environ.get('MAX_FIBONACCI_RANGE', 100000))
+        
+        # Upper bound on the size of a pow result without modulus, for every caller (admins included);
+        # about two seconds of squaring at the default
+        self.max_pow_result_bits = int(os.environ.get('MAX_POW_RESULT_BITS', 10000000))
+        
+        # Factorials from this n on are computed on a process pool; opt-in, since the default
+        # of one worker never starts the pool (set FACTORIAL_WORKERS to use more processes)
+        self.factorial_workers = int(os.environ.get('FACTORIAL_WORKERS', 1))
+        self.factorial_parallel_threshold = int(os.environ.get('FACTORIAL_PARALLEL_THRESHOLD', 200000))
+        self.factorial_parallelism = None  # workers/chunks used by the last factorial
+        
+        # Every multiple of this n is cached as a checkpoint for later factorials (0 disables)
+        self.factorial_checkpoint_interval = int(os.environ.get('FACTORIAL_CHECKPOINT_INTERVAL', 1000))
+        self.factorial_resumed_from = None  # cached k! the last factorial started from
+        
+        # Up to this n, binomial/permutations/multinomial divide cached factorials instead of
+        # factoring (big-int division is quadratic, so it only pays off for small n)
+        self.combinatorics_cache_reuse_limit = int(os.environ.get('COMBINATORICS_CACHE_REUSE_LIMIT', 10000))
+        
+        # Choices of the operations built on the factorial infrastructure
+        self.combinatorics_choices = {5: 'binomial', 6: 'permutations', 7: 'multinomial'}
+        
+        # Upper bound on the size of a binomial/permutations/multinomial result, for every caller
+        # (admins included); a few seconds of prime-power products at the default
+        self.max_combinatorics_result_bits = int(os.environ.get('MAX_COMBINATORICS_RESULT_BITS', 5000000))
+        
         # Define restricted operations (only admin can use these)
         self.admin_only_operations = {
             'calculator': ['eval', 'exec', 'import', '__'],  # Dangerous expressions
-            'fibonacci': [30, 100],  # Numbers above these values
-            'factorial': [100, 200]  # Numbers above these values
+            'fibonacci': [100000],  # Result size in bits above this value
+            'factorial': [100, 200],  # Numbers above these values
+            'pow': [100000],  # Result size in bits above this value (without modulus)
+            'combinatorics': [100000]  # binomial/permutations/multinomial result size in bits above this value
         }
 
     def setModel(self, aModel: Model):
@@ -800,6 +1507,12 @@ class Controller:
         if not self.auth_manager.is_authenticated():
             return False, "Authentication required"
         
+        if operation_type == 'calculator':
+            try:
+                check_expression(input_value, self.expression_limits)
+            except ExpressionLimitError as e:
+                return False, str(e)
+        
         if self.auth_manager.is_admin():
             return True, "Admin access granted"
         
@@ -814,9 +1527,9 @@ class Controller:
         
         elif operation_type == 'fibonacci':
             try:
-                n = int(input_value.strip())
-                if n > 29 and not self.auth_manager.is_admin():
-                    return False, f"Fibonacci numbers above {max(self.admin_only_operations['fibonacci'])} require admin access."
+                n, modulus = parse_fibonacci_input(input_value)
+                if modulus is None and fibonacci_result_bits(n) > max(self.admin_only_operations['fibonacci']):
+                    return False, f"Fibonacci results above {max(self.admin_only_operations['fibonacci'])} bits require admin access."
             except ValueError:
                 return False, "Invalid input for fibonacci"
         
@@ -828,6 +1541,22 @@ class Controller:
             except ValueError:
                 return False, "Invalid input for factorial"
         
+        elif operation_type == 'pow':
+            try:
+                base, exponent, modulus = parse_pow_input(input_value)
+                if modulus is None and pow_result_bits(base, exponent) > max(self.admin_only_operations['pow']):
+                    return False, f"pow results above {max(self.admin_only_operations['pow'])} bits require admin access."
+            except ValueError:
+                return False, "Invalid input for pow"
+        
+        elif operation_type in ('binomial', 'permutations', 'multinomial'):
+            try:
+                numbers = parse_combinatorics_input(operation_type, input_value)
+                if combinatorics_result_bits(operation_type, numbers) > max(self.admin_only_operations['combinatorics']):
+                    return False, f"{operation_type} results above {max(self.admin_only_operations['combinatorics'])} bits require admin access."
+            except ValueError:
+                return False, f"Invalid input for {operation_type}"
+        
         return True, "User access granted"
 
     def chControl(self, aString: str):
@@ -866,6 +1595,10 @@ class Controller:
                 operation_type = "fibonacci"
             elif choice == 3:
                 operation_type = "factorial"
+            elif choice == 4:
+                operation_type = "pow"
+            elif choice in self.combinatorics_choices:
+                operation_type = self.combinatorics_choices[choice]
             
             calc_logger.info(f"CALCULATION_START | Operation: {operation_type} | Input: '{aString}' | Choice: {choice}")
             
@@ -875,6 +1608,10 @@ class Controller:
                 return self._handle_fibonacci(aString, overall_start_time)
             elif choice == 3:  # Factorial
                 return self._handle_factorial(aString, overall_start_time)
+            elif choice == 4:  # Pow
+                return self._handle_pow(aString, overall_start_time)
+            elif choice in self.combinatorics_choices:  # Binomial, permutations, multinomial
+                return self._handle_combinatorics(self.combinatorics_choices[choice], aString, overall_start_time)
             else:
                 error_msg = "No operation selected"
                 execution_time = (time.time() - overall_start_time) * 1000
@@ -883,6 +1620,10 @@ class Controller:
                                 f"Execution_Time: {execution_time:.2f}ms")
                 
                 return error_msg
+        
+        except ExpressionLimitError:
+            # Budget violations are reported to the caller as errors, not as results
+            raise
                 
         except Exception as e:
             execution_time = (time.time() - overall_start_time) * 1000
@@ -897,6 +1638,7 @@ class Controller:
     def _handle_calculator(self, aString: str, overall_start_time: float):
         """Handle calculator operation with detailed logging"""
         calc_start_time = time.time()
+        self.nodes_eliminated = None
         try:
             n = aString.strip()
             
@@ -907,12 +1649,15 @@ class Controller:
                 
                 total_time = (time.time() - overall_start_time) * 1000
                 calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: calculator | Input: '{n}' | "
-                            f"Result: {cached_result} | Total_Time: {total_time:.2f}ms")
+                            f"Result: {result_preview(cached_result)} | Total_Time: {total_time:.2f}ms")
                 
                 return cached_result
             
             # Calculate if not in cache
-            result = process_expression(n)
+            details = {}
+            result = process_expression(n, engine=self.calculator_engine,
+                                        budget=self.expression_limits.budget(), details=details)
+            self.nodes_eliminated = details.get('nodes_eliminated')
             
             calc_time = (time.time() - calc_start_time) * 1000
             
@@ -927,6 +1672,14 @@ class Controller:
             
             return result
             
+        except ExpressionLimitError as e:
+            calc_time = (time.time() - calc_start_time) * 1000
+            self.model.calculatorOutputView.setText(str(e))
+            
+            calc_logger.warning(f"CALCULATION_REJECTED | Operation: calculator | Input: '{aString}' | "
+                            f"Reason: {str(e)} | Calc_Time: {calc_time:.2f}ms")
+            raise
+            
         except Exception as e:
             error_msg = "Invalid expression"
             calc_time = (time.time() - calc_start_time) * 1000
@@ -944,32 +1697,36 @@ class Controller:
         """Handle fibonacci operation with detailed logging"""
         calc_start_time = time.time()
         try:
-            n = int(aString.strip())
+            n, modulus = parse_fibonacci_input(aString)
+            key = normalize_fibonacci_input(aString)
             
             # Check cache first
-            cached_result = self.model.cache.get('fibonacci', str(n))
+            cached_result = self.model.cache.get('fibonacci', key)
             if cached_result is not None:
-                self.model.fibonacciOutputView.setText(f"{cached_result} (cached)")
+                self.model.fibonacciOutputView.setResult(cached_result, " (cached)")
                 
                 total_time = (time.time() - overall_start_time) * 1000
-                calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: fibonacci | Input: {n} | "
-                            f"Result: {cached_result} | Total_Time: {total_time:.2f}ms")
+                calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: fibonacci | Input: {key} | "
+                            f"Result: {result_preview(cached_result)} | Total_Time: {total_time:.2f}ms")
                 
                 return cached_result
             
-            # Calculate if not in cache
-            fib = self.fibonnaci(n)
+            # Calculate if not in cache; F(n) mod m never builds the full number
+            if modulus is None:
+                fib = self.fibonnaci(n)
+            else:
+                fib = fibonacci_mod(n, modulus)
             
             calc_time = (time.time() - calc_start_time) * 1000
             
             # Store in cache
-            self.model.cache.set('fibonacci', str(n), fib)
+            self.model.cache.set('fibonacci', key, fib)
             
-            self.model.fibonacciOutputView.setText(str(fib))
+            self.model.fibonacciOutputView.setResult(fib)
             
             total_time = (time.time() - overall_start_time) * 1000
-            calc_logger.info(f"CALCULATION_SUCCESS | Operation: fibonacci | Input: {n} | "
-                        f"Result: {fib} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+            calc_logger.info(f"CALCULATION_SUCCESS | Operation: fibonacci | Input: {key} | "
+                        f"Result_Bits: {fib.bit_length()} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
             
             return fib
             
@@ -996,27 +1753,27 @@ class Controller:
             # Check cache first
             cached_result = self.model.cache.get('factorial', str(n))
             if cached_result is not None:
-                self.model.factorialOutputView.setText(f"{cached_result} (cached)")
+                self.model.factorialOutputView.setResult(cached_result, " (cached)")
                 
                 total_time = (time.time() - overall_start_time) * 1000
                 calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: factorial | Input: {n} | "
-                            f"Result: {cached_result} | Total_Time: {total_time:.2f}ms")
+                            f"Result: {result_preview(cached_result)} | Total_Time: {total_time:.2f}ms")
                 
                 return cached_result
             
-            # Calculate if not in cache
-            factorial_result = self.factorial(n)
+            # Calculate if not in cache, resuming from a cached k! where possible
+            factorial_result = self.factorial_from_checkpoint(n)
             
             calc_time = (time.time() - calc_start_time) * 1000
             
             # Store in cache
             self.model.cache.set('factorial', str(n), factorial_result)
             
-            self.model.factorialOutputView.setText(str(factorial_result))
+            self.model.factorialOutputView.setResult(factorial_result)
             
             total_time = (time.time() - overall_start_time) * 1000
             calc_logger.info(f"CALCULATION_SUCCESS | Operation: factorial | Input: {n} | "
-                        f"Result: {factorial_result} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+                        f"Result: {result_preview(factorial_result)} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
             
             return factorial_result
             
@@ -1032,24 +1789,168 @@ class Controller:
             logger.error(f"Factorial error for input '{aString}': {e}")
             
             return error_msg
+    
+    def _handle_pow(self, aString: str, overall_start_time: float):
+        """Handle pow operation with detailed logging"""
+        calc_start_time = time.time()
+        
+        try:
+            base, exponent, modulus = parse_pow_input(aString)
+            key = normalize_pow_input(aString)
+            
+            # Check cache first
+            cached_result = self.model.cache.get('pow', key)
+            if cached_result is not None:
+                self.model.powOutputView.setResult(cached_result, " (cached)")
+                
+                total_time = (time.time() - overall_start_time) * 1000
+                calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: pow | Input: {key} | "
+                            f"Result: {result_preview(cached_result)} | Total_Time: {total_time:.2f}ms")
+                
+                return cached_result
+            
+            # The size check is cheap; building a result that is too large is not
+            result_bits = pow_result_bits(base, exponent)
+            if modulus is None and result_bits > self.max_pow_result_bits:
+                raise ExpressionLimitError(f"pow result would have up to {result_bits} bits, "
+                                           f"the limit is {self.max_pow_result_bits}")
+            
+            # Calculate if not in cache
+            pow_result = fast_pow(base, exponent, modulus)
+            
+            calc_time = (time.time() - calc_start_time) * 1000
+            
+            # Store in cache
+            self.model.cache.set('pow', key, pow_result)
+            
+            self.model.powOutputView.setResult(pow_result)
+            
+            total_time = (time.time() - overall_start_time) * 1000
+            calc_logger.info(f"CALCULATION_SUCCESS | Operation: pow | Input: {key} | "
+                        f"Result_Bits: {pow_result.bit_length()} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+            
+            return pow_result
+            
+        except ExpressionLimitError as e:
+            calc_time = (time.time() - calc_start_time) * 1000
+            self.model.powOutputView.setText(str(e))
+            
+            calc_logger.warning(f"CALCULATION_REJECTED | Operation: pow | Input: '{aString}' | "
+                            f"Reason: {str(e)} | Calc_Time: {calc_time:.2f}ms")
+            raise
+            
+        except Exception as e:
+            error_msg = "Invalid input"
+            calc_time = (time.time() - calc_start_time) * 1000
+            total_time = (time.time() - overall_start_time) * 1000
+            
+            self.model.powOutputView.setText(error_msg)
+            
+            calc_logger.error(f"CALCULATION_ERROR | Operation: pow | Input: '{aString}' | "
+                            f"Error: {str(e)} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+            logger.error(f"Pow error for input '{aString}': {e}")
+            
+            return error_msg
 
-    def fibonnaci(self, n):
-        """Fibonacci calculation with logging for large numbers"""
-        if n > 100:  # Log performance for large fibonacci numbers
-            start_time = time.time()
-            logger.info(f"Computing large Fibonacci number: {n}")
+    def _handle_combinatorics(self, operation_type: str, aString: str, overall_start_time: float):
+        """Handle binomial, permutations and multinomial operations with detailed logging"""
+        calc_start_time = time.time()
         
+        try:
+            numbers = parse_combinatorics_input(operation_type, aString)
+            key = normalize_combinatorics_input(operation_type, aString)
+            
+            # Check cache first
+            cached_result = self.model.cache.get(operation_type, key)
+            if cached_result is not None:
+                self.model.combinatoricsOutputView.setResult(cached_result, " (cached)")
+                
+                total_time = (time.time() - overall_start_time) * 1000
+                calc_logger.info(f"CALCULATION_SUCCESS_CACHED | Operation: {operation_type} | Input: {key} | "
+                            f"Result: {result_preview(cached_result)} | Total_Time: {total_time:.2f}ms")
+                
+                return cached_result
+            
+            # The lgamma estimate is cheap; building a result that is too large is not
+            result_bits = combinatorics_result_bits(operation_type, numbers)
+            if result_bits > self.max_combinatorics_result_bits:
+                raise ExpressionLimitError(f"{operation_type} result would have up to {result_bits} bits, "
+                                           f"the limit is {self.max_combinatorics_result_bits}")
+            
+            # Calculate if not in cache
+            result = self.combinatorics(operation_type, numbers)
+            
+            calc_time = (time.time() - calc_start_time) * 1000
+            
+            # Store in cache
+            self.model.cache.set(operation_type, key, result)
+            
+            self.model.combinatoricsOutputView.setResult(result)
+            
+            total_time = (time.time() - overall_start_time) * 1000
+            calc_logger.info(f"CALCULATION_SUCCESS | Operation: {operation_type} | Input: {key} | "
+                        f"Result_Bits: {result.bit_length()} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+            
+            return result
+            
+        except ExpressionLimitError as e:
+            calc_time = (time.time() - calc_start_time) * 1000
+            self.model.combinatoricsOutputView.setText(str(e))
+            
+            calc_logger.warning(f"CALCULATION_REJECTED | Operation: {operation_type} | Input: '{aString}' | "
+                            f"Reason: {str(e)} | Calc_Time: {calc_time:.2f}ms")
+            raise
+            
+        except Exception as e:
+            error_msg = "Invalid input"
+            calc_time = (time.time() - calc_start_time) * 1000
+            total_time = (time.time() - overall_start_time) * 1000
+            
+            self.model.combinatoricsOutputView.setText(error_msg)
+            
+            calc_logger.error(f"CALCULATION_ERROR | Operation: {operation_type} | Input: '{aString}' | "
+                            f"Error: {str(e)} | Calc_Time: {calc_time:.2f}ms | Total_Time: {total_time:.2f}ms")
+            logger.error(f"{operation_type.capitalize()} error for input '{aString}': {e}")
+            
+            return error_msg
+    
+    def combinatorics(self, operation_type: str, numbers: list) -> int:
+        """Binomial, k-permutations or multinomial, dividing cached factorials when they are all small and cached"""
+        if operation_type == 'multinomial':
+            n, denominators = sum(numbers), numbers
+        else:
+            n, k = numbers
+            denominators = [k, n - k] if operation_type == 'binomial' else [n - k]
+        
+        if n <= self.combinatorics_cache_reuse_limit and self.model is not None:
+            cached = [self.model.cache.cached_factorial(m) for m in [n] + denominators]
+            if all(value is not None for value in cached):
+                divisor = 1
+                for value in cached[1:]:
+                    divisor *= value
+                calc_logger.info(f"COMBINATORICS_FROM_CACHE | Operation: {operation_type} | Factorials: {[n] + denominators}")
+                return cached[0] // divisor
+        
+        # Prime exponents / multiplicative formulas, n! itself is never built
+        if operation_type == 'binomial':
+            return binomial(n, k)
+        if operation_type == 'permutations':
+            return permutations(n, k)
+        return multinomial(numbers)
+    
+    def fibonnaci(self, n):
+        """Fibonacci calculation (fast doubling, O(log n) multiplications) with logging for large numbers"""
         # Base condition
         if(n <= 1):
             return n
         
-        # Problem broken down into 2 function calls
-        last = self.fibonnaci(n - 1)
-        slast = self.fibonnaci(n - 2)
+        if n > 100000:  # Log performance for large fibonacci numbers
+            start_time = time.time()
+            logger.info(f"Computing large Fibonacci number: {n}")
         
-        result = last + slast
+        result = fibonacci(n)
         
-        if n > 100:
+        if n > 100000:
             execution_time = (time.time() - start_time) * 1000
             logger.info(f"Large Fibonacci {n} computed in {execution_time:.2f}ms")
         
@@ -1064,15 +1965,57 @@ class Controller:
         if n > 1000:  # Log for large factorials
             logger.info(f"Computing large factorial: {n}")
         
-        P = 1
-        for i in range(1, n + 1):
-            P *= i
-        return P
+        if self.factorial_workers > 1 and n >= self.factorial_parallel_threshold:
+            result, chunks = parallel_factorial(n, self.factorial_workers)
+            self.factorial_parallelism = {'workers': self.factorial_workers, 'chunks': chunks}
+            logger.info(f"Factorial {n} computed on {self.factorial_workers} workers in {chunks} chunks")
+            return result
+        
+        # Prime-swing recursion over balanced product trees
+        self.factorial_parallelism = {'workers': 1, 'chunks': 1}
+        return prime_swing_factorial(n)
+    
+    def factorial_from_checkpoint(self, n):
+        """n! computed as k! * (k+1)...n from the largest cached k <= n when that is cheaper"""
+        if n < 0:
+            return self.factorial(n)
+        
+        # the Controller outlives a request in the GUI; report only this computation
+        self.factorial_parallelism = None
+        self.factorial_resumed_from = None
+        
+        cache = self.model.cache
+        nearest = cache.nearest_factorial(n) or (0, 1)
+        
+        # Leave a sparse checkpoint behind (e.g. 5000! on the way to 5432!)
+        interval = self.factorial_checkpoint_interval
+        checkpoint = n - n % interval if interval > 0 else 0
+        if nearest[0] < checkpoint < n:
+            if nearest[0] >= checkpoint // 2:
+                checkpoint_result = nearest[1] * product_range(nearest[0] + 1, checkpoint)
+            else:
+                checkpoint_result = self.factorial(checkpoint)
+            # a checkpoint is a new key with no recorded lookups, which TinyLFU would always reject
+            cache.set('factorial', str(checkpoint), checkpoint_result, bypass_admission=True)
+            nearest = (checkpoint, checkpoint_result)
+        
+        # Resuming only pays off when most of the product is already done
+        k, k_factorial = nearest
+        if k > 0 and k >= n // 2:
+            self.factorial_resumed_from = k
+            # the rest of the product runs here; the checkpoint may have been computed in parallel
+            if self.factorial_parallelism is None:
+                self.factorial_parallelism = {'workers': 1, 'chunks': 1}
+            calc_logger.info(f"FACTORIAL_RESUME | Input: {n} | From: {k}")
+            return k_factorial * product_range(k + 1, n)
+        
+        return self.factorial(n)
     
     def calculate(self, operation_type: str, input_value: str, ip_address: str = None, user_agent: str = None):
         """Main calculation method for API calls with comprehensive logging"""
         api_start_time = time.time()
         request_id = None
+        cache_key = None
         
         try:
             # Log API request start
@@ -1083,7 +2026,11 @@ class Controller:
             operation_map = {
                 'calculator': 1,
                 'fibonacci': 2,
-                'factorial': 3
+                'factorial': 3,
+                'pow': 4,
+                'binomial': 5,
+                'permutations': 6,
+                'multinomial': 7
             }
             
             if operation_type not in operation_map:
@@ -1096,6 +2043,17 @@ class Controller:
                 self.model.setFibonacciView(MyDisplayBox(Point(0, 0), 0, 0))
             if self.model.factorialOutputView is None:
                 self.model.setFactorialView(MyDisplayBox(Point(0, 0), 0, 0))
+            if self.model.powOutputView is None:
+                self.model.setPowView(MyDisplayBox(Point(0, 0), 0, 0))
+            if self.model.combinatoricsOutputView is None:
+                self.model.setCombinatoricsView(MyDisplayBox(Point(0, 0), 0, 0))
+            
+            # Reject overly complex expressions before they reach the engine
+            if operation_type == 'calculator':
+                check_expression(input_value, self.expression_limits)
+            
+            # Equivalent spellings of an input share one cache entry and DB key
+            cache_key = self.model.cache.make_key(operation_type, input_value)
             
             # Check cache first
             cached_result = self.model.cache.get(operation_type, input_value)
@@ -1106,14 +2064,15 @@ class Controller:
                 request_id = self.db_manager.log_request(
                     operation_type=operation_type,
                     input_value=input_value,
-                    result=f"{cached_result} (cached)",
+                    result=f"{result_preview(cached_result)} (cached)",
                     status="success_cached",
                     ip_address=ip_address,
-                    user_agent=user_agent
+                    user_agent=user_agent,
+                    cache_key=cache_key
                 )
                 
                 calc_logger.info(f"API_REQUEST_SUCCESS_CACHED | Operation: {operation_type} | Input: '{input_value}' | "
-                            f"Result: {cached_result} | API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
+                            f"Result: {result_preview(cached_result)} | API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
                 
                 return {
                     'request_id': request_id,
@@ -1142,6 +2101,10 @@ class Controller:
                     result = self.model.fibonacciOutputView.getText()
                 elif operation_type == "factorial":
                     result = self.model.factorialOutputView.getText()
+                elif operation_type == "pow":
+                    result = self.model.powOutputView.getText()
+                elif operation_type in ("binomial", "permutations", "multinomial"):
+                    result = self.model.combinatoricsOutputView.getText()
             
             api_time = (time.time() - api_start_time) * 1000
             
@@ -1149,17 +2112,18 @@ class Controller:
             request_id = self.db_manager.log_request(
                 operation_type=operation_type,
                 input_value=input_value,
-                result=str(result),
+                result=result_preview(result),
                 status="success",
                 ip_address=ip_address,
-                user_agent=user_agent
+                user_agent=user_agent,
+                cache_key=cache_key
             )
             
             calc_logger.info(f"API_REQUEST_SUCCESS | Operation: {operation_type} | Input: '{input_value}' | "
-                        f"Result: {result} | Calc_Time: {calc_time:.2f}ms | API_Time: {api_time:.2f}ms | "
+                        f"Result: {result_preview(result)} | Calc_Time: {calc_time:.2f}ms | API_Time: {api_time:.2f}ms | "
                         f"Request_ID: {request_id}")
             
-            return {
+            response = {
                 'request_id': request_id,
                 'operation_type': operation_type,
                 'input_value': input_value,
@@ -1171,6 +2135,19 @@ class Controller:
                 'calculation_time_ms': calc_time
             }
             
+            # Optimizer metadata reported by the compiled engines
+            if operation_type == 'calculator' and self.nodes_eliminated is not None:
+                response['nodes_eliminated'] = self.nodes_eliminated
+            
+            # How the factorial was split (next to the timing fields)
+            if operation_type == 'factorial' and self.factorial_parallelism:
+                response['factorial_workers'] = self.factorial_parallelism['workers']
+                response['factorial_chunks'] = self.factorial_parallelism['chunks']
+                if self.factorial_resumed_from is not None:
+                    response['factorial_resumed_from'] = self.factorial_resumed_from
+            
+            return response
+            
         except Exception as e:
             api_time = (time.time() - api_start_time) * 1000
             error_message = str(e)
@@ -1182,7 +2159,8 @@ class Controller:
                 status="error",
                 error_message=error_message,
                 ip_address=ip_address,
-                user_agent=user_agent
+                user_agent=user_agent,
+                cache_key=cache_key
             )
             
             calc_logger.error(f"API_REQUEST_ERROR | Operation: {operation_type} | Input: '{input_value}' | "
@@ -1200,6 +2178,299 @@ class Controller:
                 'execution_time_ms': api_time
             }
 
+    def calculate_vectorized(self, expression: str, bindings: dict, ip_address: str = None, user_agent: str = None):
+        """Evaluate one expression over columns of variable bindings in a single pass"""
+        api_start_time = time.time()
+        operation_type = 'calculator_vectorized'
+        
+        try:
+            calc_logger.info(f"API_REQUEST_START | Operation: {operation_type} | Input: '{expression}' | "
+                        f"IP: {ip_address} | User_Agent: {user_agent}")
+            
+            if not isinstance(bindings, dict):
+                raise ValueError("bindings must be an object mapping variable names to lists")
+            
+            check_expression(expression, self.expression_limits)
+            
+            # Parsed and compiled once, shared with the scalar calculator path
+            compiled = compile_cache.get(expression)
+            
+            for name in compiled.variables:
+                if isinstance(bindings.get(name), list) and len(bindings[name]) > self.max_vectorized_rows:
+                    raise ValueError(f"At most {self.max_vectorized_rows} rows can be evaluated per request")
+            
+            calc_start_time = time.time()
+            values = evaluate_vectorized(compiled.optimized_tree, bindings, compiled.variables)
+            results = values.tolist()
+            calc_time = (time.time() - calc_start_time) * 1000
+            
+            api_time = (time.time() - api_start_time) * 1000
+            
+            # One summary row for the whole batch
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=expression,
+                result=f"{len(results)} values",
+                status="success",
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            
+            calc_logger.info(f"API_REQUEST_SUCCESS | Operation: {operation_type} | Input: '{expression}' | "
+                        f"Rows: {len(results)} | Calc_Time: {calc_time:.2f}ms | API_Time: {api_time:.2f}ms | "
+                        f"Request_ID: {request_id}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': expression,
+                'variables': compiled.variables,
+                'count': len(results),
+                'results': results,
+                'nodes_eliminated': compiled.nodes_eliminated,
+                'status': 'success',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time,
+                'calculation_time_ms': calc_time
+            }
+            
+        except Exception as e:
+            api_time = (time.time() - api_start_time) * 1000
+            error_message = str(e)
+            
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=expression,
+                status="error",
+                error_message=error_message,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            
+            calc_logger.error(f"API_REQUEST_ERROR | Operation: {operation_type} | Input: '{expression}' | "
+                            f"Error: {error_message} | API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
+            logger.error(f"API vectorized calculation error: {error_message}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': expression,
+                'error': error_message,
+                'status': 'error',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time
+            }
+    
+    def calculate_decimal(self, expression: str, precision: int, ip_address: str = None, user_agent: str = None):
+        """Evaluate a calculator expression in Decimal arithmetic with `precision` significant digits"""
+        api_start_time = time.time()
+        operation_type = 'calculator'
+        cache_key = None
+        
+        try:
+            calc_logger.info(f"API_REQUEST_START | Operation: {operation_type} | Precision: {precision} | "
+                        f"Input: '{expression}' | IP: {ip_address} | User_Agent: {user_agent}")
+            
+            check_expression(expression, self.expression_limits)
+            
+            tree = parse_decimal_expression(expression)
+            cache_key = decimal_cache_key(tree, precision)
+            
+            cached_result = self.model.cache.get('calculator_decimal', cache_key)
+            cached = cached_result is not None
+            
+            calc_start_time = time.time()
+            if cached:
+                result = cached_result
+            else:
+                result = str(evaluate_decimal(tree, precision, budget=self.expression_limits.budget()))
+                self.model.cache.set('calculator_decimal', cache_key, result)
+            calc_time = (time.time() - calc_start_time) * 1000
+            
+            api_time = (time.time() - api_start_time) * 1000
+            
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=expression,
+                result=f"{result} (cached)" if cached else result,
+                status="success_cached" if cached else "success",
+                ip_address=ip_address,
+                user_agent=user_agent,
+                cache_key=cache_key
+            )
+            
+            calc_logger.info(f"API_REQUEST_SUCCESS | Operation: {operation_type} | Precision: {precision} | "
+                        f"Input: '{expression}' | Result: {result} | Cached: {cached} | Calc_Time: {calc_time:.2f}ms | "
+                        f"API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': expression,
+                'precision': precision,
+                'result': result,
+                'cached': cached,
+                'status': 'success',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time,
+                'calculation_time_ms': calc_time
+            }
+            
+        except Exception as e:
+            api_time = (time.time() - api_start_time) * 1000
+            error_message = str(e)
+            
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=expression,
+                status="error",
+                error_message=error_message,
+                ip_address=ip_address,
+                user_agent=user_agent,
+                cache_key=cache_key
+            )
+            
+            calc_logger.error(f"API_REQUEST_ERROR | Operation: {operation_type} | Precision: {precision} | "
+                            f"Input: '{expression}' | Error: {error_message} | API_Time: {api_time:.2f}ms | "
+                            f"Request_ID: {request_id}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': expression,
+                'precision': precision,
+                'error': error_message,
+                'status': 'error',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time
+            }
+    
+    def calculate_summary(self, operation_type: str, input_value: str, ip_address: str = None, user_agent: str = None):
+        """Digit count, leading digits, trailing zeros and bit length of n! or F(n) without computing it"""
+        api_start_time = time.time()
+        
+        try:
+            calc_logger.info(f"API_REQUEST_START | Operation: {operation_type} | Mode: summary | Input: '{input_value}' | "
+                        f"IP: {ip_address} | User_Agent: {user_agent}")
+            
+            calc_start_time = time.time()
+            if operation_type == 'factorial':
+                summary = factorial_summary(int(str(input_value).strip()))
+            elif operation_type == 'fibonacci':
+                n, modulus = parse_fibonacci_input(input_value)
+                if modulus is not None:
+                    raise ValueError("summary mode does not apply to fibonacci modulo m")
+                summary = fibonacci_summary(n)
+            else:
+                raise ValueError(f"summary mode is only available for factorial and fibonacci, not {operation_type}")
+            calc_time = (time.time() - calc_start_time) * 1000
+            
+            api_time = (time.time() - api_start_time) * 1000
+            
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=input_value,
+                result=json.dumps(summary),
+                status="success",
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            
+            calc_logger.info(f"API_REQUEST_SUCCESS | Operation: {operation_type} | Mode: summary | Input: '{input_value}' | "
+                        f"Digits: {summary['digit_count']} | Calc_Time: {calc_time:.2f}ms | API_Time: {api_time:.2f}ms | "
+                        f"Request_ID: {request_id}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': input_value,
+                'mode': 'summary',
+                'result': summary,
+                'cached': False,
+                'status': 'success',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time,
+                'calculation_time_ms': calc_time
+            }
+            
+        except Exception as e:
+            api_time = (time.time() - api_start_time) * 1000
+            error_message = str(e)
+            
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=input_value,
+                status="error",
+                error_message=error_message,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            
+            calc_logger.error(f"API_REQUEST_ERROR | Operation: {operation_type} | Mode: summary | Input: '{input_value}' | "
+                            f"Error: {error_message} | API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
+            
+            return {
+                'request_id': request_id,
+                'operation_type': operation_type,
+                'input_value': input_value,
+                'mode': 'summary',
+                'error': error_message,
+                'status': 'error',
+                'session_id': self.model.get_session_id(),
+                'execution_time_ms': api_time
+            }
+    
+    def validate_fibonacci_range(self, start, end) -> Tuple[int, int]:
+        """Parse and bound-check a fibonacci range request"""
+        try:
+            start, end = int(start), int(end)
+        except (TypeError, ValueError):
+            raise ValueError("start and end must be integers")
+        if start < 0 or end < start:
+            raise ValueError("range must satisfy 0 <= start <= end")
+        if end - start + 1 > self.max_fibonacci_range:
+            raise ValueError(f"At most {self.max_fibonacci_range} values can be streamed per request")
+        return start, end
+    
+    def stream_fibonacci_range(self, start: int, end: int, ip_address: str = None, user_agent: str = None):
+        """Yield F(start..end) as NDJSON lines and log one summary row when the stream ends"""
+        api_start_time = time.time()
+        operation_type = 'fibonacci_range'
+        input_value = f"{start}..{end}"
+        count = 0
+        error_message = None
+        
+        calc_logger.info(f"API_REQUEST_START | Operation: {operation_type} | Input: '{input_value}' | "
+                    f"IP: {ip_address} | User_Agent: {user_agent}")
+        
+        try:
+            for n, value in fibonacci_range(start, end):
+                yield json.dumps({'n': n, 'result': int_to_decimal(value)}) + '\n'
+                count += 1
+        except Exception as e:
+            error_message = str(e)
+            yield json.dumps({'n': start + count, 'error': error_message, 'status': 'error'}) + '\n'
+        finally:
+            # also reached when the client disconnects mid-stream
+            api_time = (time.time() - api_start_time) * 1000
+            request_id = self.db_manager.log_request(
+                operation_type=operation_type,
+                input_value=input_value,
+                result=f"{count} values",
+                status="error" if error_message else "success",
+                error_message=error_message,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+            
+            if error_message:
+                calc_logger.error(f"API_REQUEST_ERROR | Operation: {operation_type} | Input: '{input_value}' | "
+                                f"Error: {error_message} | Values: {count} | API_Time: {api_time:.2f}ms | "
+                                f"Request_ID: {request_id}")
+            else:
+                calc_logger.info(f"API_REQUEST_SUCCESS | Operation: {operation_type} | Input: '{input_value}' | "
+                            f"Values: {count} | API_Time: {api_time:.2f}ms | Request_ID: {request_id}")
+
 # ----------------------------- VIEW-CONTROLLER ASSOCIATION --------------------
 
 class MyRadioButton:
@@ -1307,8 +2578,27 @@ app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 CORS(app)
 
-# Initialize GLOBAL cache that persists between requests
-global_cache = ExpressionCache()
+# Initialize GLOBAL cache that persists between requests; the on-disk result store is
+# attached when the application starts (see __main__), so importing this module (tests,
+# benchmarks) creates no files and no writer thread
+
+# CACHE_BACKEND=shared keeps the results in shared memory, so all worker processes on the
+# host share one cache; the default 'memory' keeps a cache per process
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'memory')
+if CACHE_BACKEND == 'shared':
+    # imported here: the shared table needs fcntl (POSIX only)
+    from python_calculator.shared_cache import SharedResultTable
+    global_cache = SharedExpressionCache(
+        SharedResultTable(
+            name=os.environ.get('SHARED_CACHE_NAME', 'calculator_cache'),
+            slot_count=int(os.environ.get('SHARED_CACHE_SLOTS', 65536)),
+            arena_size=int(os.environ.get('SHARED_CACHE_BYTES', 256 * 1024 * 1024))
+        )
+    )
+elif CACHE_BACKEND == 'memory':
+    global_cache = ExpressionCache()
+else:
+    raise ValueError("CACHE_BACKEND must be 'memory' or 'shared'")
 
 # ----------------------------- API ENDPOINTS --------------------------------
 
@@ -1330,6 +2620,37 @@ def health_check():
         'version': '1.0.0'
     }), 200
 
+# Integer results whose encoded form is longer than this (in characters) are streamed
+RESULT_STREAM_THRESHOLD = int(os.environ.get('RESULT_STREAM_THRESHOLD', 1000000))
+
+def encoded_result_response(result: dict, status_code: int, encoding: str = 'auto'):
+    """JSON response with an integer result rendered as decimal, hex or base64 text"""
+    value = result.get('result')
+    if not isinstance(value, int) or isinstance(value, bool):
+        return jsonify(result), status_code
+    
+    # 'auto' keeps plain JSON numbers while they are small enough for str()
+    if encoding == 'auto':
+        if value.bit_length() <= SAFE_STR_BITS:
+            return jsonify(result), status_code
+        encoding = 'decimal'
+    result['result_encoding'] = encoding
+    
+    # the decimal form is the longest, about bits / 3.32 characters
+    if value.bit_length() // 3 < RESULT_STREAM_THRESHOLD:
+        result['result'] = encode_int(value, encoding)
+        return jsonify(result), status_code
+    
+    # Stream the envelope around the result text instead of building one huge JSON string
+    fields = {key: field for key, field in result.items() if key != 'result'}
+    
+    def generate():
+        yield json.dumps(fields)[:-1] + ', "result": "'
+        yield from iter_encoded(value, encoding)
+        yield '"}'
+    
+    return Response(stream_with_context(generate()), status=status_code, mimetype='application/json')
+
 @app.route('/api/calculate', methods=['POST'])
 def api_calculate():
     """Main calculation endpoint with enhanced logging"""
@@ -1350,12 +2671,31 @@ def api_calculate():
         operation_type = data.get('operation_type')
         input_value = data.get('input_value')
         session_id = data.get('session_id')
+        mode = data.get('mode', 'full')
+        encoding = data.get('encoding', 'auto')
+        precision = data.get('precision')
         
         if not operation_type or input_value is None:
             error_msg = 'operation_type and input_value are required'
             logger.warning(f"Bad request from {client_ip}: {error_msg}")
             return jsonify({'error': error_msg}), 400
         
+        if mode not in ('full', 'summary'):
+            error_msg = "mode must be 'full' or 'summary'"
+            logger.warning(f"Bad request from {client_ip}: {error_msg}")
+            return jsonify({'error': error_msg}), 400
+        
+        if encoding != 'auto' and encoding not in RESULT_ENCODINGS:
+            error_msg = f"encoding must be 'auto' or one of {', '.join(RESULT_ENCODINGS)}"
+            logger.warning(f"Bad request from {client_ip}: {error_msg}")
+            return jsonify({'error': error_msg}), 400
+        
+        if precision is not None and (operation_type != 'calculator' or not isinstance(precision, int)
+                                      or isinstance(precision, bool)):
+            error_msg = 'precision must be an integer and is only supported for the calculator'
+            logger.warning(f"Bad request from {client_ip}: {error_msg}")
+            return jsonify({'error': error_msg}), 400
+        
         # Create model and controller with GLOBAL cache
         model = Model(db_manager, session_id, global_cache)
         controller = Controller(db_manager)
@@ -1365,19 +2705,47 @@ def api_calculate():
         ip_address = request.remote_addr
         user_agent = request.headers.get('User-Agent')
         
+        # Admins can ask for the engine's intermediate steps; without the header
+        # no tracer is installed and the engine skips all trace recording
+        trace_requested = request.headers.get('X-Calculator-Trace') == '1' and auth_manager.is_admin()
+        
         # Perform calculation
-        result = controller.calculate(
-            operation_type=operation_type,
-            input_value=str(input_value),
-            ip_address=ip_address,
-            user_agent=user_agent
-        )
+        if precision is not None:
+            result = controller.calculate_decimal(
+                expression=str(input_value),
+                precision=precision,
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+        elif mode == 'summary':
+            result = controller.calculate_summary(
+                operation_type=operation_type,
+                input_value=str(input_value),
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
+        elif trace_requested:
+            with tracing() as tracer:
+                result = controller.calculate(
+                    operation_type=operation_type,
+                    input_value=str(input_value),
+                    ip_address=ip_address,
+                    user_agent=user_agent
+                )
+            result['trace'] = tracer.to_dict()
+        else:
+            result = controller.calculate(
+                operation_type=operation_type,
+                input_value=str(input_value),
+                ip_address=ip_address,
+                user_agent=user_agent
+            )
         
         request_time = (time.time() - request_start_time) * 1000
         
         if result['status'] == 'success':
             logger.info(f"API request completed successfully in {request_time:.2f}ms for {client_ip}")
-            return jsonify(result), 200
+            return encoded_result_response(result, 200, encoding)
         else:
             logger.warning(f"API request failed in {request_time:.2f}ms for {client_ip}: {result.get('error', 'Unknown error')}")
             return jsonify(result), 400
@@ -1407,6 +2775,41 @@ def api_calculator():
         logger.error(f"Calculator API error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/calculator/vectorized', methods=['POST'])
+def api_calculator_vectorized():
+    """Evaluate one expression over many variable bindings"""
+    request_start_time = time.time()
+    client_ip = request.remote_addr
+    
+    try:
+        data = request.get_json()
+        if not data or 'expression' not in data or 'bindings' not in data:
+            return jsonify({'error': 'expression and bindings are required'}), 400
+        
+        model = Model(db_manager, data.get('session_id'), global_cache)
+        controller = Controller(db_manager)
+        controller.setModel(model)
+        
+        result = controller.calculate_vectorized(
+            expression=str(data['expression']),
+            bindings=data['bindings'],
+            ip_address=client_ip,
+            user_agent=request.headers.get('User-Agent')
+        )
+        
+        request_time = (time.time() - request_start_time) * 1000
+        
+        if result['status'] == 'success':
+            logger.info(f"Vectorized request completed in {request_time:.2f}ms for {client_ip} ({result['count']} rows)")
+            return jsonify(result), 200
+        else:
+            logger.warning(f"Vectorized request failed in {request_time:.2f}ms for {client_ip}: {result.get('error', 'Unknown error')}")
+            return jsonify(result), 400
+        
+    except Exception as e:
+        logger.error(f"Vectorized calculator API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/fibonacci', methods=['POST'])
 def api_fibonacci():
     """Fibonacci-specific endpoint"""
@@ -1417,6 +2820,8 @@ def api_fibonacci():
         
         data['operation_type'] = 'fibonacci'
         data['input_value'] = data.pop('n')
+        if data.get('mod') is not None:
+            data['input_value'] = f"{data['input_value']},{data.pop('mod')}"
         
         return api_calculate()
         
@@ -1424,6 +2829,32 @@ def api_fibonacci():
         logger.error(f"Fibonacci API error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/fibonacci/range', methods=['POST'])
+def api_fibonacci_range():
+    """Stream F(start..end) as newline-delimited JSON"""
+    client_ip = request.remote_addr
+    
+    try:
+        data = request.get_json()
+        if not data or 'start' not in data or 'end' not in data:
+            return jsonify({'error': 'start and end are required'}), 400
+        
+        controller = Controller(db_manager)
+        
+        try:
+            start, end = controller.validate_fibonacci_range(data['start'], data['end'])
+        except ValueError as e:
+            logger.warning(f"Bad fibonacci range request from {client_ip}: {e}")
+            return jsonify({'error': str(e)}), 400
+        
+        logger.info(f"Streaming Fibonacci range {start}..{end} to {client_ip}")
+        stream = controller.stream_fibonacci_range(start, end, client_ip, request.headers.get('User-Agent'))
+        return Response(stream_with_context(stream), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        logger.error(f"Fibonacci range API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/factorial', methods=['POST'])
 def api_factorial():
     """Factorial-specific endpoint"""
@@ -1441,6 +2872,64 @@ def api_factorial():
         logger.error(f"Factorial API error: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+@app.route('/api/pow', methods=['POST'])
+def api_pow():
+    """Pow-specific endpoint (base, exponent, optional modulus)"""
+    try:
+        data = request.get_json()
+        if not data or 'base' not in data or 'exponent' not in data:
+            return jsonify({'error': 'base and exponent are required'}), 400
+        
+        arguments = [data.pop('base'), data.pop('exponent')]
+        if data.get('modulus') is not None:
+            arguments.append(data.pop('modulus'))
+        
+        data['operation_type'] = 'pow'
+        data['input_value'] = ','.join(str(argument) for argument in arguments)
+        
+        return api_calculate()
+        
+    except Exception as e:
+        logger.error(f"Pow API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
+@app.route('/api/binomial', methods=['POST'])
+def api_binomial():
+    """Binomial coefficient endpoint (n, k)"""
+    return combinatorics_endpoint('binomial')
+
+@app.route('/api/permutations', methods=['POST'])
+def api_permutations():
+    """k-permutations endpoint (n, k)"""
+    return combinatorics_endpoint('permutations')
+
+@app.route('/api/multinomial', methods=['POST'])
+def api_multinomial():
+    """Multinomial coefficient endpoint (counts)"""
+    return combinatorics_endpoint('multinomial')
+
+def combinatorics_endpoint(operation_type: str):
+    """Shared body of the binomial/permutations/multinomial endpoints"""
+    try:
+        data = request.get_json()
+        if operation_type == 'multinomial':
+            if not data or not isinstance(data.get('counts'), list):
+                return jsonify({'error': 'counts (a list of integers) is required'}), 400
+            arguments = data.pop('counts')
+        else:
+            if not data or 'n' not in data or 'k' not in data:
+                return jsonify({'error': 'n and k are required'}), 400
+            arguments = [data.pop('n'), data.pop('k')]
+        
+        data['operation_type'] = operation_type
+        data['input_value'] = ','.join(str(argument) for argument in arguments)
+        
+        return api_calculate()
+        
+    except Exception as e:
+        logger.error(f"{operation_type.capitalize()} API error: {e}")
+        return jsonify({'error': 'Internal server error'}), 500
+
 @app.route('/api/history', methods=['GET'])
 def api_history():
     """Get request history with pagination"""
@@ -1481,6 +2970,7 @@ def api_cache_stats():
         
         return jsonify({
             'cache_stats': stats,
+            'compile_cache_stats': compile_cache.get_stats(),
             'timestamp': datetime.utcnow().isoformat()
         }), 200
         
@@ -1506,6 +2996,8 @@ def api_cache_clear():
 
         # Clear the global cache
         global_cache.clear_cache(operation_type)
+        if operation_type in (None, 'calculator'):
+            compile_cache.clear()
 
         message = f"Cache cleared for {operation_type}" if operation_type else "All caches cleared"
         request_time = (time.time() - request_start_time) * 1000
@@ -1674,7 +3166,10 @@ def index():
         
         # Proceed if no permission error
         if not error_message:
-            chCntrl.inpControl(input_text)
+            try:
+                chCntrl.inpControl(input_text)
+            except ExpressionLimitError as e:
+                firstdb.setText(str(e))
         
         # Set current_input for rendering
         current_input = input_text
@@ -1846,6 +3341,11 @@ if __name__ == "__main__":
     # Initialize database manager
     db_manager = DatabaseManager()
     
+    # Back the global cache with the persistent result store, so expensive results
+    # survive restarts (RESULT_STORE=false turns it off)
+    if os.environ.get('RESULT_STORE', 'true').lower() == 'true':
+        global_cache.store = ResultStore()
+    
     print("=== Calculator Application with Authentication ===")
     
     # Setup authentication based on environment
@@ -81,15 +81,19 @@ class Eva:
             elif y == int(y):
                 #facem trunc ca daca primim ca input 2.0 sa il facem in 2
                 y_i = math.trunc(y)
+                #ridicare la putere prin patrare repetata (square-and-multiply), O(log y) inmultiri
                 p = 1
-                i = 1
-                while i <= y_i / 2:
-                    p = p * x
-                    p = p * p
-                    i = i + 1
-                #daca y este impar atunci mai inmultim o data la final
-                if not self.estePar(y_i):
-                    p = p * x
+                baza = x
+                e = abs(y_i)
+                while e > 0:
+                    if e % 2 == 1:
+                        p = p * baza
+                    e = e // 2
+                    if e > 0:
+                        baza = baza * baza
+                #pentru exponent negativ impartim 1 la rezultat
+                if y_i < 0:
+                    return self.impartit(1, p)
                 return p
             else:
                 return self.exponential(self.inmultit(y, self.logaritm(x)))
@@ -0,0 +1,84 @@
+import sys
+from decimal import Decimal
+
+# Sizing and admission of result cache entries.
+# The byte budgets of ExpressionCache are charged with what the entry really
+# keeps alive: sys.getsizeof of the key and of the result, walking into the
+# containers some operations return (vectorized rows, summary dicts).
+# A 50000! (213,237 decimal digits, 708,357 bits) is charged the ~94 KB its int
+# object takes, a float ~24 bytes.
+#
+# Admission follows TinyLFU: every access is counted in a count-min sketch
+# (4 rows of counters saturating at 15) and a new entry that would force
+# evictions is only stored when its estimated frequency is higher than the
+# frequency of the entries it would evict. After 10 * width counted accesses
+# all counters are halved, so old popularity fades out.
+
+# admission policies of ExpressionCache
+ADMISSION_POLICIES = ('tinylfu', 'lru')
+
+# largest value of a sketch counter
+MAX_COUNT = 15
+
+# byte -> byte halved, for aging a sketch row with bytearray.translate
+_HALVED = bytes(i >> 1 for i in range(256))
+
+
+def value_size(value) -> int:
+    """Approximate number of bytes held by a cached result"""
+    if isinstance(value, (int, float, str, bytes, Decimal)) or value is None:
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(value_size(k) + value_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(value_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def entry_size(key: str, value) -> int:
+    """Bytes charged to a namespace for one key/result pair"""
+    return sys.getsizeof(key) + value_size(value)
+
+
+class FrequencySketch:
+    """Count-min sketch of key access frequencies with periodic aging"""
+
+    def __init__(self, capacity: int, depth: int = 4, sample_factor: int = 10):
+        # one counter per cached entry and row, rounded up to a power of two
+        width = 64
+        while width < capacity:
+            width <<= 1
+        self.mask = width - 1
+        self.rows = [bytearray(width) for _ in range(depth)]
+        self.sample_size = sample_factor * width
+        self.additions = 0
+
+    def _indexes(self, key):
+        # double hashing: row i uses h1 + i * h2
+        h1 = hash(key)
+        h2 = (h1 >> 32) | 1
+        return [(h1 + i * h2) & self.mask for i in range(len(self.rows))]
+
+    def increment(self, key):
+        """Count one access of key"""
+        for row, index in zip(self.rows, self._indexes(key)):
+            if row[index] < MAX_COUNT:
+                row[index] += 1
+        self.additions += 1
+        if self.additions >= self.sample_size:
+            self.age()
+
+    def estimate(self, key) -> int:
+        """Upper estimate of the (aged) number of accesses of key"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key)))
+
+    def age(self):
+        """Halve every counter"""
+        for i, row in enumerate(self.rows):
+            self.rows[i] = bytearray(row.translate(_HALVED))
+        self.additions //= 2
+
+    def clear(self):
+        for row in self.rows:
+            row[:] = bytes(len(row))
+        self.additions = 0
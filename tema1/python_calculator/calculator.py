@@ -1,4 +1,7 @@
 from ClassEva import Eva
+from expression_compiler import compile_cache
+from expression_limits import ExpressionLimitError
+from tracing import active_tracer
 import re
 import ast
 
@@ -128,12 +131,13 @@ def isfloat(num):
 
 def inlocuieste_cu_minus(sir):
     # sir = "3+5*-12.25-5.0-7.0"
+    tracer = active_tracer()
     lst_valori = re.findall(r'[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?', sir)
     #
     #parcugem sir si salvam semnele in lst_semn
     n = len(sir)
     sir = list(sir)
-    print("@@@", sir)
+    if tracer: tracer.record("@@@", sir)
     #mai intai verificam daca avem un minus langa minus atunci devine plus
     #iar daca avem minus cu plus devine minus sau
     #plus cu minus obtinem minus
@@ -297,6 +301,7 @@ def facem_o_operatie(sir):
 
 #facem conversia din string in float
 def calculam_lst_fara_paranteze_1(sir):
+    tracer = active_tracer()
     eva = Eva()
     # facem fara functia operator_first_lst aici
     n = len(sir)
@@ -317,11 +322,11 @@ def calculam_lst_fara_paranteze_1(sir):
                 if sir[i] == "*" or sir[i] == "/" or sir[i] == "^^" or sir[i] == "+" or sir[i] == "-":
                     lista_semne.append(sir[i])
 
-            print("lista_semne=", lista_semne)
+            if tracer: tracer.record("lista_semne=", lista_semne)
             lista_flaoturi = re.findall(r"\d+\.\d+", sir)
             res = re.findall(r"[-+]?(?:\d*\.*\d+)", sir)
-            print("lista_floaturi_2=", res)
-            print("lista_floaturi=", lista_flaoturi)
+            if tracer: tracer.record("lista_floaturi_2=", res)
+            if tracer: tracer.record("lista_floaturi=", lista_flaoturi)
 
             #vedem care din cele 2 liste este mai mare parcurgem lista mai mica caci cea mare sigur are elementul
             #care incepe cu - in fata
@@ -384,7 +389,7 @@ def calculam_lst_fara_paranteze_1(sir):
                     sir.insert(0, "-")
 
 
-    print("SIR=", sir)
+    if tracer: tracer.record("SIR=", sir)
 
     sir_2 = facem_o_operatie(sir)
     while sir_2 != sir:
@@ -394,6 +399,7 @@ def calculam_lst_fara_paranteze_1(sir):
     return sir
 
 def calculam_lst_fara_paranteze(sir):
+    tracer = active_tracer()
     eva = Eva()
 
     n = len(sir)
@@ -452,7 +458,7 @@ def calculam_lst_fara_paranteze(sir):
     #trebuie sa modificam valorile din formula cu cele din lst
 
     formula = list(formula)
-    print("formula_2=", formula)
+    if tracer: tracer.record("formula_2=", formula)
     n = len(formula)
     contor = 0
     pozitie_initiala = -1
@@ -465,7 +471,7 @@ def calculam_lst_fara_paranteze(sir):
         while ok == 0 and i < n:
             if formula[i] == "r" and formula[i+1] == "a" and formula[i+2] == "d" and contor ==0:
                 pozitie_initiala = i
-                print("pozitie_initiala=", pozitie_initiala)
+                if tracer: tracer.record("pozitie_initiala=", pozitie_initiala)
                 formula[i] = lst[k]
                 contor = 1
             if formula[i] == "l" and formula[i+1] == "o" and formula[i+2] == "g" and contor ==0:
@@ -498,7 +504,7 @@ def calculam_lst_fara_paranteze(sir):
             i = i + 1
 
     #trebuie sa modificam din caracterul ^^ in **
-    print("formula_3 = ", formula)
+    if tracer: tracer.record("formula_3 = ", formula)
 
     ok_3 = 0
 
@@ -515,7 +521,7 @@ def calculam_lst_fara_paranteze(sir):
 
         formula = res
 
-        print("formula=", formula)
+        if tracer: tracer.record("formula=", formula)
 
         # extragem numerele din formula si le punem in lst_3
 
@@ -545,7 +551,7 @@ def calculam_lst_fara_paranteze(sir):
                     ok = 1
                 i = i + 1
 
-        print("afisat= ", afisat)
+        if tracer: tracer.record("afisat= ", afisat)
         sir = list_to_string(afisat)
     else:
         #aici formula poate sa arate de forma: ["1", "+", "rad", "2", ".", "6"]
@@ -571,7 +577,7 @@ def calculam_lst_fara_paranteze(sir):
                 # continuam sa luam restul din x ca sa repunem la final dupa ce am calculat radicalul
                 sir_temporar_2 = x[j:]
 
-                print("sir_temporar=", sir_temporar_2)
+                if tracer: tracer.record("sir_temporar=", sir_temporar_2)
                 x = sir_temporar
 
                 x = list_to_string(x)
@@ -597,7 +603,7 @@ def calculam_lst_fara_paranteze(sir):
 
                 ok_2 = 1
             i = i + 1
-        print("formula=", formula)
+        if tracer: tracer.record("formula=", formula)
         afisat = formula
         sir = list_to_string(afisat)
 
@@ -624,7 +630,7 @@ def calculam_lst_fara_paranteze(sir):
                 if contor == adancime and afisat[i] != "(":
                     lst_2.append(afisat[i])
                 i = i + 1
-            print("lst =", lst)
+            if tracer: tracer.record("lst =", lst)
             # de calculat valoarea pentru fiecare pereche de paranteze si de inlocuit in formula
 
             n = len(lst)
@@ -643,7 +649,7 @@ def calculam_lst_fara_paranteze(sir):
                 value = eva.eval(lst_2)
                 # inseram value in lst sub forma de str
                 lst[i] = str(value)
-            print("lst=", lst)
+            if tracer: tracer.record("lst=", lst)
 
             # schimbam ceea ce se afla intre parantezele cand ajungem la valoarea adancimii= max_depth cat si parantezele se modifica
             # inlocuind tot cu valoarea corespunzatoare din lst, prima valoare pentru prima pereche gasita de paranteze
@@ -675,7 +681,7 @@ def calculam_lst_fara_paranteze(sir):
                             y = afisat[(pozitie_finala+1):]
                             afisat = x + y
                     i = i + 1
-            print("afisat= ", afisat)
+            if tracer: tracer.record("afisat= ", afisat)
             adancime = adancime - 1
     #adancime are nivel 0 deci avem de rezolvat doar adunari, scaderi caci radicalii i-am rezolvat la inceput
 
@@ -688,12 +694,12 @@ def calculam_lst_fara_paranteze(sir):
         afisat = list_to_string(afisat)
         afisat = inlocuieste_cu_minus(afisat)
 
-        print("@@@@@@", afisat)
+        if tracer: tracer.record("@@@@@@", afisat)
         afisat = calculam_lst_fara_paranteze_1(afisat)
-        print("@@@@@@", afisat)
+        if tracer: tracer.record("@@@@@@", afisat)
 
 
-    print("@@", afisat)
+    if tracer: tracer.record("@@", afisat)
     #convertim floaturile din afisat in str
     for i in range(0, len(afisat)):
         if isinstance(afisat[i], float) or isinstance(afisat[i], int):
@@ -708,18 +714,18 @@ def calculam_lst_fara_paranteze(sir):
         #facem afisat mai intai sa fie string si extragem toate floaturile din el
         afisat = list_to_string(afisat)
 
-        print("afisat_nou", afisat)
+        if tracer: tracer.record("afisat_nou", afisat)
         lst = []
         lista_semne = []
         for i in range(0, len(afisat)):
             if afisat[i] == "+" or afisat[i] == "-":
                 lista_semne.append(afisat[i])
 
-        print("lista_semne=", lista_semne)
+        if tracer: tracer.record("lista_semne=", lista_semne)
         lista_flaoturi = re.findall(r"\d+\.\d+", afisat)
         res = re.findall(r"[-+]?(?:\d*\.*\d+)", afisat)
-        print("lista_floaturi_2=", res)
-        print("lista_floaturi=", lista_flaoturi)
+        if tracer: tracer.record("lista_floaturi_2=", res)
+        if tracer: tracer.record("lista_floaturi=", lista_flaoturi)
 
         # vedem care din cele 2 liste este mai mare parcurgem lista mai mica caci cea mare sigur are elementul
         # care incepe cu - in fata
@@ -771,7 +777,7 @@ def calculam_lst_fara_paranteze(sir):
 
 
         lista_flaoturi = res
-        print("lista_floaturi=", lista_flaoturi)
+        if tracer: tracer.record("lista_floaturi=", lista_flaoturi)
 
         for i in range(0, len(lista_flaoturi)):
             lista_flaoturi[i] = float(lista_flaoturi[i])
@@ -787,7 +793,7 @@ def calculam_lst_fara_paranteze(sir):
             lst[0] = -1 * lst[0]
         afisat = lst
 
-        print("printat=", afisat)
+        if tracer: tracer.record("printat=", afisat)
 
 
         n = len(afisat)
@@ -795,9 +801,9 @@ def calculam_lst_fara_paranteze(sir):
             if afisat[i] != "+" and afisat[i] != "-":
                 afisat[i] = float(afisat[i])
 
-    print("afisat= ", afisat)
+    if tracer: tracer.record("afisat= ", afisat)
     afisat = calculam_lst_fara_paranteze_2(afisat)
-    print("afisat= ", afisat)
+    if tracer: tracer.record("afisat= ", afisat)
     #else:
         #transformam din str in float numerele
 
@@ -807,6 +813,7 @@ def rezolva_parantezele(sir):
     #facem sir din lst intr-un str
     #vedem care este max depth-ul maxim
     #parcurgem pana la max dept-ul maxim transformam in lst, cream intr-un alt list lista_fianala
+    tracer = active_tracer()
     sir = list_to_string(sir)
     n = len(sir)
     lst =[]
@@ -823,8 +830,8 @@ def rezolva_parantezele(sir):
 
     #in lst_2 vor aparea toate valorile distince ale lui lst
 
-    print(sir)
-    print(max_depth(sir))
+    if tracer: tracer.record("sir", sir)
+    if tracer: tracer.record("max_depth", max_depth(sir))
     adancime = max_depth(sir)
 
     ok_2 = 0
@@ -866,7 +873,7 @@ def rezolva_parantezele(sir):
             #punem aceasta lista curenta in lst_3
             value = list(lst_3[i])
             #extragem sub forma de lista lista_curenta si calculam pe lista curenta valoarea
-            print("value=", value)
+            if tracer: tracer.record("value=", value)
             value = calculam_lst_fara_paranteze(value)
             #inserama valoare sub forma de str in lista de valori
             if isinstance(value, list) == False:
@@ -879,8 +886,8 @@ def rezolva_parantezele(sir):
                 value = str(value[0])
                 lst_2_value.append(value)
 
-        print("lst_2=", lst_2)
-        print("lst_2_value=", lst_2_value)
+        if tracer: tracer.record("lst_2=", lst_2)
+        if tracer: tracer.record("lst_2_value=", lst_2_value)
 
         #parcurgem din nou sirul si cand ajungem la adancimea maxima salvam pozitia de start si final si
         #inlucuim cu valoarea din lst_2_value adecvata
@@ -912,7 +919,7 @@ def rezolva_parantezele(sir):
                 y = lst_parcurs[(pozitie_finala+1):]
                 lst_parcurs = x + y
         sir_nou = list_to_string(lst_parcurs)
-        print("sir_before_update_depth", sir_nou)
+        if tracer: tracer.record("sir_before_update_depth", sir_nou)
         adancime = max_depth(sir_nou)
         n = len(sir_nou)
         sir = sir_nou
@@ -966,7 +973,65 @@ eva = Eva()
 
 #sir = "5 + 3 ^^ 2 / 4 - 7 + rad 5 * cos 7 + rad 12 / cos 3.5"
 
-def process_expression(aString):
+# engines selectable from process_expression:
+#   legacy - the string-rewriting evaluator above (rezolva_parantezele)
+#   pratt  - single-pass tokenizer + precedence-climbing parser evaluated with Eva,
+#            compiled once per distinct expression and kept in compile_cache
+#   stack  - same compiled expression lowered to postfix integer opcodes and run
+#            on an explicit value stack (no recursion, no depth limit)
+ENGINES = ('legacy', 'pratt', 'stack')
+
+# what a bad input raises in the compiled engines: parse errors and unbound
+# variables (ValueError), math errors, and nesting too deep for the parser.
+# Anything else is a bug and propagates instead of becoming "Invalid expression"
+INPUT_ERRORS = (ValueError, ArithmeticError, RecursionError)
+
+def canonical_expression_key(aString):
+    # canonical key (sorted operands, normalized numbers) shared by the cache and the DB log
+    try:
+        return compile_cache.get(aString).canonical_key
+    except INPUT_ERRORS:
+        return aString.strip()
+
+def process_expression(aString, engine="legacy", budget=None, details=None):
+    # budget (EvaluationBudget) bounds the evaluation steps and time of the compiled engines
+    # and the exponents of every engine; exceeding it raises ExpressionLimitError instead of
+    # returning "Invalid expression"
+    # details (dict), when given, receives the optimizer metadata of the compiled engines
+    tracer = active_tracer()
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown calculator engine: {engine}")
+
+    if engine in ("pratt", "stack"):
+        try:
+            compiled = compile_cache.get(aString)
+            if details is not None:
+                details['nodes_eliminated'] = compiled.nodes_eliminated
+            if tracer:
+                tracer.record("canonical_key", compiled.canonical_key)
+                tracer.record("optimized_tree", compiled.optimized_tree)
+                tracer.record("nodes_eliminated", compiled.nodes_eliminated)
+            if engine == "stack":
+                result = [compiled.run(budget=budget)]
+            else:
+                result = [compiled.evaluate(budget=budget)]
+            if tracer: tracer.record("rezultat =", result)
+            return result
+        except ExpressionLimitError:
+            raise
+        except INPUT_ERRORS as e:
+            if tracer: tracer.record("Error in calculator function:", e)
+            return "Invalid expression"
+
+    # the legacy evaluator has no budget hooks; the exponents computed in the
+    # expression are bounded through its compiled form
+    if budget is not None:
+        try:
+            largest_exponent = compile_cache.get(aString).largest_exponent
+        except INPUT_ERRORS:
+            largest_exponent = 0
+        budget.check_exponent(largest_exponent)
+
     # Remove all whitespaces from the string
     expression = aString.replace(" ", "")
 
@@ -974,9 +1039,9 @@ def process_expression(aString):
     try:
         #verificare formule cu wolframalpha
         result = rezolva_parantezele(expression)
-        print('@', result)
-        print("rezultat =", result)
+        if tracer: tracer.record('@', result)
+        if tracer: tracer.record("rezultat =", result)
         return result
     except Exception as e:
-        print("Error in calculator function:", e)
-        return "Invalid expression"
\ No newline at end of file
+        if tracer: tracer.record("Error in calculator function:", e)
+        return "Invalid expression"
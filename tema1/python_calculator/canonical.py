@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from ClassEva import isNumber, isString
+
+# Canonical spelling of an Eva tree, used as cache / DB key so that
+# "2+3", "3 + 2", "(2+3)" and "2.0+3" all map to the same entry.
+#   - parentheses are already gone once the expression is parsed
+#   - numeric literals are printed in one normalized form (2.0 -> 2)
+#   - the two operands of a + or * node are put in sorted order
+# Chains are not flattened: (a+b)+c and a+(b+c) round differently in floating
+# point and under Eva's infinit clamp, so they keep separate keys.
+
+COMMUTATIVE = ('+', '*')
+
+
+def format_number(value):
+    """Normalized spelling of a numeric literal"""
+    if isinstance(value, Decimal):
+        # exact literals of the decimal engine keep all their digits
+        return format(value.normalize(), 'f') if value else '0'
+    value = float(value)
+    if value == 0:
+        return '0'
+    if value.is_integer() and abs(value) < 1e16:
+        return str(int(value))
+    return repr(value)
+
+
+def canonical_form(tree):
+    """Stable string key for an Eva tree"""
+    # post-order walk with an explicit stack: a long a+b+c+... chain is as deep
+    # as it is long, too deep for a recursive walk
+    forms = {}  # id(node) -> canonical form of every list node done so far
+
+    def form_of(node):
+        if isinstance(node, list):
+            return forms[id(node)]
+        if isNumber(node) or isinstance(node, Decimal):
+            return format_number(node)
+        if isString(node):
+            return node
+        raise TypeError("Unimplemented")
+
+    work = [(tree, False)]
+    while work:
+        node, expanded = work.pop()
+        if not isinstance(node, list) or id(node) in forms:
+            continue
+        if not expanded:
+            work.append((node, True))
+            work.extend((child, False) for child in node[1:])
+            continue
+
+        operator = node[0]
+        operands = [form_of(operand) for operand in node[1:]]
+        if operator in COMMUTATIVE:
+            # swapping the operands of one node never changes its value
+            operands.sort()
+        forms[id(node)] = f"{operator}({','.join(operands)})"
+
+    return form_of(tree)
@@ -0,0 +1,121 @@
+import math
+import re
+
+from factorial_engine import primes_up_to, product, product_range
+
+# Binomial coefficients, k-permutations and multinomial coefficients without
+# building n!. The quotients of factorials are assembled from their prime
+# factorization: by Legendre's formula the exponent of p in n! is
+#   e_p(n) = n // p + n // p^2 + ...
+# so the exponent of p in n! / (k1! k2! ...) is e_p(n) - e_p(k1) - e_p(k2) - ...
+# and only prime powers with a positive exponent are multiplied (over a
+# balanced product tree).
+
+# Inputs look like "n,k" (binomial, permutations) or "k1,k2,...,km" (multinomial)
+SEPARATORS = re.compile(r"[\s,]+")
+
+# multinomial inputs with more parts than this are rejected
+MAX_MULTINOMIAL_PARTS = 1000
+
+
+def parse_counts(text: str) -> list:
+    """Non-negative integers from the operation input"""
+    parts = [part for part in SEPARATORS.split(str(text).strip()) if part]
+    try:
+        numbers = [int(part) for part in parts]
+    except ValueError:
+        raise ValueError("arguments must be integers")
+    if any(number < 0 for number in numbers):
+        raise ValueError("arguments must be non-negative")
+    return numbers
+
+
+def parse_combinatorics_input(operation_type: str, text: str) -> list:
+    """[n, k] for binomial/permutations, [k1, ..., km] for multinomial"""
+    numbers = parse_counts(text)
+    if operation_type == 'multinomial':
+        if not 1 <= len(numbers) <= MAX_MULTINOMIAL_PARTS:
+            raise ValueError(f"multinomial expects between 1 and {MAX_MULTINOMIAL_PARTS} counts")
+        return numbers
+    if len(numbers) != 2:
+        raise ValueError(f"{operation_type} expects 'n,k'")
+    n, k = numbers
+    if k > n:
+        raise ValueError("k must not be larger than n")
+    return numbers
+
+
+def normalize_combinatorics_input(operation_type: str, text: str) -> str:
+    """Cache key spelling; multinomial counts are order independent, so they are sorted"""
+    numbers = parse_combinatorics_input(operation_type, text)
+    if operation_type == 'multinomial':
+        numbers = sorted(numbers)
+    elif operation_type == 'binomial':
+        # C(n, k) == C(n, n - k)
+        numbers = [numbers[0], min(numbers[1], numbers[0] - numbers[1])]
+    return ','.join(str(number) for number in numbers)
+
+
+def legendre(n: int, p: int) -> int:
+    """Exponent of the prime p in n!"""
+    exponent = 0
+    while n:
+        n //= p
+        exponent += n
+    return exponent
+
+
+def factorial_quotient(n: int, denominators: list) -> int:
+    """n! / (d1! d2! ...) from prime exponents, for denominators summing to at most n"""
+    factors = []
+    for p in primes_up_to(n):
+        exponent = legendre(n, p) - sum(legendre(d, p) for d in denominators)
+        if exponent == 1:
+            factors.append(p)
+        elif exponent > 1:
+            factors.append(p ** exponent)
+    return product(factors)
+
+
+def binomial(n: int, k: int) -> int:
+    """C(n, k)"""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    if k == 0:
+        return 1
+    if k < 64:
+        # multiplicative formula, every intermediate value is a binomial itself
+        result = 1
+        for i in range(1, k + 1):
+            result = result * (n - k + i) // i
+        return result
+    return factorial_quotient(n, [k, n - k])
+
+
+def permutations(n: int, k: int) -> int:
+    """P(n, k) = n! / (n - k)! = (n - k + 1) * ... * n"""
+    if k < 0 or k > n:
+        return 0
+    return product_range(n - k + 1, n)
+
+
+def multinomial(counts: list) -> int:
+    """(k1 + ... + km)! / (k1! ... km!)"""
+    n = sum(counts)
+    # 0! and 1! do not change the quotient
+    denominators = [count for count in counts if count > 1]
+    if not denominators:
+        return product_range(2, n)
+    return factorial_quotient(n, denominators)
+
+
+def combinatorics_result_bits(operation_type: str, numbers: list) -> int:
+    """Upper bound on the bit length of the result, from lgamma"""
+    if operation_type == 'multinomial':
+        n, denominators = sum(numbers), numbers
+    else:
+        n, k = numbers
+        denominators = [k, n - k] if operation_type == 'binomial' else [n - k]
+    log_result = math.lgamma(n + 1) - sum(math.lgamma(d + 1) for d in denominators)
+    return int(log_result / math.log(2)) + 2
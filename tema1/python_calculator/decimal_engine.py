@@ -0,0 +1,187 @@
+from decimal import (Decimal, getcontext, localcontext, InvalidOperation, DivisionByZero, Overflow,
+                     MAX_EMAX, MIN_EMIN)
+from functools import lru_cache
+
+from expression_parser import parse_expression
+from optimizer import count_nodes
+
+# Arbitrary-precision evaluation of the calculator grammar.
+# Literals are parsed straight into Decimal (so "0.1" is exactly 0.1) and the
+# tree is evaluated with `precision + GUARD_DIGITS` significant digits, then
+# rounded to `precision`. Unlike Eva there is no infinit sentinel: values of
+# any size are kept, and undefined operations (division by zero, log or rad
+# of an out-of-domain value) raise ValueError.
+# rad and log use Decimal.sqrt / Decimal.ln (correctly rounded); sin and cos
+# use argument reduction by 2*pi and their Taylor series; pi is computed once
+# per working precision.
+# Like the compiled engines, an EvaluationBudget bounds the number of nodes,
+# the wall time and the exponents of one evaluation.
+
+GUARD_DIGITS = 10
+
+MAX_PRECISION = 1000
+
+
+def pi() -> Decimal:
+    """pi to the current context precision"""
+    return _pi(getcontext().prec)
+
+
+@lru_cache(maxsize=64)
+def _pi(precision: int) -> Decimal:
+    # series from the decimal module docs
+    with localcontext() as context:
+        context.prec = precision + 2
+        three = Decimal(3)
+        lasts, t, s, n, na, d, da = 0, three, 3, 1, 0, 0, 24
+        while s != lasts:
+            lasts = s
+            n, na = n + na, na + 8
+            d, da = d + da, da + 32
+            t = (t * n) / d
+            s += t
+        context.prec = precision
+        return +s
+
+
+def _reduce_angle(x: Decimal) -> Decimal:
+    # x mod 2*pi, computed with enough extra digits for the integer part of x / 2*pi
+    if x.adjusted() > MAX_PRECISION:
+        raise ValueError(f"sin/cos arguments must be below 1e{MAX_PRECISION}")
+    with localcontext() as context:
+        context.prec += max(x.adjusted(), 0) + 2
+        two_pi = 2 * pi()
+        return x - two_pi * (x / two_pi).to_integral_value()
+
+
+def _taylor(x: Decimal, i: int, term: Decimal) -> Decimal:
+    # sum of the sin (i=1, term=x) or cos (i=0, term=1) series; each term is
+    # derived from the previous one, so no factorial or power is kept around
+    with localcontext() as context:
+        context.prec += 2
+        minus_x2 = -x * x
+        lasts, s = 0, term
+        while s != lasts:
+            lasts = s
+            i += 2
+            term = term * minus_x2 / (i * (i - 1))
+            s += term
+    return +s
+
+
+def sin(x: Decimal) -> Decimal:
+    x = _reduce_angle(x)
+    return _taylor(x, 1, x)
+
+
+def cos(x: Decimal) -> Decimal:
+    x = _reduce_angle(x)
+    return _taylor(x, 0, Decimal(1))
+
+
+def radical(x: Decimal) -> Decimal:
+    if x < 0:
+        raise ValueError("rad of a negative number")
+    return x.sqrt()
+
+
+def logaritm(x: Decimal) -> Decimal:
+    if x <= 0:
+        raise ValueError("log of a non-positive number")
+    return x.ln()
+
+
+def impartit(x: Decimal, y: Decimal) -> Decimal:
+    if y == 0:
+        raise ValueError("Division by zero")
+    return x / y
+
+
+def putere(x: Decimal, y: Decimal) -> Decimal:
+    if y == 0:
+        return Decimal(1)
+    if x == 0:
+        if y < 0:
+            raise ValueError("Division by zero")
+        return Decimal(0)
+    if x < 0 and y != y.to_integral_value():
+        raise ValueError("Fractional power of a negative number")
+    return x ** y
+
+
+BINARY = {
+    '+': lambda x, y: x + y,
+    '-': lambda x, y: x - y,
+    '*': lambda x, y: x * y,
+    '/': impartit,
+    '^^': putere
+}
+
+UNARY = {
+    'rad': radical,
+    'log': logaritm,
+    'sin': sin,
+    'cos': cos
+}
+
+
+def parse_decimal_expression(text: str):
+    """Eva-style tree with exact Decimal literals"""
+    return parse_expression(text, Decimal)
+
+
+def exact_form(tree) -> str:
+    """Spelling of a Decimal tree that keeps operand order and every literal digit"""
+    if isinstance(tree, Decimal):
+        return str(tree)
+    if isinstance(tree, str):
+        return tree
+    return f"{tree[0]}({','.join(exact_form(operand) for operand in tree[1:])})"
+
+
+def decimal_cache_key(tree, precision: int) -> str:
+    """Cache key of an expression evaluated at a given precision"""
+    # not the canonical form: once rounded to a few digits, regrouped or
+    # reordered operations and 2 vs 2.0 literals give different results
+    return f"{precision}:{exact_form(tree)}"
+
+
+def evaluate_decimal(tree, precision: int, env: dict = None, budget=None) -> Decimal:
+    """Value of a Decimal tree rounded to `precision` significant digits"""
+    if not 1 <= precision <= MAX_PRECISION:
+        raise ValueError(f"precision must be between 1 and {MAX_PRECISION}")
+    env = env or {}
+    if budget is not None:
+        budget.start(count_nodes(tree))
+
+    def evaluate(node):
+        if isinstance(node, Decimal):
+            return node
+        if isinstance(node, str):
+            if node not in env:
+                raise ValueError(f"Unbound variable '{node}'")
+            return Decimal(env[node])
+        if node[0] in BINARY:
+            left, right = evaluate(node[1]), evaluate(node[2])
+            if node[0] == '^^' and budget is not None:
+                budget.check_exponent(right)
+            value = BINARY[node[0]](left, right)
+        elif node[0] in UNARY:
+            value = UNARY[node[0]](evaluate(node[1]))
+        else:
+            raise TypeError("Unimplemented")
+        # one operation at a high precision can take milliseconds
+        if budget is not None:
+            budget.check_time()
+        return value
+
+    with localcontext() as context:
+        context.prec = precision + GUARD_DIGITS
+        context.Emax = MAX_EMAX
+        context.Emin = MIN_EMIN
+        try:
+            value = evaluate(tree)
+        except (InvalidOperation, DivisionByZero, Overflow) as e:
+            raise ValueError(f"Undefined result: {e.__class__.__name__}")
+        context.prec = precision
+        return +value
@@ -0,0 +1,200 @@
+import os
+import threading
+from collections import OrderedDict
+
+from ClassEva import Eva, isNumber, isString
+from expression_parser import parse_expression, normalize_expression, collect_variables
+from canonical import canonical_form
+from optimizer import optimize, count_references, count_unique_nodes, tree_depth
+import stack_machine
+
+# Compiles Eva trees into closure trees so an expression is parsed and
+# compiled once and afterwards only pays for evaluation.
+# Sub-expressions shared by the optimizer are evaluated once per call:
+# their value is kept in the per-call env under a private slot key.
+# Calling a closure tree takes one Python frame per level, so trees deeper
+# than CLOSURE_MAX_DEPTH are not turned into closures: evaluate() runs them
+# on the stack machine, which has no depth limit.
+
+CLOSURE_MAX_DEPTH = 100
+
+
+def compile_tree(tree, eva=None):
+    """Turn an Eva tree into a closure taking a bindings dict (built without
+    recursion; calling it nests one Python call per tree level)"""
+    eva = eva or Eva()
+
+    binary = {
+        '+': eva.plus,
+        '-': eva.minus,
+        '*': eva.inmultit,
+        '/': eva.impartit,
+        '^^': eva.putere
+    }
+    unary = {
+        'rad': eva.radical,
+        'log': eva.logaritm,
+        'sin': eva.sinus,
+        'cos': eva.cosinus
+    }
+
+    references = count_references(tree)
+    built = {}  # id(node) -> closure, for every list node already built
+
+    def memoized(function, slot):
+        def shared(env):
+            if slot not in env:
+                env[slot] = function(env)
+            return env[slot]
+        return shared
+
+    def leaf(node):
+        if isNumber(node):
+            return lambda env: node
+
+        def variable(env):
+            try:
+                return env[node]
+            except KeyError:
+                raise ValueError(f"Unbound variable '{node}'")
+        return variable
+
+    def child_function(node):
+        return built[id(node)] if isinstance(node, list) else leaf(node)
+
+    # (node, expanded) pairs; a node is built after its children
+    work = [(tree, False)]
+    while work:
+        node, expanded = work.pop()
+        if not isinstance(node, list):
+            if not isString(node) and not isNumber(node):
+                raise TypeError("Unimplemented")
+            continue
+        if id(node) in built:
+            continue
+        if not expanded:
+            work.append((node, True))
+            work.extend((child, False) for child in node[1:])
+            continue
+
+        if node[0] in binary:
+            function = binary[node[0]]
+            left = child_function(node[1])
+            right = child_function(node[2])
+            compiled = lambda env, function=function, left=left, right=right: function(left(env), right(env))
+        elif node[0] in unary:
+            function = unary[node[0]]
+            argument = child_function(node[1])
+            compiled = lambda env, function=function, argument=argument: function(argument(env))
+        else:
+            raise TypeError("Unimplemented")
+
+        if references[id(node)] > 1:
+            compiled = memoized(compiled, ('#cse', len(built)))
+        built[id(node)] = compiled
+
+    return child_function(tree)
+
+
+class CompiledExpression:
+    """A parsed and compiled expression ready to be evaluated many times"""
+
+    def __init__(self, source: str, tree):
+        self.source = source
+        self.tree = tree
+        self.variables = collect_variables(tree)
+        self.canonical_key = canonical_form(tree)
+        self.optimized_tree, self.nodes_eliminated, self.largest_exponent = optimize(tree)
+        self.node_count = count_unique_nodes(self.optimized_tree)
+        self.depth = tree_depth(self.optimized_tree)
+        self.function = compile_tree(self.optimized_tree) if self.depth <= CLOSURE_MAX_DEPTH else None
+        self.program = None
+
+    def check_bound(self, env: dict = None):
+        """Raise for a variable of the source that env does not bind, including
+        variables the optimizer removed (x*0)"""
+        for name in self.variables:
+            if not env or name not in env:
+                raise ValueError(f"Unbound variable '{name}'")
+
+    def evaluate(self, env: dict = None, budget=None):
+        if self.function is None:
+            return self.run(env, budget=budget)
+        self.check_bound(env)
+        if budget is not None:
+            budget.check_exponent(self.largest_exponent)
+            budget.start(self.node_count)
+        # copied so memoized sub-expressions never leak between calls
+        result = self.function(dict(env) if env else {})
+        if budget is not None:
+            budget.check_time()
+        return result
+
+    def run(self, env: dict = None, budget=None):
+        """Evaluate on the flat stack machine (lowered on first use)"""
+        self.check_bound(env)
+        if budget is not None:
+            budget.check_exponent(self.largest_exponent)
+        if self.program is None:
+            self.program = stack_machine.lower(self.optimized_tree)
+        return stack_machine.run(self.program, env, budget=budget)
+
+
+class CompileCache:
+    """Bounded LRU cache of CompiledExpression keyed by normalized expression text
+
+    Shared by every request thread: the LRU order is only touched with the lock
+    held, compiling a miss happens outside it (two threads compiling the same
+    text both succeed and the last one is kept).
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hit_count = 0
+        self.miss_count = 0
+        self.lock = threading.Lock()
+
+    def get(self, expression: str) -> CompiledExpression:
+        """Return the compiled form of expression, compiling it on a miss"""
+        key = normalize_expression(expression)
+
+        with self.lock:
+            compiled = self.entries.get(key)
+            if compiled is not None:
+                self.hit_count += 1
+                self.entries.move_to_end(key)
+                return compiled
+            self.miss_count += 1
+
+        compiled = CompiledExpression(key, parse_expression(expression))
+        self.put(key, compiled)
+        return compiled
+
+    def put(self, key: str, compiled: CompiledExpression):
+        with self.lock:
+            self.entries[key] = compiled
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.hit_count = 0
+            self.miss_count = 0
+
+    def get_stats(self):
+        with self.lock:
+            hit_count, miss_count, size = self.hit_count, self.miss_count, len(self.entries)
+        total = hit_count + miss_count
+        return {
+            'hit_count': hit_count,
+            'miss_count': miss_count,
+            'hit_rate': round(hit_count / total * 100, 2) if total > 0 else 0,
+            'size': size,
+            'max_size': self.max_size
+        }
+
+
+compile_cache = CompileCache(int(os.environ.get('COMPILE_CACHE_SIZE', 1024)))
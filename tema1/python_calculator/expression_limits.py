@@ -0,0 +1,106 @@
+import os
+import time
+
+from expression_parser import TOKEN_REGEX, FUNCTIONS
+
+# Admission control for calculator inputs.
+# check_expression() is a single linear scan that rejects an input before it is
+# parsed when it is too long, too deeply nested, calls too many functions or
+# raises to an enormous literal exponent. EvaluationBudget bounds the work done
+# while evaluating (instruction count and wall time) and the exponents that are
+# only known once computed, e.g. 2^^(1+99999999).
+
+POWER_OPERATORS = ('^^', '^', '**')
+
+
+class ExpressionLimitError(ValueError):
+    """Raised when an expression exceeds a complexity limit or its budget"""
+
+
+class ExpressionLimits:
+    def __init__(self, max_length: int = 10000, max_depth: int = 200,
+                 max_function_calls: int = 1000, max_exponent: float = 1000000,
+                 max_steps: int = 200000, max_time_ms: float = 1000):
+        self.max_length = max_length
+        self.max_depth = max_depth
+        self.max_function_calls = max_function_calls
+        self.max_exponent = max_exponent
+        self.max_steps = max_steps
+        self.max_time_ms = max_time_ms
+
+    @classmethod
+    def from_environ(cls):
+        """Limits configured through environment variables"""
+        return cls(
+            max_length=int(os.environ.get('MAX_EXPRESSION_LENGTH', 10000)),
+            max_depth=int(os.environ.get('MAX_EXPRESSION_DEPTH', 200)),
+            max_function_calls=int(os.environ.get('MAX_FUNCTION_CALLS', 1000)),
+            max_exponent=float(os.environ.get('MAX_EXPONENT', 1000000)),
+            max_steps=int(os.environ.get('MAX_EVALUATION_STEPS', 200000)),
+            max_time_ms=float(os.environ.get('MAX_EVALUATION_TIME_MS', 1000))
+        )
+
+    def budget(self):
+        return EvaluationBudget(self.max_steps, self.max_time_ms, self.max_exponent)
+
+
+def check_expression(text: str, limits: ExpressionLimits):
+    """Reject text in O(len(text)) if it exceeds any of the limits"""
+    if len(text) > limits.max_length:
+        raise ExpressionLimitError(f"Expression is longer than {limits.max_length} characters")
+
+    depth = 0
+    function_calls = 0
+    after_power = False
+
+    for match in TOKEN_REGEX.finditer(text):
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        value = match.group()
+
+        if after_power:
+            # the exponent literal may be wrapped in '(' or carry a sign
+            if kind == 'number':
+                if abs(float(value)) > limits.max_exponent:
+                    raise ExpressionLimitError(f"Exponent {value} is larger than {limits.max_exponent:g}")
+                after_power = False
+            elif value not in ('(', '-', '+'):
+                after_power = False
+
+        if value == '(':
+            depth += 1
+            if depth > limits.max_depth:
+                raise ExpressionLimitError(f"Expression is nested deeper than {limits.max_depth} levels")
+        elif value == ')':
+            depth = max(depth - 1, 0)
+        elif kind == 'name' and value.lower() in FUNCTIONS:
+            function_calls += 1
+            if function_calls > limits.max_function_calls:
+                raise ExpressionLimitError(f"Expression calls more than {limits.max_function_calls} functions")
+        elif value in POWER_OPERATORS:
+            after_power = True
+
+
+class EvaluationBudget:
+    """Step, wall-time and exponent budget enforced while an expression is evaluated"""
+
+    def __init__(self, max_steps: int, max_time_ms: float, max_exponent: float = None):
+        self.max_steps = max_steps
+        self.max_time_ms = max_time_ms
+        self.max_exponent = max_exponent
+        self.deadline = None
+
+    def start(self, steps: int):
+        """Admit an evaluation of the given number of steps and start the clock"""
+        if steps > self.max_steps:
+            raise ExpressionLimitError(f"Evaluation needs {steps} steps, budget is {self.max_steps}")
+        self.deadline = time.perf_counter() + self.max_time_ms / 1000
+
+    def check_time(self):
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            raise ExpressionLimitError(f"Evaluation exceeded the {self.max_time_ms:g}ms time budget")
+
+    def check_exponent(self, exponent):
+        if self.max_exponent is not None and abs(exponent) > self.max_exponent:
+            raise ExpressionLimitError(f"Exponent {exponent:g} is larger than {self.max_exponent:g} in magnitude")
@@ -0,0 +1,196 @@
+import re
+
+# Single-pass tokenizer + precedence-climbing (Pratt) parser.
+# The parser builds the same nested-list trees that Eva.eval understands,
+# e.g. "2 * (3 + 1)" -> ['*', 2.0, ['+', 3.0, 1.0]]
+# Names that are not functions are variables and appear in the tree as
+# strings, e.g. "x^^2 + y" -> ['+', ['^^', 'x', 2.0], 'y']
+#
+# Signs follow the usual math conventions, which is where the results differ
+# from the legacy string evaluator (rezolva_parantezele):
+#   -2^^2  = -(2^^2) = -4   ^^ binds tighter than a leading sign   (legacy: 4)
+#   3--2   = 3-(-2)  = 5    a '-' after an operator is a sign      (legacy: 1)
+#   2^^-2  = 0.25           a signed exponent keeps its sign       (legacy: 4)
+
+TOKEN_REGEX = re.compile(r"""
+    (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)
+  | (?P<name>[A-Za-z_]+)
+  | (?P<op>\^\^|\*\*|[-+*/^()])
+  | (?P<space>\s+)
+  | (?P<error>.)
+""", re.VERBOSE)
+
+# functions known to Eva (sqrt is accepted as an alias of rad)
+FUNCTIONS = {
+    'rad': 'rad',
+    'sqrt': 'rad',
+    'log': 'log',
+    'sin': 'sin',
+    'cos': 'cos'
+}
+
+# binary operator -> (left binding power, right binding power, Eva operator)
+BINARY_OPERATORS = {
+    '+': (10, 11, '+'),
+    '-': (10, 11, '-'),
+    '*': (20, 21, '*'),
+    '/': (20, 21, '/'),
+    '^^': (40, 39, '^^'),  # right associative
+    '^': (40, 39, '^^'),
+    '**': (40, 39, '^^')
+}
+
+PREFIX_BINDING_POWER = 30
+
+
+def tokenize(text, number=float):
+    """Split an expression into (kind, value, position) tuples in one pass"""
+    tokens = []
+    for match in TOKEN_REGEX.finditer(text):
+        kind = match.lastgroup
+        if kind == 'space':
+            continue
+        if kind == 'error':
+            raise ValueError(f"Unexpected character '{match.group()}' at position {match.start()}")
+        value = match.group()
+        if kind == 'number':
+            value = number(value)
+        tokens.append((kind, value, match.start()))
+    tokens.append(('end', None, len(text)))
+    return tokens
+
+
+class Parser:
+    """Precedence-climbing parser producing Eva expression trees"""
+
+    def __init__(self, tokens, number=float):
+        self.tokens = tokens
+        self.number = number  # literal type (float for Eva, Decimal for the decimal engine)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos]
+
+    def advance(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        kind, token_value, position = self.advance()
+        if token_value != value:
+            found = token_value if kind != 'end' else 'end of expression'
+            raise ValueError(f"Expected '{value}' at position {position}, found '{found}'")
+
+    def parse(self):
+        tree = self.parse_expression(0)
+        kind, value, position = self.peek()
+        if kind != 'end':
+            raise ValueError(f"Unexpected '{value}' at position {position}")
+        return tree
+
+    def parse_expression(self, min_binding_power):
+        """Precedence climbing with an explicit stack of pending operators instead of
+        recursion, so neither nesting depth nor chain length is bounded by the
+        recursion limit. Each pending entry is (kind, payload, binding power of the
+        enclosing expression, binding power of its operand), where kind is one of
+          'binary'   payload (operator, left operand), waiting for the right operand
+          'sign'     payload '-' or '+', waiting for its operand
+          'function' payload the Eva function, waiting for its unparenthesized argument
+          'group'    payload the Eva function or None, waiting for the inside of (...)
+        """
+        pending = []
+        left = self.parse_prefix(pending, min_binding_power)
+
+        while True:
+            if left is None:
+                # parse_prefix opened a sign, function or group: start its operand
+                min_binding_power = pending[-1][3]
+                left = self.parse_prefix(pending, min_binding_power)
+                continue
+
+            kind, value, position = self.peek()
+            if kind == 'op' and value in BINARY_OPERATORS:
+                left_bp, right_bp, operator = BINARY_OPERATORS[value]
+                if left_bp >= min_binding_power:
+                    self.advance()
+                    pending.append(('binary', (operator, left), min_binding_power, right_bp))
+                    min_binding_power = right_bp
+                    left = self.parse_prefix(pending, min_binding_power)
+                    continue
+
+            # the expression at this level is complete
+            if not pending:
+                return left
+            entry, payload, min_binding_power, _ = pending.pop()
+            if entry == 'binary':
+                operator, first = payload
+                left = [operator, first, left]
+            elif entry == 'sign':
+                if payload == '-':
+                    left = -left if isinstance(left, self.number) else ['-', self.number(0), left]
+            elif entry == 'function':
+                left = [payload, left]
+            else:  # group
+                self.expect(')')
+                if payload is not None:
+                    left = [payload, left]
+
+    def parse_prefix(self, pending, min_binding_power):
+        """The operand at the current token, or None after pushing the prefix
+        operator or group that has to be completed first"""
+        kind, value, position = self.advance()
+
+        if kind == 'number':
+            return value
+
+        if kind == 'op' and value == '(':
+            pending.append(('group', None, min_binding_power, 0))
+            return None
+
+        if kind == 'op' and value in ('-', '+'):
+            pending.append(('sign', value, min_binding_power, PREFIX_BINDING_POWER))
+            return None
+
+        if kind == 'name':
+            name = value.lower()
+            if name not in FUNCTIONS:
+                return name
+            # rad(9)^^2 applies rad to the group only, rad 9^^2 binds like a prefix operator
+            if self.peek()[1] == '(':
+                self.advance()
+                pending.append(('group', FUNCTIONS[name], min_binding_power, 0))
+            else:
+                pending.append(('function', FUNCTIONS[name], min_binding_power, PREFIX_BINDING_POWER))
+            return None
+
+        if kind == 'end':
+            raise ValueError("Unexpected end of expression")
+        raise ValueError(f"Unexpected '{value}' at position {position}")
+
+
+def parse_expression(text, number=float):
+    """Parse an expression string into an Eva tree with number literals"""
+    return Parser(tokenize(text, number), number).parse()
+
+
+def collect_variables(tree):
+    """Sorted names of the variables used in an Eva tree"""
+    names = set()
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, str):
+            names.add(node)
+        elif isinstance(node, list):
+            stack.extend(node[1:])
+    return sorted(names)
+
+
+def normalize_expression(text):
+    """Canonical spelling of the token stream, used as compile cache key"""
+    parts = []
+    for match in TOKEN_REGEX.finditer(text):
+        if match.lastgroup != 'space':
+            parts.append(match.group().lower())
+    return ' '.join(parts)
@@ -0,0 +1,162 @@
+import atexit
+import math
+import operator
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Exact factorials without a single growing accumulator.
+# Multiplying 1*2*...*n left to right keeps multiplying a huge number by a
+# small one; here every product is taken over a balanced tree, so the big
+# multiplications happen between operands of similar size (where CPython's
+# Karatsuba multiplication pays off).
+#
+# factorial() uses the prime-swing recursion
+#   n! = ((n // 2)!)^2 * swing(n)
+# where swing(n) = n! / ((n // 2)!)^2 is built from prime powers: the exponent
+# of p in swing(n) is the number of odd values among n // p, n // p^2, ...
+
+# below this n the plain loop is faster than building prime lists
+SMALL_FACTORIAL_LIMIT = 30
+
+# product trees stop splitting below this many factors
+LEAF_SIZE = 16
+
+# chunks per worker for parallel_factorial (smaller chunks balance the load better)
+CHUNKS_PER_WORKER = 4
+
+# process pool shared by all parallel factorials, created on first use by
+# whichever request thread gets there first (under _executor_lock)
+_executor = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def product(values, lo: int = 0, hi: int = None) -> int:
+    """Product of values[lo:hi] over a balanced binary tree"""
+    if hi is None:
+        hi = len(values)
+    if hi - lo <= LEAF_SIZE:
+        result = 1
+        for i in range(lo, hi):
+            result *= values[i]
+        return result
+    mid = (lo + hi) // 2
+    return product(values, lo, mid) * product(values, mid, hi)
+
+
+def product_range(lo: int, hi: int) -> int:
+    """Product of the integers lo..hi (inclusive), 1 for an empty range"""
+    if hi < lo:
+        return 1
+    if hi - lo < LEAF_SIZE:
+        result = lo
+        for i in range(lo + 1, hi + 1):
+            result *= i
+        return result
+    mid = (lo + hi) // 2
+    return product_range(lo, mid) * product_range(mid + 1, hi)
+
+
+def primes_up_to(n: int) -> list:
+    """Primes <= n (sieve of Eratosthenes over odd numbers)"""
+    if n < 2:
+        return []
+    # sieve[i] stands for the odd number 2*i + 1
+    sieve = bytearray([1]) * ((n + 1) // 2)
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(n) + 1) // 2):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, len(sieve), p)))
+    return [2] + [2 * i + 1 for i, is_prime in enumerate(sieve) if is_prime]
+
+
+def swing(n: int, primes: list) -> int:
+    """n! / ((n // 2)!)^2 as a product of prime powers"""
+    factors = []
+    for p in primes:
+        if p > n:
+            break
+        if p > n // 2:
+            # n // p == 1, so p appears exactly once
+            factors.append(p)
+            continue
+        q = n
+        power = 1
+        while q >= p:
+            q //= p
+            if q & 1:
+                power *= p
+        if power > 1:
+            factors.append(power)
+    return product(factors)
+
+
+def factorial(n: int) -> int:
+    """Exact n! for n >= 0"""
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if n < SMALL_FACTORIAL_LIMIT:
+        return product_range(2, n)
+
+    primes = primes_up_to(n)
+
+    def prime_swing_factorial(m):
+        if m < SMALL_FACTORIAL_LIMIT:
+            return product_range(2, m)
+        half = prime_swing_factorial(m // 2)
+        return half * half * swing(m, primes)
+
+    return prime_swing_factorial(n)
+
+
+def get_executor(workers: int) -> ProcessPoolExecutor:
+    """Shared process pool with the given number of workers"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(max_workers=workers)
+            _executor_workers = workers
+        return _executor
+
+
+@atexit.register
+def shutdown_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def parallel_factorial(n: int, workers: int, chunks: int = None):
+    """n! computed on a process pool; returns (n!, chunks used)"""
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    chunks = max(1, min(chunks or workers * CHUNKS_PER_WORKER, n))
+    executor = get_executor(workers)
+
+    starts = [1 + n * i // chunks for i in range(chunks)]
+    ends = [n * (i + 1) // chunks for i in range(chunks)]
+    parts = list(executor.map(product_range, starts, ends))
+
+    # combine pairwise, one tree level at a time; every level but the final
+    # multiplication is spread over the pool as well
+    while len(parts) > 1:
+        left, right = parts[0:-1:2], parts[1::2]
+        leftover = [parts[-1]] if len(parts) % 2 else []
+        if len(left) > 1:
+            parts = list(executor.map(operator.mul, left, right)) + leftover
+        else:
+            parts = [left[0] * right[0]] + leftover
+    return parts[0], chunks
+
+
+def factorial_result_bits(n: int) -> int:
+    """Upper bound on the bit length of n!"""
+    if n < 2:
+        return 1
+    return int(math.lgamma(n + 1) / math.log(2)) + 2
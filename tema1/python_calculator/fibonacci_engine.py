@@ -0,0 +1,125 @@
+import math
+import re
+from functools import lru_cache
+
+# Exact Fibonacci numbers by fast doubling.
+# From F(k) and F(k+1):
+#   F(2k)   = F(k) * (2*F(k+1) - F(k))
+#   F(2k+1) = F(k)^2 + F(k+1)^2
+# Walking the bits of n from the most significant one needs O(log n) big-int
+# multiplications instead of the O(phi^n) calls of the double recursion.
+
+# log2 of the golden ratio: F(n) has about n * LOG2_PHI bits
+LOG2_PHI = math.log2((1 + math.sqrt(5)) / 2)
+
+# Inputs look like "n" or "n,m" (F(n) mod m); commas, whitespace or "mod" separate them
+SEPARATORS = re.compile(r"[\s,]+|mod", re.IGNORECASE)
+
+# Pisano periods are at most 6m long, so they are only searched for small moduli
+PISANO_MAX_MODULUS = 10000
+
+
+def fibonacci_pair(n: int):
+    """Return (F(n), F(n+1)) for n >= 0"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+
+    a, b = 0, 1  # F(0), F(1)
+    for bit in bin(n)[2:]:
+        # (F(k), F(k+1)) -> (F(2k), F(2k+1))
+        c = a * ((b << 1) - a)
+        d = a * a + b * b
+        if bit == '1':
+            # -> (F(2k+1), F(2k+2))
+            a, b = d, c + d
+        else:
+            a, b = c, d
+    return a, b
+
+
+def fibonacci(n: int) -> int:
+    """Exact F(n) for n >= 0"""
+    return fibonacci_pair(n)[0]
+
+
+def fibonacci_pair_mod(n: int, modulus: int):
+    """Return (F(n) mod m, F(n+1) mod m) for n >= 0, all products on residues"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+
+    a, b = 0, 1 % modulus
+    for bit in bin(n)[2:]:
+        c = a * ((b << 1) - a) % modulus
+        d = (a * a + b * b) % modulus
+        if bit == '1':
+            a, b = d, (c + d) % modulus
+        else:
+            a, b = c, d
+    return a, b
+
+
+@lru_cache(maxsize=256)
+def pisano_period(modulus: int) -> int:
+    """Period of F(n) mod m (at most 6m, so only meant for small m)"""
+    if modulus == 1:
+        return 1
+    a, b = 0, 1
+    for period in range(1, 6 * modulus + 1):
+        a, b = b, (a + b) % modulus
+        if a == 0 and b == 1:
+            return period
+    raise ValueError(f"No Pisano period found for {modulus}")
+
+
+def fibonacci_mod(n: int, modulus: int) -> int:
+    """F(n) mod m in O(log n) small-integer steps"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if modulus < 1:
+        raise ValueError("Modulus must be a positive integer")
+
+    if modulus <= PISANO_MAX_MODULUS:
+        # F(n) mod m repeats with the Pisano period, so n shrinks below 6m
+        n %= pisano_period(modulus)
+    return fibonacci_pair_mod(n, modulus)[0]
+
+
+def parse_fibonacci_input(text: str):
+    """Return (n, modulus) parsed from the operation input; modulus is None without one"""
+    parts = [part for part in SEPARATORS.split(str(text).strip()) if part]
+    if len(parts) not in (1, 2):
+        raise ValueError("fibonacci expects 'n' or 'n,modulus'")
+    try:
+        numbers = [int(part) for part in parts]
+    except ValueError:
+        raise ValueError("fibonacci arguments must be integers")
+
+    modulus = numbers[1] if len(numbers) == 2 else None
+    return numbers[0], modulus
+
+
+def normalize_fibonacci_input(text: str) -> str:
+    """Cache key spelling of a fibonacci input, e.g. '10 mod 7' -> '10,7'"""
+    n, modulus = parse_fibonacci_input(text)
+    if modulus is None:
+        return str(n)
+    return f"{n},{modulus}"
+
+
+def fibonacci_result_bits(n: int) -> int:
+    """Upper bound on the bit length of F(n)"""
+    if n <= 1:
+        return 1
+    return int(n * LOG2_PHI) + 1
+
+
+def fibonacci_range(start: int, end: int):
+    """Yield (n, F(n)) for start <= n <= end, holding only two numbers at a time"""
+    if start < 0 or end < start:
+        raise ValueError("range must satisfy 0 <= start <= end")
+
+    # one fast-doubling seed, then plain addition steps
+    a, b = fibonacci_pair(start)
+    for n in range(start, end + 1):
+        yield n, a
+        a, b = b, a + b
@@ -0,0 +1,174 @@
+import base64
+import decimal
+import json
+import struct
+
+# Rendering of (possibly huge) integer results.
+# str(int) raises ValueError above sys.get_int_max_str_digits() (4300 by default)
+# and is quadratic in the number of digits. int_to_decimal() converts the
+# integer into an exact Decimal by splitting it on powers of two
+# (value = high * 2^k + low), so the big multiplications run in libmpdec's
+# subquadratic arithmetic, and Decimal formatting has no digit limit.
+# 10^6 digits take well under a second instead of tens of seconds.
+# iter_encoded() yields the text in chunks without ever holding all of it: the
+# decimal digits are split off the Decimal by powers of ten, hex and base64
+# are cut from the integer's bytes.
+
+RESULT_ENCODINGS = ('decimal', 'hex', 'base64')
+
+# integers up to this many bits have at most ~4200 digits, so str() is safe for them
+SAFE_STR_BITS = 14000
+
+# pieces of at most this many bits are converted with Decimal(int) directly
+LEAF_BITS = 128
+
+
+def _to_decimal(value: int) -> decimal.Decimal:
+    """Exact Decimal of a non-negative integer by divide and conquer"""
+    powers = {}  # k -> Decimal(2 ** k)
+
+    def power_of_two(k):
+        result = powers.get(k)
+        if result is None:
+            if k <= LEAF_BITS:
+                result = decimal.Decimal(1 << k)
+            elif k - 1 in powers:
+                result = powers[k - 1] * 2
+            else:
+                half = k >> 1
+                result = power_of_two(half) * power_of_two(k - half)
+            powers[k] = result
+        return result
+
+    def convert(n, bits):
+        if bits <= LEAF_BITS:
+            return decimal.Decimal(n)
+        half = bits >> 1
+        high = n >> half
+        low = n - (high << half)
+        return convert(low, half) + convert(high, bits - half) * power_of_two(half)
+
+    return convert(value, value.bit_length())
+
+
+def _exact_context(context):
+    # exact arithmetic: unbounded precision, and any rounding is an error
+    context.prec = decimal.MAX_PREC
+    context.Emax = decimal.MAX_EMAX
+    context.traps[decimal.Inexact] = True
+
+
+def int_to_decimal(value: int) -> str:
+    """str(value) that also works above the interpreter's int-to-str digit limit"""
+    if value.bit_length() <= SAFE_STR_BITS:
+        return str(value)
+    with decimal.localcontext() as context:
+        _exact_context(context)
+        digits = format(_to_decimal(abs(value)), 'f')
+    return '-' + digits if value < 0 else digits
+
+
+def int_to_base64(value: int) -> str:
+    """Base64 of the big-endian two's complement bytes of value"""
+    length = value.bit_length() // 8 + 1
+    return base64.b64encode(value.to_bytes(length, 'big', signed=True)).decode('ascii')
+
+
+def encode_int(value: int, encoding: str = 'decimal') -> str:
+    if encoding == 'decimal':
+        return int_to_decimal(value)
+    if encoding == 'hex':
+        return hex(value)
+    if encoding == 'base64':
+        return int_to_base64(value)
+    raise ValueError(f"Unknown result encoding: {encoding}")
+
+
+def _iter_digits(number: decimal.Decimal, width: int, chunk_size: int):
+    # digits of a non-negative integral Decimal, zero padded to width; every
+    # chunk but the first is chunk_size long
+    if width <= chunk_size:
+        yield format(number, 'f').zfill(width)
+        return
+    low_width = (-(-width // chunk_size) // 2) * chunk_size
+    high = number.scaleb(-low_width).to_integral_value(rounding=decimal.ROUND_FLOOR)
+    low = number - high.scaleb(low_width)
+    yield from _iter_digits(high, width - low_width, chunk_size)
+    yield from _iter_digits(low, low_width, chunk_size)
+
+
+def iter_encoded(value: int, encoding: str = 'decimal', chunk_size: int = 65536):
+    """encode_int() as a sequence of string chunks, produced one at a time"""
+    if encoding not in RESULT_ENCODINGS:
+        raise ValueError(f"Unknown result encoding: {encoding}")
+    if value.bit_length() <= SAFE_STR_BITS:
+        text = encode_int(value, encoding)
+        for start in range(0, len(text), chunk_size):
+            yield text[start:start + chunk_size]
+        return
+
+    if encoding == 'decimal':
+        if value < 0:
+            yield '-'
+        with decimal.localcontext() as context:
+            _exact_context(context)
+            number = _to_decimal(abs(value))
+            yield from _iter_digits(number, number.adjusted() + 1, chunk_size)
+    elif encoding == 'hex':
+        data = abs(value).to_bytes((value.bit_length() + 7) // 8, 'big')
+        step = chunk_size // 2
+        yield '-0x' if value < 0 else '0x'
+        # the top byte may start with a zero nibble, which hex() does not print
+        yield data[:1].hex().lstrip('0')
+        for start in range(1, len(data), step):
+            yield data[start:start + step].hex()
+    else:
+        data = value.to_bytes(value.bit_length() // 8 + 1, 'big', signed=True)
+        # whole 3-byte groups, so the pieces concatenate to one base64 text
+        step = max(chunk_size // 4, 1) * 3
+        for start in range(0, len(data), step):
+            yield base64.b64encode(data[start:start + step]).decode('ascii')
+
+
+def pack_result(value):
+    """(kind, bytes) of a cached result for binary storage, or None if it cannot be stored;
+    integers are their two's complement bytes, floats 8 bytes, strings UTF-8 and lists
+    (calculator results) JSON"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return 'int', value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)
+    if isinstance(value, float):
+        return 'float', struct.pack('<d', value)
+    if isinstance(value, str):
+        return 'str', value.encode('utf-8')
+    if isinstance(value, (list, dict)):
+        try:
+            return 'json', json.dumps(value).encode('utf-8')
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def unpack_result(kind: str, data: bytes):
+    if kind == 'int':
+        return int.from_bytes(data, 'little', signed=True)
+    if kind == 'float':
+        return struct.unpack('<d', data)[0]
+    if kind == 'json':
+        return json.loads(bytes(data).decode('utf-8'))
+    return bytes(data).decode('utf-8')
+
+
+def result_preview(value) -> str:
+    """Text for logs and the request history; huge integers are only described"""
+    if isinstance(value, int) and not isinstance(value, bool) and value.bit_length() > SAFE_STR_BITS:
+        return f"<integer: {value.bit_length()} bits>"
+    return str(value)
+
+
+def result_text(value) -> str:
+    """Full text of a result, integers of any size included"""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int_to_decimal(value)
+    return str(value)
@@ -0,0 +1,126 @@
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+from factorial_engine import factorial
+from fibonacci_engine import fibonacci
+
+# Size and leading digits of n! and F(n) without building the numbers.
+# Both come from log10 of the value:
+#   log n! = Stirling series  n ln n - n + ln(2 pi n) / 2 + sum B_2k / (2k (2k-1) n^(2k-1))
+#   log F(n) = n log phi - log sqrt(5)   (Binet; the phi^-n term is below the precision)
+# evaluated with Decimal at a precision that keeps the fractional part (which
+# holds the leading digits) exact even when the integer part is huge.
+# Trailing zeros are exact: Legendre's formula for n!, and v2/v5 of F(n).
+
+LEADING_DIGITS = 10
+
+# below these n the exact number is cheap, so it is summarized directly
+EXACT_FACTORIAL_LIMIT = 1000
+EXACT_FIBONACCI_LIMIT = 5000
+
+# 2 * pi to 80 digits
+TWO_PI = Decimal('6.2831853071795864769252867665590057683943387987502116419498891846156328125724180')
+
+# B_2k / (2k (2k-1)) for the Stirling series, enough terms for n >= EXACT_FACTORIAL_LIMIT
+STIRLING_COEFFICIENTS = [
+    Fraction(1, 12), Fraction(-1, 360), Fraction(1, 1260), Fraction(-1, 1680),
+    Fraction(1, 1188), Fraction(-691, 360360), Fraction(1, 156), Fraction(-3617, 122400)
+]
+
+
+def _precision(n: int) -> int:
+    # digits in the integer part of the logarithm plus the digits we need after the point
+    return len(str(abs(n))) * 2 + LEADING_DIGITS + 30
+
+
+def _summary_from_log10(log10_value: Decimal, log2_value: Decimal, trailing_zeros: int) -> dict:
+    integer_part = int(log10_value)  # log10_value > 0 here
+    digit_count = integer_part + 1
+    leading_count = min(LEADING_DIGITS, digit_count)
+    # the fractional part of the logarithm gives the leading digits
+    leading = int(Decimal(10) ** (log10_value - integer_part + leading_count - 1))
+    return {
+        'digit_count': digit_count,
+        'leading_digits': str(leading),
+        'trailing_zeros': trailing_zeros,
+        'bit_length': int(log2_value) + 1,
+        'exact': False
+    }
+
+
+def summarize_integer(value: int) -> dict:
+    """Summary of an already computed (small) integer"""
+    digits = str(abs(value))
+    return {
+        'digit_count': len(digits),
+        'leading_digits': digits[:LEADING_DIGITS],
+        'trailing_zeros': len(digits) - len(digits.rstrip('0')) if value else 0,
+        'bit_length': value.bit_length(),
+        'exact': True
+    }
+
+
+def factorial_trailing_zeros(n: int) -> int:
+    """Legendre's formula for the exponent of 5 in n! (2s are always more frequent)"""
+    zeros = 0
+    power = 5
+    while power <= n:
+        zeros += n // power
+        power *= 5
+    return zeros
+
+
+def factorial_summary(n: int) -> dict:
+    """Digit count, leading digits, trailing zeros and bit length of n!"""
+    if n < 0:
+        raise ValueError("factorial is not defined for negative numbers")
+    if n < EXACT_FACTORIAL_LIMIT:
+        return summarize_integer(factorial(n))
+
+    with localcontext() as context:
+        context.prec = _precision(n)
+        x = Decimal(n)
+        ln_factorial = x * x.ln() - x + (TWO_PI * x).ln() / 2
+        power = x
+        for coefficient in STIRLING_COEFFICIENTS:
+            ln_factorial += Decimal(coefficient.numerator) / (Decimal(coefficient.denominator) * power)
+            power *= x * x
+        log10_value = ln_factorial / Decimal(10).ln()
+        log2_value = ln_factorial / Decimal(2).ln()
+        return _summary_from_log10(log10_value, log2_value, factorial_trailing_zeros(n))
+
+
+def _valuation(n: int, p: int) -> int:
+    count = 0
+    while n and n % p == 0:
+        n //= p
+        count += 1
+    return count
+
+
+def fibonacci_trailing_zeros(n: int) -> int:
+    """Exponent of 10 in F(n) for n >= 1, from v2(F(n)) and v5(F(n)) = v5(n)"""
+    if n % 3:
+        twos = 0
+    elif n % 6 == 3:
+        twos = 1
+    else:
+        twos = _valuation(n, 2) + 2
+    return min(twos, _valuation(n, 5))
+
+
+def fibonacci_summary(n: int) -> dict:
+    """Digit count, leading digits, trailing zeros and bit length of F(n)"""
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if n < EXACT_FIBONACCI_LIMIT:
+        return summarize_integer(fibonacci(n))
+
+    with localcontext() as context:
+        context.prec = _precision(n)
+        sqrt5 = Decimal(5).sqrt()
+        ln_phi = ((1 + sqrt5) / 2).ln()
+        ln_fibonacci = n * ln_phi - sqrt5.ln()
+        log10_value = ln_fibonacci / Decimal(10).ln()
+        log2_value = ln_fibonacci / Decimal(2).ln()
+        return _summary_from_log10(log10_value, log2_value, fibonacci_trailing_zeros(n))
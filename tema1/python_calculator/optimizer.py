@@ -0,0 +1,147 @@
+from ClassEva import Eva, isNumber, isString
+
+# Optimizer pass run between parsing and evaluation:
+#   - constant sub-trees are folded with Eva itself, so the infinit/epsilon
+#     guards give exactly the value the evaluator would have produced
+#   - identities are only applied where Eva gives the same value for every x:
+#     x/1 becomes x, and x*0, 0*x become 0 when x is a variable (the evaluator
+#     checks that every variable is bound before it starts, so dropping the
+#     load hides nothing; a dropped sub-expression could have raised)
+#   - the largest constant exponent is recorded, computed exponents included,
+#     so the evaluation budget can bound it before anything is evaluated
+#   - identical sub-expressions are shared (the tree becomes a DAG) so an
+#     evaluator that memoizes shared nodes computes each of them once
+#
+# x+0, x-0, x*1 and x^^1 are left alone: Eva clamps them to the infinit
+# sentinel when x is out of range or NaN, where x alone would not be.
+
+eva = Eva()
+
+
+def count_nodes(tree):
+    """Number of nodes when the tree is walked as a tree"""
+    total = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        total += 1
+        if isinstance(node, list):
+            stack.extend(node[1:])
+    return total
+
+
+def count_unique_nodes(tree):
+    """Number of distinct nodes once shared sub-expressions are counted once"""
+    seen = set()
+    total = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            stack.extend(node[1:])
+        total += 1
+    return total
+
+
+def tree_depth(tree):
+    """Number of levels of the tree (a leaf has depth 1), computed without recursion"""
+    depths = {}  # id(node) -> depth, shared nodes are measured once
+    work = [(tree, False)]
+    while work:
+        node, expanded = work.pop()
+        if not isinstance(node, list) or id(node) in depths:
+            continue
+        if not expanded:
+            work.append((node, True))
+            work.extend((child, False) for child in node[1:])
+            continue
+        depths[id(node)] = 1 + max(depths.get(id(child), 1) if isinstance(child, list) else 1
+                                   for child in node[1:])
+    return depths.get(id(tree), 1)
+
+
+def count_references(tree):
+    """id(node) -> number of parents pointing at it"""
+    references = {}
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        if not isinstance(node, list):
+            continue
+        seen = id(node) in references
+        references[id(node)] = references.get(id(node), 0) + 1
+        if not seen:
+            stack.extend(node[1:])
+    return references
+
+
+def is_value(node, value):
+    return isNumber(node) and node == value
+
+
+def simplify_identity(operator, left, right):
+    """Return the simplified node or None when no identity applies"""
+    if operator == '*':
+        # Eva.inmultit returns 0 for a zero operand whatever the other one is
+        if (is_value(left, 0) and isString(right)) or (is_value(right, 0) and isString(left)):
+            return 0.0
+    elif operator == '/':
+        if is_value(right, 1):
+            return left
+    return None
+
+
+def optimize(tree):
+    """Return (optimized_tree, nodes_eliminated, largest_exponent)"""
+    shared = {}   # (operator, child keys...) -> the single shared node
+    numbers = {}  # id(shared node) -> small key standing for its whole sub-tree
+    largest_exponent = 0
+
+    def key_of(node):
+        return numbers[id(node)] if isinstance(node, list) else node
+
+    def rebuild(operator, children):
+        nonlocal largest_exponent
+        if operator == '^^' and isNumber(children[1]):
+            largest_exponent = max(largest_exponent, abs(children[1]))
+
+        if all(isNumber(child) for child in children):
+            try:
+                return eva.eval([operator] + children)
+            except (ArithmeticError, ValueError):
+                pass  # leave it for the evaluator to report
+
+        if len(children) == 2:
+            simplified = simplify_identity(operator, children[0], children[1])
+            if simplified is not None:
+                return simplified
+
+        key = (operator,) + tuple(key_of(child) for child in children)
+        if key not in shared:
+            rebuilt = [operator] + children
+            shared[key] = rebuilt
+            numbers[id(rebuilt)] = ('#', len(numbers))
+        return shared[key]
+
+    # post-order walk with an explicit stack (long chains are too deep to recurse)
+    optimized_nodes = {}  # id(original node) -> its optimized form
+
+    def optimized_of(node):
+        return optimized_nodes[id(node)] if isinstance(node, list) else node
+
+    work = [(tree, False)]
+    while work:
+        node, expanded = work.pop()
+        if not isinstance(node, list) or id(node) in optimized_nodes:
+            continue
+        if not expanded:
+            work.append((node, True))
+            work.extend((child, False) for child in node[1:])
+            continue
+        optimized_nodes[id(node)] = rebuild(node[0], [optimized_of(child) for child in node[1:]])
+
+    optimized = optimized_of(tree)
+    return optimized, count_nodes(tree) - count_unique_nodes(optimized), largest_exponent
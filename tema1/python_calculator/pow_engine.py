@@ -0,0 +1,51 @@
+import re
+
+# Exact integer exponentiation for the 'pow' operation.
+# Inputs look like "base,exponent" or "base,exponent,modulus"
+# (commas, whitespace or ^ between the numbers are all accepted).
+
+SEPARATORS = re.compile(r"[\s,^]+")
+
+
+def parse_pow_input(text: str):
+    """Return (base, exponent, modulus) parsed from the operation input"""
+    parts = [part for part in SEPARATORS.split(str(text).strip()) if part]
+    if len(parts) not in (2, 3):
+        raise ValueError("pow expects 'base,exponent' or 'base,exponent,modulus'")
+    try:
+        numbers = [int(part) for part in parts]
+    except ValueError:
+        raise ValueError("pow arguments must be integers")
+
+    base, exponent = numbers[0], numbers[1]
+    modulus = numbers[2] if len(numbers) == 3 else None
+    return base, exponent, modulus
+
+
+def normalize_pow_input(text: str) -> str:
+    """Cache key spelling of a pow input, e.g. '2 ^ 10' -> '2,10'"""
+    base, exponent, modulus = parse_pow_input(text)
+    if modulus is None:
+        return f"{base},{exponent}"
+    return f"{base},{exponent},{modulus}"
+
+
+def fast_pow(base: int, exponent: int, modulus: int = None) -> int:
+    """Exact base**exponent (mod modulus) with O(log exponent) multiplications"""
+    # CPython's int pow is left-to-right binary square-and-multiply;
+    # with a modulus it works on residues and negative exponents use the modular inverse
+    if modulus is not None:
+        if modulus == 0:
+            raise ValueError("Modulus must be non-zero")
+        return pow(base, exponent, modulus)
+
+    if exponent < 0:
+        raise ValueError("Negative exponents require a modulus")
+    return pow(base, exponent)
+
+
+def pow_result_bits(base: int, exponent: int) -> int:
+    """Upper bound on the bit length of base**exponent (no modulus)"""
+    if base in (0, 1, -1) or exponent <= 0:
+        return 1
+    return abs(base).bit_length() * exponent
@@ -0,0 +1,240 @@
+import fcntl
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+
+from int_encoding import pack_result, unpack_result
+
+# Result table in a multiprocessing.shared_memory segment, shared by every
+# worker process on the host (they attach to it by name).
+#
+#   | header | slot_count slots of 32 bytes | arena |
+#
+# A key hashes (blake2b, so every process agrees) to a home slot; lookups and
+# stores probe MAX_PROBE consecutive slots. A slot holds the hash, a tag (the
+# cache namespace), the value kind and the offset/lengths of the key and value
+# bytes, which are appended to the arena. When a store finds no free slot it
+# overwrites the home slot, and when the arena is full the whole table is wiped
+# (a new generation starts): like any cache the table may forget entries.
+#
+# Processes serialize through flock on a lock file (shared for lookups,
+# exclusive for changes); threads of one process through a threading.Lock,
+# since flock does not separate threads sharing a file descriptor.
+
+MAGIC = b'EXPRCACH'
+LAYOUT_VERSION = 1
+
+# magic, layout version, slot count, arena size, arena used, entries, stores, wipes, generation
+HEADER = struct.Struct('<8sIIQQQQQQ')
+
+# key hash, arena offset, key length, value length, tag, kind, used
+SLOT = struct.Struct('<QQIIHBB4x')
+
+MAX_PROBE = 8
+
+KINDS = {'int': 1, 'float': 2, 'str': 3, 'json': 4}
+KIND_NAMES = {code: kind for kind, code in KINDS.items()}
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> shared_memory.SharedMemory:
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, create=create, size=size, track=False)
+    segment = shared_memory.SharedMemory(name, create=create, size=size)
+    # Before 3.13 every attaching process registers the segment with its resource
+    # tracker, which unlinks it when that process exits; the table must outlive
+    # single workers, so it is only removed by unlink()
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(segment._name, 'shared_memory')
+    return segment
+
+
+class SharedResultTable:
+    """Fixed-slot hash table of cached results in named shared memory"""
+
+    def __init__(self, name: str = 'calculator_cache', slot_count: int = 65536, arena_size: int = 256 * 1024 * 1024):
+        self.name = name
+        self.lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self.thread_lock = threading.Lock()
+        self.lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+        # a forked child must not share the parent's open lock file (flock is per open file)
+        os.register_at_fork(after_in_child=self._reopen_lock)
+
+        with self.locked(fcntl.LOCK_EX):
+            try:
+                self.segment = _open_segment(name, create=True,
+                                             size=HEADER.size + slot_count * SLOT.size + arena_size)
+                # new segments are zero filled, so every slot starts unused
+                HEADER.pack_into(self.segment.buf, 0, MAGIC, LAYOUT_VERSION, slot_count, arena_size, 0, 0, 0, 0, 0)
+                self.created = True
+            except FileExistsError:
+                self.segment = _open_segment(name)
+                magic, version, slot_count, arena_size = HEADER.unpack_from(self.segment.buf, 0)[:4]
+                if magic != MAGIC or version != LAYOUT_VERSION:
+                    self.segment.close()
+                    raise ValueError(f"Shared memory segment '{name}' does not hold a result table "
+                                     f"of layout version {LAYOUT_VERSION}")
+                self.created = False
+
+        self.buf = self.segment.buf
+        self.slot_count = slot_count
+        self.arena_size = arena_size
+        self.slots_offset = HEADER.size
+        self.arena_offset = HEADER.size + slot_count * SLOT.size
+
+    def _reopen_lock(self):
+        self.thread_lock = threading.Lock()
+        self.lock_fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    @contextmanager
+    def locked(self, operation: int):
+        """Hold the table: fcntl.LOCK_SH to read it, fcntl.LOCK_EX to change it"""
+        with self.thread_lock:
+            fcntl.flock(self.lock_fd, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(self.lock_fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(tag: int, key: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8, salt=tag.to_bytes(2, 'little')).digest(), 'little')
+
+    def _find(self, key_hash: int, tag: int, key: bytes):
+        """(index of the slot holding key or None, slot to store key in)"""
+        free = None
+        for probe in range(MAX_PROBE):
+            index = (key_hash + probe) % self.slot_count
+            slot_hash, offset, key_length, _, slot_tag, _, used = SLOT.unpack_from(
+                self.buf, self.slots_offset + index * SLOT.size)
+            if not used:
+                if free is None:
+                    free = index
+                continue
+            if slot_hash == key_hash and slot_tag == tag and key_length == len(key):
+                start = self.arena_offset + offset
+                if self.buf[start:start + key_length] == key:
+                    return index, index
+        return None, free if free is not None else key_hash % self.slot_count
+
+    def get(self, tag: int, key: str):
+        """(True, result) if the table holds key under tag, else (False, None)"""
+        key = key.encode('utf-8')
+        key_hash = self._hash(tag, key)
+        with self.locked(fcntl.LOCK_SH):
+            index, _ = self._find(key_hash, tag, key)
+            if index is None:
+                return False, None
+            _, offset, key_length, value_length, _, kind, _ = SLOT.unpack_from(
+                self.buf, self.slots_offset + index * SLOT.size)
+            start = self.arena_offset + offset + key_length
+            data = bytes(self.buf[start:start + value_length])
+        return True, unpack_result(KIND_NAMES[kind], data)
+
+    def put(self, tag: int, key: str, result) -> bool:
+        """Store result under tag/key; False if it cannot be stored"""
+        packed = pack_result(result)
+        if packed is None:
+            return False
+        kind, data = packed
+        key = key.encode('utf-8')
+        size = len(key) + len(data)
+        if size > self.arena_size:
+            return False
+        key_hash = self._hash(tag, key)
+
+        with self.locked(fcntl.LOCK_EX):
+            header = list(HEADER.unpack_from(self.buf, 0))
+            arena_used, entries = header[4], header[5]
+            if arena_used + size > self.arena_size:
+                self._wipe(header)
+                arena_used = entries = 0
+
+            index, target = self._find(key_hash, tag, key)
+            slot_offset = self.slots_offset + target * SLOT.size
+            if index is None and not SLOT.unpack_from(self.buf, slot_offset)[6]:
+                entries += 1
+
+            start = self.arena_offset + arena_used
+            self.buf[start:start + len(key)] = key
+            self.buf[start + len(key):start + size] = data
+            SLOT.pack_into(self.buf, slot_offset, key_hash, arena_used, len(key), len(data), tag, KINDS[kind], 1)
+
+            header[4] = arena_used + size
+            header[5] = entries
+            header[6] += 1
+            HEADER.pack_into(self.buf, 0, *header)
+        return True
+
+    def _wipe(self, header: list):
+        # called with the exclusive lock held
+        self.buf[self.slots_offset:self.arena_offset] = bytes(self.arena_offset - self.slots_offset)
+        header[4] = 0
+        header[5] = 0
+        header[7] += 1
+        header[8] += 1
+        HEADER.pack_into(self.buf, 0, *header)
+
+    def clear(self, tag: int = None):
+        """Forget every entry, or only the entries of one tag"""
+        with self.locked(fcntl.LOCK_EX):
+            header = list(HEADER.unpack_from(self.buf, 0))
+            if tag is None:
+                self._wipe(header)
+                return
+            # the arena space of these entries is reclaimed at the next wipe
+            removed = 0
+            for index in range(self.slot_count):
+                slot_offset = self.slots_offset + index * SLOT.size
+                slot = SLOT.unpack_from(self.buf, slot_offset)
+                if slot[6] and slot[4] == tag:
+                    SLOT.pack_into(self.buf, slot_offset, 0, 0, 0, 0, 0, 0, 0)
+                    removed += 1
+            header[5] -= removed
+            HEADER.pack_into(self.buf, 0, *header)
+
+    def tag_counts(self) -> dict:
+        """Number of entries per tag"""
+        counts = {}
+        with self.locked(fcntl.LOCK_SH):
+            for slot in SLOT.iter_unpack(self.buf[self.slots_offset:self.arena_offset]):
+                if slot[6]:
+                    counts[slot[4]] = counts.get(slot[4], 0) + 1
+        return counts
+
+    def get_stats(self):
+        with self.locked(fcntl.LOCK_SH):
+            _, _, slot_count, arena_size, arena_used, entries, stores, wipes, generation = \
+                HEADER.unpack_from(self.buf, 0)
+        return {
+            'name': self.name,
+            'slots': slot_count,
+            'entries': entries,
+            'arena_size': arena_size,
+            'arena_used': arena_used,
+            'stores': stores,
+            'wipes': wipes,
+            'generation': generation
+        }
+
+    def close(self):
+        """Detach this process from the table"""
+        self.buf = None
+        self.segment.close()
+        os.close(self.lock_fd)
+
+    def unlink(self):
+        """Remove the segment from the system (after every process detached or is about to)"""
+        if sys.version_info < (3, 13):
+            # SharedMemory.unlink() unregisters the segment again; undo _open_segment's unregister
+            from multiprocessing import resource_tracker
+            resource_tracker.register(self.segment._name, 'shared_memory')
+        self.segment.unlink()
+        try:
+            os.remove(self.lock_path)
+        except FileNotFoundError:
+            pass
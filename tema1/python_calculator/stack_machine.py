@@ -0,0 +1,171 @@
+from ClassEva import Eva, isNumber, isString
+from optimizer import count_references
+
+# Flat stack-machine backend for Eva trees.
+# lower() turns a tree (or the optimizer's DAG) into a postfix instruction
+# array with integer opcodes; run() executes it in one loop over an explicit
+# value stack, so neither lowering nor evaluation recurse through Python frames
+# and expression depth is not limited by the recursion limit.
+#
+# Instruction layout in Program.code (flat list of ints):
+#   CONST k   push constants[k]
+#   LOAD k    push env[names[k]]
+#   STORE k   slots[k] = top of stack (value stays on the stack)
+#   FETCH k   push slots[k]
+#   ADD .. COS  pop operands, push Eva's result
+
+CONST = 0
+LOAD = 1
+STORE = 2
+FETCH = 3
+ADD = 4
+SUB = 5
+MUL = 6
+DIV = 7
+POW = 8
+RAD = 9
+LOG = 10
+SIN = 11
+COS = 12
+
+BINARY_OPCODES = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '^^': POW}
+UNARY_OPCODES = {'rad': RAD, 'log': LOG, 'sin': SIN, 'cos': COS}
+
+# how many instructions run between two wall-time budget checks
+BUDGET_CHECK_INTERVAL = 4096
+
+OPCODE_NAMES = {
+    CONST: 'CONST', LOAD: 'LOAD', STORE: 'STORE', FETCH: 'FETCH',
+    ADD: 'ADD', SUB: 'SUB', MUL: 'MUL', DIV: 'DIV', POW: 'POW',
+    RAD: 'RAD', LOG: 'LOG', SIN: 'SIN', COS: 'COS'
+}
+
+
+class Program:
+    """Lowered expression: flat code plus its constant, name and slot tables"""
+
+    def __init__(self, code, constants, names, slot_count):
+        self.code = code
+        self.constants = constants
+        self.names = names
+        self.slot_count = slot_count
+
+    def disassemble(self):
+        lines = []
+        pc = 0
+        while pc < len(self.code):
+            op = self.code[pc]
+            if op <= FETCH:
+                lines.append(f"{pc:4d} {OPCODE_NAMES[op]} {self.code[pc + 1]}")
+                pc += 2
+            else:
+                lines.append(f"{pc:4d} {OPCODE_NAMES[op]}")
+                pc += 1
+        return '\n'.join(lines)
+
+
+def lower(tree):
+    """Lower an Eva tree/DAG to a postfix Program without recursion"""
+    code = []
+    constants = []
+    constant_index = {}
+    names = []
+    name_index = {}
+    slots = {}  # id(shared node) -> slot number
+    references = count_references(tree)
+
+    # (node, expanded) pairs; a node is emitted after its children
+    work = [(tree, False)]
+    while work:
+        node, expanded = work.pop()
+
+        if isNumber(node):
+            if node not in constant_index:
+                constant_index[node] = len(constants)
+                constants.append(node)
+            code.extend((CONST, constant_index[node]))
+            continue
+
+        if isString(node):
+            if node not in name_index:
+                name_index[node] = len(names)
+                names.append(node)
+            code.extend((LOAD, name_index[node]))
+            continue
+
+        if id(node) in slots:
+            code.extend((FETCH, slots[id(node)]))
+            continue
+
+        operator = node[0]
+        if operator not in BINARY_OPCODES and operator not in UNARY_OPCODES:
+            raise TypeError("Unimplemented")
+
+        if not expanded:
+            work.append((node, True))
+            for child in reversed(node[1:]):
+                work.append((child, False))
+            continue
+
+        code.append(BINARY_OPCODES.get(operator) or UNARY_OPCODES[operator])
+        if references.get(id(node), 0) > 1:
+            slots[id(node)] = len(slots)
+            code.extend((STORE, slots[id(node)]))
+
+    return Program(code, constants, names, len(slots))
+
+
+def run(program, env=None, eva=None, budget=None):
+    """Execute a Program on an explicit value stack"""
+    eva = eva or Eva()
+    env = env or {}
+
+    binary = (eva.plus, eva.minus, eva.inmultit, eva.impartit, eva.putere)
+    unary = (eva.radical, eva.logaritm, eva.sinus, eva.cosinus)
+
+    code = program.code
+    constants = program.constants
+    names = program.names
+    slots = [None] * program.slot_count
+
+    stack = []
+    push = stack.append
+    pop = stack.pop
+    n = len(code)
+    pc = 0
+
+    if budget is not None:
+        budget.start(n)
+        next_check = BUDGET_CHECK_INTERVAL
+    else:
+        next_check = n
+
+    while pc < n:
+        if pc >= next_check:
+            budget.check_time()
+            next_check += BUDGET_CHECK_INTERVAL
+        op = code[pc]
+        if op >= RAD:
+            stack[-1] = unary[op - RAD](stack[-1])
+            pc += 1
+        elif op >= ADD:
+            y = pop()
+            stack[-1] = binary[op - ADD](stack[-1], y)
+            pc += 1
+        elif op == CONST:
+            push(constants[code[pc + 1]])
+            pc += 2
+        elif op == LOAD:
+            name = names[code[pc + 1]]
+            if name not in env:
+                raise ValueError(f"Unbound variable '{name}'")
+            push(env[name])
+            pc += 2
+        elif op == STORE:
+            slots[code[pc + 1]] = stack[-1]
+            pc += 2
+        else:  # FETCH
+            push(slots[code[pc + 1]])
+            pc += 2
+
+    return stack[-1]
@@ -0,0 +1,56 @@
+import contextvars
+from contextlib import contextmanager
+
+# Pluggable tracing for the calculator engines.
+# Engine code fetches the active tracer once per function and records steps
+# only when one is installed:
+#
+#     tracer = active_tracer()
+#     ...
+#     if tracer: tracer.record("SIR=", sir)
+#
+# With no tracer installed that is a single context lookup plus a None test,
+# instead of the print() calls that used to write every step to stdout.
+
+_active_tracer = contextvars.ContextVar('calculator_tracer', default=None)
+
+
+class Tracer:
+    """Collects the intermediate steps of one evaluation"""
+
+    def __init__(self, max_steps: int = 1000):
+        self.max_steps = max_steps
+        self.steps = []
+        self.truncated = False
+
+    def record(self, label, *values):
+        if len(self.steps) >= self.max_steps:
+            self.truncated = True
+            return
+        # values are rendered now because the engine mutates its lists in place
+        self.steps.append({
+            'step': str(label).strip(' ='),
+            'values': [str(value) for value in values]
+        })
+
+    def to_dict(self):
+        return {
+            'steps': self.steps,
+            'truncated': self.truncated
+        }
+
+
+def active_tracer():
+    """Tracer installed for the current request/thread, or None"""
+    return _active_tracer.get()
+
+
+@contextmanager
+def tracing(tracer: Tracer = None):
+    """Install a tracer for the duration of the with block"""
+    tracer = tracer or Tracer()
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
@@ -0,0 +1,159 @@
+from ClassEva import Eva, isNumber, isString
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for vectorized evaluation
+    np = None
+
+# Evaluates one Eva tree over whole columns of variable bindings at once.
+# Every Eva guard (infinit sentinel, epsilon) is applied as an array mask,
+# so each row gets the same answer Eva.eval would give for it alone.
+
+INFINIT = float(Eva.infinit)
+EPSILON = Eva.epsilon
+
+
+def diferit_de_infinit(x):
+    return (INFINIT - np.abs(x)) > INFINIT / 2
+
+
+def modul(x):
+    return np.where(diferit_de_infinit(x), np.abs(x), INFINIT)
+
+
+def plus(x, y):
+    return np.where(diferit_de_infinit(x) & diferit_de_infinit(y), x + y, INFINIT)
+
+
+def minus(x, y):
+    return np.where(diferit_de_infinit(x) & diferit_de_infinit(y), x - y, INFINIT)
+
+
+def inmultit(x, y):
+    product = np.where(diferit_de_infinit(x) & diferit_de_infinit(y), x * y, INFINIT)
+    return np.where((modul(x) < EPSILON) | (modul(y) < EPSILON), 0.0, product)
+
+
+def impartit(x, y):
+    valid = modul(y) > EPSILON
+    return np.where(valid, x / np.where(valid, y, 1.0), INFINIT)
+
+
+def logaritm(x):
+    valid = (x > EPSILON) & diferit_de_infinit(x)
+    return np.where(valid, np.log(np.where(valid, x, 1.0)), INFINIT)
+
+
+def exponential(x):
+    valid = diferit_de_infinit(x)
+    return np.where(valid, np.exp(np.where(valid, x, 0.0)), INFINIT)
+
+
+def putere(x, y):
+    integer_exponent = y == np.trunc(y)
+    fractional = exponential(inmultit(y, logaritm(x)))
+    magnitude = np.power(x, np.where(integer_exponent, np.abs(y), 1.0))
+    integer = np.where(y < 0, impartit(1.0, magnitude), magnitude)
+    result = np.where(integer_exponent, integer, fractional)
+    result = np.where(diferit_de_infinit(x), result, INFINIT)
+    result = np.where(y == 0, 1.0, result)
+    return np.where(x == 0, 0.0, result)
+
+
+def sinus(x):
+    valid = diferit_de_infinit(x)
+    return np.where(valid, np.sin(np.where(valid, x, 0.0)), INFINIT)
+
+
+def cosinus(x):
+    valid = diferit_de_infinit(x)
+    return np.where(valid, np.cos(np.where(valid, x, 0.0)), INFINIT)
+
+
+def radical(x):
+    valid = diferit_de_infinit(x) & (x >= EPSILON)
+    return np.where(valid, np.sqrt(np.where(valid, x, 1.0)), INFINIT)
+
+
+BINARY = {
+    '+': plus,
+    '-': minus,
+    '*': inmultit,
+    '/': impartit,
+    '^^': putere
+}
+
+UNARY = {
+    'rad': radical,
+    'log': logaritm,
+    'sin': sinus,
+    'cos': cosinus
+}
+
+
+def prepare_bindings(bindings: dict, variables: list):
+    """Validate the binding columns and convert them to float arrays"""
+    missing = [name for name in variables if name not in bindings]
+    if missing:
+        raise ValueError(f"Missing bindings for variables: {', '.join(missing)}")
+
+    columns = {}
+    length = None
+    for name in variables:
+        try:
+            column = np.asarray(bindings[name], dtype=float)
+        except (TypeError, ValueError):
+            raise ValueError(f"Bindings for '{name}' must be a list of numbers")
+        if column.ndim != 1:
+            raise ValueError(f"Bindings for '{name}' must be a flat list")
+        if length is not None and len(column) != length:
+            raise ValueError("All binding columns must have the same length")
+        length = len(column)
+        columns[name] = column
+
+    return columns, length
+
+
+def evaluate_vectorized(tree, bindings: dict, variables: list, length: int = None):
+    """Evaluate tree once over all rows of bindings, returning a float array"""
+    if np is None:
+        raise RuntimeError("numpy is required for vectorized evaluation")
+
+    columns, column_length = prepare_bindings(bindings, variables)
+    if column_length is None:
+        column_length = length if length is not None else 1
+
+    # id(node) -> array; sub-expressions shared by the optimizer are computed once
+    computed = {}
+
+    def value_of(node):
+        if isNumber(node):
+            return np.float64(node)
+        if isString(node):
+            return columns[node]
+        return computed[id(node)]
+
+    # post-order walk with an explicit stack, so depth is not limited by recursion
+    work = [(tree, False)]
+    with np.errstate(all='ignore'):
+        while work:
+            node, expanded = work.pop()
+            if not isinstance(node, list):
+                if not isNumber(node) and not isString(node):
+                    raise TypeError("Unimplemented")
+                continue
+            if id(node) in computed:
+                continue
+            if not expanded:
+                work.append((node, True))
+                work.extend((child, False) for child in node[1:])
+                continue
+            if node[0] in BINARY:
+                computed[id(node)] = BINARY[node[0]](value_of(node[1]), value_of(node[2]))
+            elif node[0] in UNARY:
+                computed[id(node)] = UNARY[node[0]](value_of(node[1]))
+            else:
+                raise TypeError("Unimplemented")
+        result = value_of(tree)
+
+    return np.broadcast_to(result, (column_length,))
@@ -126,6 +126,16 @@ def test_specific_endpoints():
     data = response.json()
     print(f"Calculator endpoint: sqrt(16) = {data['result']}")
     
+    # Arbitrary-precision decimal mode
+    response = requests.post(f"{BASE_URL}/api/calculator", json={
+        "expression": "0.1 + 0.2",
+        "precision": 50
+    })
+    assert response.status_code == 200, "Decimal calculator failed!"
+    data = response.json()
+    assert data["result"] == "0.3", "Unexpected decimal 0.1 + 0.2"
+    print(f"Calculator endpoint: 0.1 + 0.2 = {data['result']} (precision 50)")
+    
     # Test fibonacci endpoint
     response = requests.post(f"{BASE_URL}/api/fibonacci", json={
         "n": 8
@@ -134,6 +144,36 @@ def test_specific_endpoints():
     data = response.json()
     print(f"Fibonacci endpoint: F(8) = {data['result']}")
     
+    # Large index (the recursive version never finished this one)
+    response = requests.post(f"{BASE_URL}/api/fibonacci", json={
+        "n": 90
+    })
+    assert response.status_code == 200, "Fibonacci endpoint failed for n=90!"
+    data = response.json()
+    assert str(data["result"]) == "2880067194370816120", "Unexpected F(90)"
+    print(f"Fibonacci endpoint: F(90) = {data['result']}")
+    
+    # Modular result, only small residues are computed
+    response = requests.post(f"{BASE_URL}/api/fibonacci", json={
+        "n": 10 ** 18,
+        "mod": 10 ** 9 + 7
+    })
+    assert response.status_code == 200, "Fibonacci endpoint failed with mod!"
+    data = response.json()
+    assert str(data["result"]) == "209783453", "Unexpected F(10^18) mod 10^9+7"
+    print(f"Fibonacci endpoint: F(10^18) mod 10^9+7 = {data['result']}")
+    
+    # Metadata-only result for a number far too large to build
+    response = requests.post(f"{BASE_URL}/api/factorial", json={
+        "n": 1000000,
+        "mode": "summary"
+    })
+    assert response.status_code == 200, "Factorial summary failed!"
+    data = response.json()
+    assert data["result"]["digit_count"] == 5565709, "Unexpected digit count of 1000000!"
+    assert data["result"]["trailing_zeros"] == 249998, "Unexpected trailing zeros of 1000000!"
+    print(f"Factorial summary: 1000000! = {data['result']['leading_digits']}... ({data['result']['digit_count']} digits)")
+    
     # Test factorial endpoint
     response = requests.post(f"{BASE_URL}/api/factorial", json={
         "n": 5
@@ -141,6 +181,115 @@ def test_specific_endpoints():
     assert response.status_code == 200, "Factorial endpoint failed!"
     data = response.json()
     print(f"Factorial endpoint: 5! = {data['result']}")
+    
+    # Test combinatorics endpoints
+    response = requests.post(f"{BASE_URL}/api/binomial", json={"n": 10, "k": 3})
+    assert response.status_code == 200, "Binomial endpoint failed!"
+    assert response.json()["result"] == 120, "Unexpected C(10, 3)"
+    
+    response = requests.post(f"{BASE_URL}/api/permutations", json={"n": 10, "k": 3})
+    assert response.status_code == 200, "Permutations endpoint failed!"
+    assert response.json()["result"] == 720, "Unexpected P(10, 3)"
+    
+    response = requests.post(f"{BASE_URL}/api/multinomial", json={"counts": [3, 2, 1]})
+    assert response.status_code == 200, "Multinomial endpoint failed!"
+    assert response.json()["result"] == 60, "Unexpected multinomial(3, 2, 1)"
+    print("Combinatorics endpoints: C(10,3) = 120, P(10,3) = 720, multinomial(3,2,1) = 60")
+    
+    # Test pow endpoint
+    response = requests.post(f"{BASE_URL}/api/pow", json={
+        "base": 2,
+        "exponent": 100,
+        "modulus": 1000
+    })
+    assert response.status_code == 200, "Pow endpoint failed!"
+    data = response.json()
+    assert data["result"] == 376, "Unexpected pow result"
+    print(f"Pow endpoint: 2^100 mod 1000 = {data['result']}")
+
+
+def test_fibonacci_range_endpoint():
+    """Test streaming a run of consecutive Fibonacci numbers"""
+    print("\nTesting fibonacci range endpoint...")
+    
+    response = requests.post(f"{BASE_URL}/api/fibonacci/range", json={
+        "start": 10,
+        "end": 15
+    }, stream=True)
+    assert response.status_code == 200, "Fibonacci range endpoint failed!"
+    lines = [json.loads(line) for line in response.iter_lines() if line]
+    assert [line["n"] for line in lines] == list(range(10, 16)), "Unexpected fibonacci range indexes"
+    assert [line["result"] for line in lines] == ["55", "89", "144", "233", "377", "610"], "Unexpected fibonacci range values"
+    print(f"Fibonacci range endpoint: F(10..15) = {[line['result'] for line in lines]}")
+
+
+def test_vectorized_endpoint():
+    """Test evaluating one expression over many bindings"""
+    print("\nTesting vectorized calculator endpoint...")
+    
+    response = requests.post(f"{BASE_URL}/api/calculator/vectorized", json={
+        "expression": "x ^^ 2 + y",
+        "bindings": {"x": [1, 2, 3], "y": [10, 20, 30]}
+    })
+    assert response.status_code == 200, "Vectorized endpoint failed!"
+    data = response.json()
+    assert data["results"] == [11.0, 24.0, 39.0], "Unexpected vectorized results"
+    print(f"Vectorized endpoint: x^^2 + y = {data['results']} ({data['calculation_time_ms']:.3f}ms)")
+
+def test_operator_precedence():
+    """Test signs and ^^ precedence of the default (stack) calculator engine"""
+    print("\nTesting calculator operator precedence...")
+    
+    # regression cases where the parser differs from the legacy string evaluator
+    cases = {
+        "-2^^2": -4.0,
+        "3--2": 5.0,
+        "2^^-2": 0.25,
+        "-3+5": 2.0,
+        "5--2^^2": 9.0,
+        "2^^3^^2": 512.0
+    }
+    for expression, expected in cases.items():
+        response = requests.post(f"{BASE_URL}/api/calculate", json={
+            "operation_type": "calculator",
+            "input_value": expression
+        })
+        assert response.status_code == 200, f"Calculator request for {expression} failed!"
+        data = response.json()
+        assert data["result"] == [expected], f"{expression} gave {data['result']}, expected {expected}"
+    print(f"Operator precedence: {len(cases)} expressions OK")
+
+def test_result_size_limits():
+    """Test that results too large to build are rejected on the API path"""
+    print("\nTesting result size limits...")
+    
+    # 2^(10^13) has 10^13 bits, far above MAX_POW_RESULT_BITS
+    response = requests.post(f"{BASE_URL}/api/pow", json={
+        "base": 2,
+        "exponent": 10 ** 13
+    })
+    assert response.status_code == 400, "Huge pow result was not rejected!"
+    data = response.json()
+    assert "bits" in data["error"], f"Unexpected pow limit error: {data['error']}"
+    print(f"Pow limit: {data['error']}")
+    
+    # with a modulus the result stays small, so the exponent is not limited
+    response = requests.post(f"{BASE_URL}/api/pow", json={
+        "base": 2,
+        "exponent": 10 ** 13,
+        "modulus": 1000
+    })
+    assert response.status_code == 200, "Modular pow with a huge exponent failed!"
+    print(f"Pow endpoint: 2^(10^13) mod 1000 = {response.json()['result']}")
+    
+    # C(10^9, 5 * 10^8) has about 10^9 bits
+    response = requests.post(f"{BASE_URL}/api/binomial", json={"n": 10 ** 9, "k": 5 * 10 ** 8})
+    assert response.status_code == 400, "Huge binomial result was not rejected!"
+    assert "bits" in response.json()["error"], f"Unexpected binomial limit error: {response.json()['error']}"
+    
+    response = requests.post(f"{BASE_URL}/api/multinomial", json={"counts": [10 ** 8, 10 ** 8, 10 ** 8]})
+    assert response.status_code == 400, "Huge multinomial result was not rejected!"
+    print(f"Combinatorics limit: {response.json()['error']}")
 
 if __name__ == "__main__":
     try:
@@ -151,6 +300,10 @@ if __name__ == "__main__":
         test_cache_basic()
         test_cache_stats()
         test_specific_endpoints()
+        test_operator_precedence()
+        test_vectorized_endpoint()
+        test_fibonacci_range_endpoint()
+        test_result_size_limits()
         
         print("\nAll tests passed successfully!")
     except AssertionError as ae:
@@ -0,0 +1,403 @@
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+import logging
+import multiprocessing
+
+from main import ENGINE_VERSIONS, ExpressionCache, ResultStore
+from python_calculator.cache_policy import MAX_COUNT, FrequencySketch, entry_size
+from python_calculator.calculator import process_expression, ENGINES, compile_cache
+
+# Stress test of the shared result cache (no server needed):
+# single-threaded checks of the byte budgets, TinyLFU admission and the on-disk
+# result store first, then 32 threads run get/set (and, in the second phase, clear_cache) against one
+# ExpressionCache and the bookkeeping invariants are checked afterwards; then
+# the threads evaluate expressions with every engine through the shared
+# compile cache and result cache; then several processes with several threads
+# each share one SharedResultTable.
+
+THREADS = 32
+OPERATIONS_PER_THREAD = 3000
+OPERATIONS = ['calculator', 'fibonacci', 'factorial', 'pow']
+
+PROCESSES = 4
+THREADS_PER_PROCESS = 8
+
+
+def expected_result(operation_type: str, key: int):
+    """The value every thread stores for a key, so hits can be checked"""
+    if operation_type == 'calculator':
+        return float(key)
+    if operation_type == 'factorial':
+        return key * 1000003
+    return key
+
+
+def make_input(operation_type: str, key: int) -> str:
+    if operation_type == 'calculator':
+        return f"{key}+0"
+    if operation_type == 'pow':
+        return f"{key},2"
+    return str(key)
+
+
+def hammer(cache: ExpressionCache, seed: int, counts: dict, errors: list, with_clear: bool = False):
+    rng = random.Random(seed)
+    gets = 0
+    try:
+        for _ in range(OPERATIONS_PER_THREAD):
+            operation_type = rng.choice(OPERATIONS)
+            # a hot set and a long tail of keys
+            key = rng.randint(1, 20) if rng.random() < 0.5 else rng.randint(21, 5000)
+            input_value = make_input(operation_type, key)
+
+            result = cache.get(operation_type, input_value)
+            gets += 1
+            if result is None:
+                cache.set(operation_type, input_value, expected_result(operation_type, key))
+            elif result != expected_result(operation_type, key):
+                errors.append(f"{operation_type} {input_value}: got {result}")
+
+            if operation_type == 'factorial':
+                nearest = cache.nearest_factorial(key)
+                if nearest is not None and nearest[1] != expected_result('factorial', nearest[0]):
+                    errors.append(f"nearest_factorial({key}) returned {nearest}")
+
+            if with_clear and rng.random() < 0.001:
+                cache.clear_cache(rng.choice(OPERATIONS + [None]))
+    except Exception as e:
+        errors.append(repr(e))
+    counts[seed] = gets
+
+
+def run_threads(cache: ExpressionCache, with_clear: bool = False):
+    counts = {}
+    errors = []
+    threads = [threading.Thread(target=hammer, args=(cache, seed, counts, errors, with_clear))
+               for seed in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts, errors, time.perf_counter() - start
+
+
+def check_invariants(cache: ExpressionCache):
+    for namespace, entries in cache.cache.items():
+        sizes = cache.entry_sizes[namespace]
+        assert set(entries) == set(sizes), f"{namespace}: entries and sizes disagree"
+        assert cache.bytes_used[namespace] == sum(sizes.values()), f"{namespace}: bytes_used drifted"
+        assert all(sizes[key] == entry_size(key, value) for key, value in entries.items()), \
+            f"{namespace}: wrong entry size"
+        assert len(entries) <= cache.max_entries[namespace], f"{namespace}: entry cap exceeded"
+        assert cache.bytes_used[namespace] <= cache.max_bytes[namespace], f"{namespace}: byte budget exceeded"
+
+    factorials = sorted(int(key) for key, value in cache.cache['factorial'].items() if isinstance(value, int))
+    assert cache.factorial_index == factorials, "factorial_index does not match the cached factorials"
+
+
+def test_byte_budget():
+    """A store over the byte budget evicts the least recently used entries"""
+    print("\nTesting byte budget eviction...")
+
+    # four equally sized entries, room for three of them
+    values = {str(key): (1 << 8000) + key for key in range(1, 5)}
+    size = entry_size('1', values['1'])
+    cache = ExpressionCache(max_bytes=size * 3 + size // 2, max_entries=100, admission='lru')
+    for key in ('1', '2', '3'):
+        cache.set('fibonacci', key, values[key])
+    cache.get('fibonacci', '1')  # '2' is now the least recently used
+    cache.set('fibonacci', '4', values['4'])
+
+    assert list(cache.cache['fibonacci']) == ['3', '1', '4'], f"Cached {list(cache.cache['fibonacci'])}"
+    assert cache.evictions['fibonacci'] == 1, f"{cache.evictions['fibonacci']} evictions"
+    assert cache.bytes_used['fibonacci'] == 3 * size, f"bytes_used is {cache.bytes_used['fibonacci']}"
+    check_invariants(cache)
+    print(f"Budget {cache.max_bytes['fibonacci']}B: evicted '2', keeping {cache.bytes_used['fibonacci']}B")
+
+
+def test_frequency_sketch():
+    """Counts saturate at MAX_COUNT and are halved after sample_size increments"""
+    print("\nTesting frequency sketch aging...")
+
+    # int keys hash to themselves, so the counters of 1 and 2 never collide
+    sketch = FrequencySketch(64)
+    assert sketch.sample_size == 640, f"sample_size is {sketch.sample_size}"
+    for _ in range(5):
+        sketch.increment(1)
+    assert sketch.estimate(1) == 5 and sketch.estimate(2) == 0, "Unexpected estimates"
+    sketch.age()
+    assert sketch.estimate(1) == 2, f"Aged estimate is {sketch.estimate(1)}"
+    assert sketch.additions == 2, f"{sketch.additions} additions after aging"
+
+    sketch.clear()
+    for _ in range(sketch.sample_size - 1):
+        sketch.increment(1)
+    assert sketch.estimate(1) == MAX_COUNT, f"Saturated estimate is {sketch.estimate(1)}"
+    sketch.increment(1)  # the sample_size-th increment ages every counter
+    assert sketch.estimate(1) == MAX_COUNT // 2, f"Estimate after the sample is {sketch.estimate(1)}"
+    assert sketch.additions == sketch.sample_size // 2, f"{sketch.additions} additions after the sample"
+    print(f"Saturated at {MAX_COUNT}, halved to {sketch.estimate(1)} after {sketch.sample_size} increments")
+
+
+def test_admission():
+    """TinyLFU rejects a cold entry that would evict a hot one under byte pressure"""
+    print("\nTesting TinyLFU admission...")
+
+    # room for one of the two entries; a wide sketch, so the keys do not collide
+    hot_value, cold_value = (1 << 8000) + 1, (1 << 8000) + 2
+    size = entry_size('10', hot_value)
+    cache = ExpressionCache(max_bytes=size + size // 2, max_entries=10000, admission='tinylfu')
+    cache.get('fibonacci', '10')
+    cache.set('fibonacci', '10', hot_value)
+    for _ in range(5):
+        cache.get('fibonacci', '10')
+
+    cache.get('fibonacci', '11')
+    cache.set('fibonacci', '11', cold_value)
+    assert list(cache.cache['fibonacci']) == ['10'], f"Cached {list(cache.cache['fibonacci'])}"
+    assert cache.rejections['fibonacci'] == 1, f"{cache.rejections['fibonacci']} rejections"
+    assert cache.evictions['fibonacci'] == 0, f"{cache.evictions['fibonacci']} evictions"
+
+    # once it is looked up more often than the cached entry, it replaces it
+    for _ in range(10):
+        cache.get('fibonacci', '11')
+    cache.set('fibonacci', '11', cold_value)
+    assert list(cache.cache['fibonacci']) == ['11'], f"Cached {list(cache.cache['fibonacci'])}"
+    assert cache.evictions['fibonacci'] == 1, f"{cache.evictions['fibonacci']} evictions"
+    check_invariants(cache)
+    print("Cold entry rejected, admitted once it was hotter than the cached one")
+
+
+def stored_rows(store: ResultStore, namespace: str) -> dict:
+    """(cache_key, engine_version) -> last_access of every row in the store"""
+    with sqlite3.connect(store.db_path) as conn:
+        rows = conn.execute('SELECT cache_key, engine_version, last_access FROM results WHERE namespace = ?',
+                            (namespace,)).fetchall()
+    return {(key, version): last_access for key, version, last_access in rows}
+
+
+def test_result_store():
+    """The store prunes the least recently used rows and refreshes only the current engine version"""
+    print("\nTesting the persistent result store...")
+
+    value = 1 << 8000
+    size = len(value.to_bytes(value.bit_length() // 8 + 1, 'little', signed=True)) + 1
+    store = ResultStore(db_path=os.path.join(tempfile.mkdtemp(), "results.db"),
+                        max_bytes=size * 3 + size // 2, namespaces=['fibonacci'])
+    try:
+        for key in ('1', '2', '3'):
+            store.put('fibonacci', key, value)
+            store.flush()
+            time.sleep(0.01)
+        hit, result = store.get('fibonacci', '1')  # '2' is now the least recently used
+        assert hit and result == value, "Stored result not found"
+        store.flush()
+        time.sleep(0.01)
+
+        # the fourth row is over the budget: pruning goes down to 90% of it
+        store.put('fibonacci', '4', value)
+        store.flush()
+        rows = stored_rows(store, 'fibonacci')
+        assert sorted(key for key, _ in rows) == ['1', '3', '4'], f"Rows after pruning: {sorted(rows)}"
+        assert store.get_stats()['bytes_used'] <= store.max_bytes, "Store is over its budget"
+
+        # a row of an older engine version is neither returned nor refreshed
+        current = ENGINE_VERSIONS.get('fibonacci', '1')
+        with sqlite3.connect(store.db_path) as conn:
+            for key in ('4', '5'):
+                conn.execute('INSERT INTO results (namespace, cache_key, engine_version, kind, value, size, last_access) '
+                             'VALUES (?, ?, ?, ?, ?, ?, ?)', ('fibonacci', key, 'old', 'int', b'\x05', 2, 1.0))
+        assert store.get('fibonacci', '5') == (False, None), "Result of an older engine version returned"
+
+        before = stored_rows(store, 'fibonacci')
+        hit, result = store.get('fibonacci', '4')
+        assert hit and result == value, "Result of the current engine version not returned"
+        store.flush()
+        after = stored_rows(store, 'fibonacci')
+        assert after[('4', current)] > before[('4', current)], "last_access of the current version not refreshed"
+        assert after[('4', 'old')] == 1.0 and after[('5', 'old')] == 1.0, "last_access of an older engine version changed"
+    finally:
+        store.close()
+    print(f"Pruned to {sorted(key for key, _ in rows)}, only engine version {current} refreshed")
+
+
+def test_concurrent_get_set():
+    """Counters and bookkeeping stay exact under concurrent lookups and stores"""
+    print("\nTesting concurrent get/set...")
+
+    cache = ExpressionCache(max_bytes=200000, max_entries=500)
+    counts, errors, elapsed = run_threads(cache)
+
+    assert not errors, f"Errors in worker threads: {errors[:5]}"
+    stats = cache.get_stats()
+    total_gets = sum(counts.values())
+    assert stats['hit_count'] + stats['miss_count'] == total_gets, \
+        f"hits + misses = {stats['hit_count'] + stats['miss_count']}, expected {total_gets}"
+    check_invariants(cache)
+    print(f"{total_gets} lookups from {THREADS} threads in {elapsed:.2f}s, hit rate {stats['hit_rate']}%, "
+          f"{stats['evictions']} evictions, {stats['rejections']} rejections")
+
+
+def test_concurrent_clear():
+    """clear_cache running next to lookups leaves a consistent cache"""
+    print("\nTesting clear_cache during concurrent get/set...")
+
+    cache = ExpressionCache(max_bytes=200000, max_entries=500)
+    counts, errors, elapsed = run_threads(cache, with_clear=True)
+
+    assert not errors, f"Errors in worker threads: {errors[:5]}"
+    check_invariants(cache)
+    print(f"{sum(counts.values())} lookups with concurrent clears in {elapsed:.2f}s, cache consistent")
+
+
+def make_expression(key: int) -> str:
+    return f"({key} + 2) * 3 - {key} ^^ 2 / (1 + {key % 7})"
+
+
+def evaluate_worker(cache: ExpressionCache, seed: int, expected: dict, counts: dict, errors: list):
+    rng = random.Random(seed)
+    evaluations = 0
+    try:
+        for _ in range(OPERATIONS_PER_THREAD // 3):
+            key = rng.randint(1, 20) if rng.random() < 0.5 else rng.randint(21, 300)
+            engine = rng.choice(ENGINES)
+            expression = make_expression(key)
+
+            result = process_expression(expression, engine=engine)
+            evaluations += 1
+            if result != expected[engine, key]:
+                errors.append(f"{engine} {expression}: got {result}")
+
+            cached = cache.get('calculator', expression)
+            if cached is None:
+                cache.set('calculator', expression, result)
+            elif cached != expected['pratt', key]:
+                errors.append(f"cached {expression}: got {cached}")
+    except Exception as e:
+        errors.append(repr(e))
+    counts[seed] = evaluations
+
+
+def test_concurrent_expressions():
+    """Every engine gives the single-threaded result while threads share the compile cache"""
+    print("\nTesting concurrent expression evaluation...")
+
+    # the sequential results, computed before compile_cache is shrunk
+    expected = {(engine, key): process_expression(make_expression(key), engine=engine)
+                for engine in ENGINES for key in range(1, 301)}
+    assert all(expected['pratt', key] == expected['stack', key] for key in range(1, 301)), \
+        "pratt and stack engines disagree"
+
+    # a small compile cache, so lookups race with compiles and evictions
+    max_size = compile_cache.max_size
+    compile_cache.max_size = 32
+    compile_cache.clear()
+    try:
+        cache = ExpressionCache(max_bytes=200000, max_entries=100)
+        counts = {}
+        errors = []
+        threads = [threading.Thread(target=evaluate_worker, args=(cache, seed, expected, counts, errors))
+                   for seed in range(THREADS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        assert not errors, f"Errors in worker threads: {errors[:5]}"
+        stats = compile_cache.get_stats()
+        assert stats['size'] <= 32, "compile cache size cap exceeded"
+        check_invariants(cache)
+        print(f"{sum(counts.values())} evaluations from {THREADS} threads in {elapsed:.2f}s, "
+              f"compile cache hit rate {stats['hit_rate']}%")
+    finally:
+        compile_cache.max_size = max_size
+        compile_cache.clear()
+
+
+def shared_table_worker(name: str, seed: int):
+    """One process of test_shared_table: threads reading and writing the same shared table"""
+    from python_calculator.shared_cache import SharedResultTable
+
+    table = SharedResultTable(name)
+    errors = []
+
+    def run(thread_seed):
+        rng = random.Random(thread_seed)
+        try:
+            for _ in range(OPERATIONS_PER_THREAD):
+                key = rng.randint(1, 300)
+                hit, result = table.get(1, str(key))
+                if not hit:
+                    table.put(1, str(key), key ** 40)
+                elif result != key ** 40:
+                    errors.append(f"{key}: got {result}")
+        except Exception as e:
+            errors.append(repr(e))
+
+    threads = [threading.Thread(target=run, args=(seed * 100 + i,)) for i in range(THREADS_PER_PROCESS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    table.close()
+    if errors:
+        print(f"Worker {seed}: {errors[:5]}")
+        sys.exit(1)
+
+
+def test_shared_table():
+    """Processes sharing one SharedResultTable see each other's results, never torn ones"""
+    print("\nTesting the shared memory table from several processes...")
+    from python_calculator.shared_cache import SharedResultTable
+
+    name = f"calculator_stress_{os.getpid()}"
+    # a small arena, so the table also gets wiped while the workers run
+    table = SharedResultTable(name, slot_count=512, arena_size=20000)
+    try:
+        start = time.perf_counter()
+        workers = [multiprocessing.Process(target=shared_table_worker, args=(name, seed)) for seed in range(PROCESSES)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - start
+
+        assert all(worker.exitcode == 0 for worker in workers), "A worker process saw a wrong result"
+        stats = table.get_stats()
+        for key in range(1, 301):
+            hit, result = table.get(1, str(key))
+            assert not hit or result == key ** 40, f"Wrong shared result for {key}"
+        assert stats['arena_used'] <= stats['arena_size'], "Arena overflow"
+        print(f"{PROCESSES} processes x {THREADS_PER_PROCESS} threads in {elapsed:.2f}s, "
+              f"{stats['stores']} stores, {stats['wipes']} wipes, {stats['entries']} entries")
+    finally:
+        table.close()
+        table.unlink()
+
+
+if __name__ == "__main__":
+    # the per-lookup cache log lines are not what is being tested
+    logging.disable(logging.CRITICAL)
+    try:
+        test_byte_budget()
+        test_frequency_sketch()
+        test_admission()
+        test_result_store()
+        test_concurrent_get_set()
+        test_concurrent_clear()
+        test_concurrent_expressions()
+        test_shared_table()
+
+        print("\nAll tests passed successfully!")
+    except AssertionError as ae:
+        print("\nTest failed:", ae)
+    except Exception as e:
+        print("\nUnexpected error occurred:", e)
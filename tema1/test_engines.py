@@ -0,0 +1,119 @@
+import base64
+import logging
+import os
+import random
+import sys
+import tempfile
+
+# the engine modules import each other by their top-level names, as in main.py
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "python_calculator")))
+
+from main import Controller, DatabaseManager, ExpressionCache, Model
+from python_calculator.calculator import process_expression
+from python_calculator.int_encoding import SAFE_STR_BITS, encode_int, iter_encoded
+
+# In-process checks of the calculator engines and the integer result encoding
+# (no server needed).
+
+# the engine Controller uses unless CALCULATOR_ENGINE says otherwise
+DEFAULT_ENGINE = 'stack'
+
+
+def test_long_flat_chain():
+    """A 600+ term a+b+c+... chain evaluates on the default engine like on legacy"""
+    print("\nTesting a long flat chain...")
+
+    expression = "+".join(["1"] * 650)
+    result = process_expression(expression, engine=DEFAULT_ENGINE)
+    assert result == [650.0], f"Flat chain gave {result}"
+    assert process_expression(expression, engine="legacy") == result, "Legacy engine disagrees"
+    print(f"650 term chain ({len(expression)} characters) = {result}")
+
+
+def test_deep_nesting():
+    """A 3000-deep nested expression does not hit the recursion limit"""
+    print("\nTesting deeply nested expressions...")
+
+    depth = 3000
+    cases = {
+        "(1+" * depth + "1" + ")" * depth: [depth + 1.0],
+        "(" * depth + "2*3" + ")" * depth: [6.0],
+        "-" * (depth + 1) + "2": [-2.0],
+        "rad(" * depth + "1" + ")" * depth: [1.0]
+    }
+    for expression, expected in cases.items():
+        for engine in (DEFAULT_ENGINE, "pratt"):
+            result = process_expression(expression, engine=engine)
+            assert result == expected, f"{engine} gave {result} for {expression[:20]}..., expected {expected}"
+    print(f"{len(cases)} expressions nested {depth} deep OK")
+
+
+def decode(text: str, encoding: str) -> int:
+    """Inverse of encode_int, independent of the code under test"""
+    if encoding == 'hex':
+        return int(text, 16)
+    if encoding == 'base64':
+        return int.from_bytes(base64.b64decode(text), 'big', signed=True)
+    # int() of decimal text has the same digit limit as str()
+    limit = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    try:
+        return int(text)
+    finally:
+        sys.set_int_max_str_digits(limit)
+
+
+def test_int_encoding():
+    """encode_int and iter_encoded round-trip integers on both sides of SAFE_STR_BITS"""
+    print("\nTesting integer result encoding...")
+
+    rng = random.Random(14000)
+    values = [0, 1, -1]
+    for bits in (SAFE_STR_BITS - 1, SAFE_STR_BITS, SAFE_STR_BITS + 1, SAFE_STR_BITS + 8, 4 * SAFE_STR_BITS):
+        value = rng.getrandbits(bits) | (1 << (bits - 1))
+        values += [value, -value, (1 << bits) - 1, -(1 << bits), 1 << bits]
+    for value in values:
+        for encoding in ('decimal', 'hex', 'base64'):
+            text = encode_int(value, encoding)
+            assert decode(text, encoding) == value, f"{encoding} of a {value.bit_length()} bit value does not round-trip"
+            for chunk_size in (7, 1000, 65536):
+                chunks = list(iter_encoded(value, encoding, chunk_size))
+                assert ''.join(chunks) == text, f"iter_encoded({encoding}, {chunk_size}) differs for a {value.bit_length()} bit value"
+    print(f"{len(values)} values x 3 encodings round-trip")
+
+
+def test_history_result_preview():
+    """The request history stores result_preview text, not the digits of huge integers"""
+    print("\nTesting result previews in the request history...")
+
+    db_manager = DatabaseManager(os.path.join(tempfile.mkdtemp(), "history.db"))
+    controller = Controller(db_manager)
+    controller.setModel(Model(db_manager, cache=ExpressionCache()))
+
+    # 5000! has about 54000 bits
+    bits = controller.factorial(5000).bit_length()
+    assert bits > SAFE_STR_BITS
+    first = controller.calculate('factorial', '5000')
+    second = controller.calculate('factorial', '5000')
+    assert first['status'] == 'success' and second['cached'], "Factorial request failed"
+
+    rows = {row['id']: row['result'] for row in db_manager.get_request_history()}
+    assert rows[first['request_id']] == f"<integer: {bits} bits>", f"History stored {rows[first['request_id']][:40]}"
+    assert rows[second['request_id']] == f"<integer: {bits} bits> (cached)", f"History stored {rows[second['request_id']][:40]}"
+    print(f"History rows: {rows[first['request_id']]}")
+
+
+if __name__ == "__main__":
+    # the per-request log lines are not what is being tested
+    logging.disable(logging.CRITICAL)
+    try:
+        test_long_flat_chain()
+        test_deep_nesting()
+        test_int_encoding()
+        test_history_result_preview()
+
+        print("\nAll tests passed successfully!")
+    except AssertionError as ae:
+        print("\nTest failed:", ae)
+    except Exception as e:
+        print("\nUnexpected error occurred:", e)